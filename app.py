@@ -7,12 +7,14 @@ All 18 pages fully functional
 """
 
 import os
+import threading
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from shiny import App, reactive, render, ui
+from shiny.types import SilentException
 from shinywidgets import render_widget
 
 # Static file directory for www assets (QR codes, styles, scripts)
@@ -74,12 +76,18 @@ from cloud_status_badge import (
 )
 from loading_overlay import loading_overlay_css, loading_overlay_ui_fillable
 from ui.mobile_badge import mobile_badge
+from cloud_refresh import refresh_scheduler
+from data.db import warm_pool
+from data.indexes import bootstrap_indexes_on_startup
+from data.rollups import ensure_rollups, refresh_if_due
 from hedis_gap_trail import (
     HedisGapDB,
     add_gap_suppression,
     close_hedis_gap,
     fetch_gap_summary,
     fetch_hedis_gaps,
+    fetch_hedis_gaps_page,
+    gap_write_status,
     get_gap_suppressions,
     push_hedis_gap,
     remove_gap_suppression,
@@ -114,7 +122,7 @@ from star_rating_cache_ui import star_rating_cache_panel
 from suppression_banner import suppression_banner
 from utils.data_loader import (
     get_member_sentiment_lookup,
-    get_merged_member_sdoh,
+    get_merged_member_sdoh_async,
     load_sentiment_corpus,
 )
 from starguard_platform_integration import register_session, record_finding
@@ -1307,7 +1315,7 @@ def optimizer_content():
     return ui.TagList(
         create_header(),
         alert_info(
-            "Choose total budget below. Compare Max Star Rating, Max Financial Return, and Balanced approaches."
+            "Choose total budget below. Compare Max Star Rating, Max Financial Return (net benefit), and Balanced approaches."
         ),
         ui.layout_sidebar(
             ui.sidebar(
@@ -1321,6 +1329,7 @@ def optimizer_content():
                 ),
                 width=260,
             ),
+            ui.output_ui("optimizer_solver_note"),
             ui.navset_card_tab(
                 ui.nav_panel("Max Star Rating", ui.output_data_frame("optimizer_star_strategy")),
                 ui.nav_panel(
@@ -1707,10 +1716,29 @@ SIDEBAR_NAV_HTML = """
 
 # HEDIS Gap cloud persistence — Google Sheets
 hedis_db = HedisGapDB()
+GAP_PAGE_SIZE = 15  # rows per page in the Live Gap Panel
 
 # Star Rating Forecast cache — Google Sheets
 star_cache_db = StarRatingCacheDB()
 
+# Renders read the local snapshots; this thread keeps them current
+refresh_scheduler.register("hedis_gaps", lambda: hedis_db.sync(force=True))
+refresh_scheduler.register("star_cache", lambda: star_cache_db.sync(force=True))
+refresh_scheduler.register("rollups", refresh_if_due)
+refresh_scheduler.start()
+
+
+def _bootstrap_database():
+    """Backend detection + pool warm-up, index bootstrap, then daily rollups."""
+    warm_pool()
+    bootstrap_indexes_on_startup()
+    ensure_rollups()
+
+
+# Runs off the request path; ROI/cost queries read the base tables until
+# the first rollup refresh succeeds
+threading.Thread(target=_bootstrap_database, name="db-bootstrap", daemon=True).start()
+
 # ═══════════════════════════════════════════════════════════════
 # APP UI
 # ═══════════════════════════════════════════════════════════════
@@ -1992,12 +2020,34 @@ def server(input, output, session):
 
     # ─── HEDIS Gap Refresh (Google Sheets cloud) ───
     _gap_push_result = reactive.Value(None)
+
+    # Snapshot generations: panels re-render when a background refresh or a
+    # write (from any session) changes the data, without fetching on render
+    @reactive.poll(lambda: hedis_db.generation, 1)
+    def _gap_snapshot():
+        return hedis_db.generation
+
+    @reactive.poll(lambda: star_cache_db.generation, 1)
+    def _forecast_snapshot():
+        return star_cache_db.generation
+
+    @reactive.effect
+    @reactive.event(input.btn_refresh_gaps)
+    def _refresh_gaps_now():
+        refresh_scheduler.refresh_now("hedis_gaps")
+
+    @reactive.effect
+    @reactive.event(input.btn_refresh_cache, input.btn_load_history)
+    def _refresh_cache_now():
+        refresh_scheduler.refresh_now("star_cache")
+
     _gap_close_result = reactive.Value(None)
     _hitl_gap_add_result = reactive.Value(None)
     _hitl_gap_remove_result = reactive.Value(None)
 
     @render.text
     def hedis_sync_status():
+        _gap_snapshot()
         s = hedis_db.status()
         if s["connected"]:
             return f"☁ Cloud Live — {s['record_count']} gaps — {s['timestamp']}"
@@ -2005,6 +2055,7 @@ def server(input, output, session):
 
     @render.ui
     def hedis_kpi_cards():
+        _gap_snapshot()
         input.btn_refresh_gaps()
         input.btn_push_gap()
         s = fetch_gap_summary(hedis_db)
@@ -2114,28 +2165,73 @@ Write a practical, actionable recommendation for closing this gap. Return only t
         if r is None:
             return ui.div()
         if r.get("success"):
+            w = gap_write_status(hedis_db, r["ticket"]) if r.get("ticket") else {"status": "done"}
+            if w["status"] == "queued":
+                reactive.invalidate_later(2)
+                return ui.div(
+                    f"⏳ {r.get('gap_id', '')} queued for Sheets — {r.get('measure_name', '')}",
+                    class_="gap-push-success",
+                )
+            if w["status"] == "failed":
+                return ui.div(
+                    f"❌ {r.get('gap_id', '')} not saved to Sheets: {w.get('error', '')}",
+                    class_="gap-push-error",
+                )
             return ui.div(
                 f"✅ {r.get('gap_id', '')} pushed — {r.get('measure_name', '')} — {r.get('timestamp', '')}",
                 class_="gap-push-success",
             )
         return ui.div(f"❌ {r.get('error', '')}", class_="gap-push-error")
 
-    @render.data_frame
-    def hedis_gap_table():
+    # Cursor stack for the gap table: [] = newest page; each entry is the
+    # after= cursor of one older page
+    _gap_cursors = reactive.Value([])
+
+    @reactive.effect
+    @reactive.event(input.gap_filter_status, input.gap_filter_measure)
+    def _gap_page_reset():
+        _gap_cursors.set([])
+
+    @reactive.calc
+    def _gap_page():
+        _gap_snapshot()
         input.btn_refresh_gaps()
         input.btn_push_gap()
         input.btn_close_gap()
-        return render.DataGrid(
-            fetch_hedis_gaps(
-                hedis_db,
-                n=15,
-                filter_status=input.gap_filter_status() or "ALL",
-                filter_measure=input.gap_filter_measure() or "ALL",
-            ),
-            width="100%",
-            height="320px",
+        cursors = _gap_cursors()
+        return fetch_hedis_gaps_page(
+            hedis_db,
+            filter_status=input.gap_filter_status() or "ALL",
+            filter_measure=input.gap_filter_measure() or "ALL",
+            after=cursors[-1] if cursors else None,
+            limit=GAP_PAGE_SIZE,
         )
 
+    @reactive.effect
+    @reactive.event(input.btn_gap_page_older)
+    def _gap_page_older():
+        cursor = _gap_page()["next_cursor"]
+        if cursor:
+            _gap_cursors.set([*_gap_cursors(), cursor])
+
+    @reactive.effect
+    @reactive.event(input.btn_gap_page_newer)
+    def _gap_page_newer():
+        _gap_cursors.set(_gap_cursors()[:-1])
+
+    @render.text
+    def gap_page_label():
+        page = _gap_page()
+        shown = len(page["rows"])
+        if not shown:
+            return "No gaps"
+        first = len(_gap_cursors()) * GAP_PAGE_SIZE + 1
+        return f"{first}–{first + shown - 1} of {page['total']}"
+
+    @render.data_frame
+    def hedis_gap_table():
+        return render.DataGrid(_gap_page()["rows"], width="100%", height="320px")
+
     @reactive.effect
     @reactive.event(input.btn_close_gap)
     def _close_gap():
@@ -2216,6 +2312,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     # ─── Phase 2: Intervention Optimizer ───
     @render.ui
     def intervention_optimizer_table():
+        _gap_snapshot()
         df = fetch_hedis_gaps(hedis_db, n=20, filter_status="OPEN", filter_measure="ALL")
         if df.empty:
             return ui.p("No open gaps. Push gaps to cloud first.", class_="text-muted")
@@ -2224,6 +2321,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.text
     def intervention_optimizer_status():
+        _gap_snapshot()
         s = hedis_db.status()
         if s.get("connected"):
             return f"Cloud connected — {s.get('record_count', 0)} records"
@@ -2234,6 +2332,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.text
     def star_cache_sync_status():
+        _forecast_snapshot()
         s = star_cache_db.status()
         if s["connected"]:
             return f"☁ Cache Live — {s['cache_count']} forecasts — Last run: {s['last_cached_at']} — {s['timestamp']}"
@@ -2241,6 +2340,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.ui
     def cache_freshness_banner():
+        _forecast_snapshot()
         input.btn_refresh_cache()
         input.btn_cache_forecast()
         latest = fetch_latest_forecast(star_cache_db)
@@ -2259,6 +2359,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.ui
     def forecast_hero_card():
+        _forecast_snapshot()
         input.btn_refresh_cache()
         input.btn_cache_forecast()
         latest = fetch_latest_forecast(star_cache_db)
@@ -2302,6 +2403,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.ui
     def star_cache_kpi_row():
+        _forecast_snapshot()
         input.btn_refresh_cache()
         input.btn_cache_forecast()
         s = fetch_cache_summary(star_cache_db)
@@ -2379,6 +2481,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     @render.data_frame
     def forecast_history_table():
+        _forecast_snapshot()
         input.btn_load_history()
         input.btn_cache_forecast()
         return render.DataGrid(
@@ -2673,9 +2776,13 @@ Write a practical, actionable recommendation for closing this gap. Return only t
         )
 
     # ─── SDoH MAPPER (Phase 1) ───
+    @reactive.extended_task
+    async def member_sdoh_task():
+        return await get_merged_member_sdoh_async()
+
     @reactive.Calc
     def _merged_member_sdoh():
-        return get_merged_member_sdoh()
+        return member_sdoh_task.result()
 
     @render_widget
     def sdoh_heatmap():
@@ -2751,7 +2858,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     # ─── CHANNEL OPTIMIZER (Phase 1) ───
     @reactive.Calc
     def _channel_propensity():
-        df = get_merged_member_sdoh()
+        df = _merged_member_sdoh()
         if df.empty:
             return pd.DataFrame()
         np.random.seed(42)
@@ -3624,16 +3731,20 @@ Format: Return ONLY the message text, no preamble."""
         return f": {format_number(input.ml_current_rate())}%"
 
     # ─── ML PREDICTIONS ───
+    @reactive.calc
+    def _ml_forecast():
+        from compound_framework.star_forecast import forecast_measure_rate
+
+        return forecast_measure_rate(input.ml_measure(), input.ml_current_rate() / 100)
+
     @render.ui
     def ml_prediction_summary():
         measure = input.ml_measure()
         current = input.ml_current_rate()
-        min(current + 2.5, 95)
-        min(current + 5.2, 95)
-        predicted_12mo = min(current + 8.5, 95)
-        confidence = 0.87
+        horizon = _ml_forecast()[-1]
+        predicted_12mo = horizon["predicted_rate"] * 100
         return ui.div(
-            confidence_badge(confidence, "Model Confidence"),
+            confidence_badge(horizon["confidence"], "Model Confidence"),
             ui.HTML(f"""
             <div class="card mt-3">
                 <div class="card-body">
@@ -3642,11 +3753,11 @@ Format: Return ONLY the message text, no preamble."""
                     <p><strong>Predicted Rate (12 months):</strong> {predicted_12mo:.1f}%</p>
                     <p><strong>Expected Improvement:</strong> <span style="color: #28a745;">+{predicted_12mo - current:.1f}%</span></p>
                     <hr>
-                    <h6>Model Performance</h6>
+                    <h6>Model</h6>
                     <ul>
-                        <li><strong>Accuracy:</strong> 91% ± 3% (validated against 2024 actuals)</li>
-                        <li><strong>MAE:</strong> 2.1% (Mean Absolute Error)</li>
-                        <li><strong>Better than baseline:</strong> ~15% improvement over naive forecast</li>
+                        <li><strong>Method:</strong> Monte Carlo, 20,000 simulated years</li>
+                        <li><strong>95% interval:</strong> {horizon["ci_low"] * 100:.1f}% – {horizon["ci_high"] * 100:.1f}%</li>
+                        <li><strong>Closure velocity:</strong> {horizon["closure_velocity"] * 100:.1f}% of open gaps per month (historical)</li>
                     </ul>
                     <p class="mb-0"><small>
                         <strong>Assumptions:</strong> Current intervention levels maintained,
@@ -3659,32 +3770,15 @@ Format: Return ONLY the message text, no preamble."""
 
     @render.data_frame
     def ml_prediction_table():
-        current = input.ml_current_rate()
-        predicted_3mo = min(current + 2.5, 95)
-        predicted_6mo = min(current + 5.2, 95)
-        predicted_12mo = min(current + 8.5, 95)
         data = [
             {
-                "Time Frame": "3 months",
-                "Predicted Rate": f"{predicted_3mo:.1f}%",
-                "Lower Bound (95% CI)": f"{max(predicted_3mo - 2.8, current):.1f}%",
-                "Upper Bound (95% CI)": f"{min(predicted_3mo + 2.8, 100):.1f}%",
-                "Confidence": "HIGH",
-            },
-            {
-                "Time Frame": "6 months",
-                "Predicted Rate": f"{predicted_6mo:.1f}%",
-                "Lower Bound (95% CI)": f"{max(predicted_6mo - 3.5, current):.1f}%",
-                "Upper Bound (95% CI)": f"{min(predicted_6mo + 3.5, 100):.1f}%",
-                "Confidence": "MEDIUM",
-            },
-            {
-                "Time Frame": "12 months",
-                "Predicted Rate": f"{predicted_12mo:.1f}%",
-                "Lower Bound (95% CI)": f"{max(predicted_12mo - 5.2, current):.1f}%",
-                "Upper Bound (95% CI)": f"{min(predicted_12mo + 5.2, 100):.1f}%",
-                "Confidence": "MEDIUM",
-            },
+                "Time Frame": f"{h['months']} months",
+                "Predicted Rate": f"{h['predicted_rate'] * 100:.1f}%",
+                "Lower Bound (95% CI)": f"{h['ci_low'] * 100:.1f}%",
+                "Upper Bound (95% CI)": f"{h['ci_high'] * 100:.1f}%",
+                "Confidence": h["confidence_level"],
+            }
+            for h in _ml_forecast()
         ]
         return render.DataGrid(pd.DataFrame(data))
 
@@ -4103,16 +4197,23 @@ Format: Return ONLY the message text, no preamble."""
         return render.DataGrid(pd.DataFrame(data))
 
     # ─── ROI by Measure: data loader ───
+    # Heavy aggregates load as extended tasks on the DB thread pool so a slow
+    # query never blocks the event loop; outputs show progress meanwhile.
+    @reactive.extended_task
+    async def roi_task():
+        from data.db import query_async
+        from utils.queries import get_roi_by_measure_query
+
+        return await query_async(get_roi_by_measure_query("2024-01-01", "2024-12-31"))
+
     @reactive.calc
     def roi_data():
         try:
-            from data.db import query
-            from utils.queries import get_roi_by_measure_query
-
-            sql = get_roi_by_measure_query("2024-01-01", "2024-12-31")
-            df = query(sql)
+            df = roi_task.result()
             if df.empty:
                 raise ValueError("No data")
+        except SilentException:
+            raise
         except Exception:
             df = pd.DataFrame(
                 {
@@ -4380,11 +4481,6 @@ Format: Return ONLY the message text, no preamble."""
         ui.notification_show("Calculating with triple-loop verification...", type="message")
         try:
             from compound_framework.ai_engine_enhanced import triple_loop_execution
-            from compound_framework.financial_impact import (
-                calculate_financial_impact,
-                calculate_overall_star_rating,
-                generate_gap_closure_recommendations,
-            )
 
             measure_code = (
                 input.hedis_measure().split(" - ")[0]
@@ -4403,38 +4499,23 @@ Format: Return ONLY the message text, no preamble."""
                         "Validated against golden dataset", type="message", duration=3
                     )
 
-                # Calculate financial impact only if result is valid
-                try:
-                    measure_results = [
-                        {"measure_id": measure_code, "rate": result.get("rate", 0)},
-                        {"measure_id": "GSD", "rate": 0.85},
-                        {"measure_id": "KED", "rate": 0.75},
-                        {"measure_id": "CBP", "rate": 0.65},
-                        {"measure_id": "BCS", "rate": 0.70},
-                        {"measure_id": "COL", "rate": 0.68},
-                    ]
-                    rating_analysis = calculate_overall_star_rating(measure_results)
-                    current_rating = rating_analysis.get("overall_rating", 3.0)
-                    projected_rating = min(5.0, current_rating + 0.5)
-                    financial = calculate_financial_impact(
-                        current_rating=current_rating,
-                        projected_rating=projected_rating,
-                        member_count=25000,
-                        avg_revenue_per_member=12000,
-                        measurement_year=int(input.hedis_year()),
-                    )
-                    financial["gap_opportunities"] = generate_gap_closure_recommendations(
-                        rating_analysis.get("measure_breakdown", []), top_n=5
-                    )
-                    financial["rating_analysis"] = rating_analysis
-                    hedis_financial_impact.set(financial)
-                except Exception as fin_error:
-                    ui.notification_show(
-                        f"Note: Financial impact calculation failed: {str(fin_error)}",
-                        type="warning",
-                        duration=5,
-                    )
-                    hedis_financial_impact.set(None)
+                # Financial impact only if result is valid; the Monte Carlo
+                # forecast runs off the event loop (see hedis_forecast_task)
+                measure_results = [
+                    {
+                        "measure_id": measure_code,
+                        "rate": result.get("rate", 0),
+                        "numerator": result.get("numerator", 0),
+                        "denominator": result.get("denominator", 0),
+                    },
+                    {"measure_id": "GSD", "rate": 0.85},
+                    {"measure_id": "KED", "rate": 0.75},
+                    {"measure_id": "CBP", "rate": 0.65},
+                    {"measure_id": "BCS", "rate": 0.70},
+                    {"measure_id": "COL", "rate": 0.68},
+                ]
+                hedis_financial_impact.set(None)
+                hedis_forecast_task.invoke(measure_results, int(input.hedis_year()))
             else:
                 error_msg = (
                     result.get("user_message", result.get("error", "Calculation failed"))
@@ -4455,6 +4536,56 @@ Format: Return ONLY the message text, no preamble."""
             )
             hedis_financial_impact.set(None)
 
+    @reactive.extended_task
+    async def hedis_forecast_task(measure_results, measurement_year):
+        from compound_framework.financial_impact import (
+            calculate_financial_impact,
+            calculate_overall_star_rating,
+            generate_gap_closure_recommendations,
+        )
+        from compound_framework.star_forecast import simulate_star_forecast_async
+
+        rating_analysis = calculate_overall_star_rating(measure_results)
+        current_rating = rating_analysis.get("overall_rating", 3.0)
+        forecast = await simulate_star_forecast_async(
+            measure_results, member_count=25000, avg_revenue_per_member=12000
+        )
+        financial = calculate_financial_impact(
+            current_rating=current_rating,
+            projected_rating=forecast["projected_star_rating"],
+            member_count=25000,
+            avg_revenue_per_member=12000,
+            measurement_year=measurement_year,
+        )
+        financial["gap_opportunities"] = generate_gap_closure_recommendations(
+            rating_analysis.get("measure_breakdown", []), top_n=5
+        )
+        financial["rating_analysis"] = rating_analysis
+        financial["forecast"] = forecast
+        return financial
+
+    @reactive.effect
+    def _hedis_forecast_done():
+        try:
+            financial = hedis_forecast_task.result()
+        except SilentException:
+            raise
+        except Exception as fin_error:
+            ui.notification_show(
+                f"Note: Financial impact calculation failed: {str(fin_error)}",
+                type="warning",
+                duration=5,
+            )
+            hedis_financial_impact.set(None)
+            return
+        hedis_financial_impact.set(financial)
+        # pre-fill the forecast cache form with the simulated result
+        forecast = financial["forecast"]
+        current_rating = financial["rating_analysis"].get("overall_rating", 3.0)
+        ui.update_numeric("fcst_current", value=current_rating)
+        ui.update_numeric("fcst_projected", value=forecast["projected_star_rating"])
+        ui.update_select("fcst_confidence", selected=forecast["confidence_level"])
+
     @reactive.effect
     @reactive.event(input.hedis_run_diff)
     def _():
@@ -4785,6 +4916,13 @@ Format: Return ONLY the message text, no preamble."""
             return "\u2014"
         if impact.get("error", False):
             return "Error"
+        forecast = impact.get("forecast")
+        if forecast:
+            low, high = forecast["rating_ci"]
+            return (
+                f"{impact.get('projected_rating', 0):.1f} stars "
+                f"(95% CI {low:.1f}\u2013{high:.1f}, {forecast['confidence_level']})"
+            )
         return f"{impact.get('projected_rating', 0):.1f} stars"
 
     @render.text
@@ -4838,16 +4976,28 @@ Format: Return ONLY the message text, no preamble."""
     # COST PER CLOSURE PAGE
     # ═══════════════════════════════════════════════════════
 
+    @reactive.extended_task
+    async def cost_task():
+        from data.db import query_async
+        from utils.queries import get_cost_per_closure_by_activity_query
+
+        return await query_async(get_cost_per_closure_by_activity_query("2024-01-01", "2024-12-31"))
+
+    @reactive.effect
+    def _start_data_loads():
+        # Runs once per session; extended tasks don't re-run on their own.
+        roi_task.invoke()
+        cost_task.invoke()
+        member_sdoh_task.invoke()
+
     @reactive.calc
     def cost_data():
         try:
-            from data.db import query
-            from utils.queries import get_cost_per_closure_by_activity_query
-
-            sql = get_cost_per_closure_by_activity_query("2024-01-01", "2024-12-31")
-            df = query(sql)
+            df = cost_task.result()
             if df.empty:
                 raise ValueError("No data")
+        except SilentException:
+            raise
         except Exception:
             df = pd.DataFrame(
                 {
@@ -4983,14 +5133,29 @@ Format: Return ONLY the message text, no preamble."""
         return render.DataGrid(cost_data())
 
     # ─── Intervention Portfolio Optimizer ───
+    @reactive.calc
+    def _optimizer_result():
+        """Memoized optimization for the current budget, shared by all four optimizer tables."""
+        from utils.intervention_analysis import optimize_intervention_portfolio_cached
+
+        budget = float(input.optimizer_budget() or 100000)
+        budget = max(25000, min(1000000, budget))
+        return optimize_intervention_portfolio_cached(budget)
+
+    @render.ui
+    def optimizer_solver_note():
+        solver = _optimizer_result()["solver"]
+        if solver["exact"]:
+            return None
+        return alert_warning(
+            "Near-optimal portfolios: the solver rounded costs or hit its search "
+            "limit, so a slightly better mix may exist."
+        )
+
     @render.data_frame
     def optimizer_star_strategy():
         try:
-            from utils.intervention_analysis import optimize_intervention_portfolio
-
-            budget = float(input.optimizer_budget() or 100000)
-            budget = max(25000, min(1000000, budget))
-            result = optimize_intervention_portfolio(budget)
+            result = _optimizer_result()
             a1 = result["approach_1_max_star"]
             interventions = a1["selected_interventions"]
             if not interventions:
@@ -5016,11 +5181,7 @@ Format: Return ONLY the message text, no preamble."""
     @render.data_frame
     def optimizer_roi_strategy():
         try:
-            from utils.intervention_analysis import optimize_intervention_portfolio
-
-            budget = float(input.optimizer_budget() or 100000)
-            budget = max(25000, min(1000000, budget))
-            result = optimize_intervention_portfolio(budget)
+            result = _optimizer_result()
             a2 = result["approach_2_max_roi"]
             interventions = a2["selected_interventions"]
             if not interventions:
@@ -5046,11 +5207,7 @@ Format: Return ONLY the message text, no preamble."""
     @render.data_frame
     def optimizer_balanced_strategy():
         try:
-            from utils.intervention_analysis import optimize_intervention_portfolio
-
-            budget = float(input.optimizer_budget() or 100000)
-            budget = max(25000, min(1000000, budget))
-            result = optimize_intervention_portfolio(budget)
+            result = _optimizer_result()
             a3 = result["approach_3_balanced"]
             interventions = a3["selected_interventions"]
             if not interventions:
@@ -5078,36 +5235,22 @@ Format: Return ONLY the message text, no preamble."""
     @render.data_frame
     def optimizer_intervention_details():
         try:
-            from utils.intervention_analysis import (
-                calculate_intervention_roi,
-                get_default_interventions,
-            )
-
-            interventions = get_default_interventions()
-            rows = []
-            for i in interventions[:8]:
-                roi = calculate_intervention_roi(
-                    intervention_type=i["intervention_type"],
-                    target_measure=i["target_measure"],
-                    expected_gap_closure=i["expected_gap_closure"],
-                    intervention_cost=i["intervention_cost"],
-                    member_count=i["member_count"],
-                )
-                rows.append(
-                    {
-                        "Intervention": i["intervention_type"],
-                        "Measure": i["target_measure"],
-                        "Cost/closure": format_currency(roi["cost_per_closure"]),
-                        "Rate improvement": format_percentage(
-                            roi["expected_rate_improvement"], decimals=1, multiply=False
-                        ),
-                        "Financial impact": format_currency(roi["financial_impact"]["total"]),
-                        "ROI": format_roi_value(roi["roi_ratio"]),
-                        "Confidence": format_percentage(
-                            roi["confidence_score"], decimals=0, multiply=False
-                        ),
-                    }
-                )
+            rows = [
+                {
+                    "Intervention": i["intervention_type"],
+                    "Measure": i["target_measure"],
+                    "Cost/closure": format_currency(i["cost_per_closure"]),
+                    "Rate improvement": format_percentage(
+                        i["expected_gap_closure"], decimals=1, multiply=False
+                    ),
+                    "Financial impact": format_currency(i["financial_impact_total"]),
+                    "ROI": format_roi_value(i["roi_ratio"]),
+                    "Confidence": format_percentage(
+                        i["confidence_score"], decimals=0, multiply=False
+                    ),
+                }
+                for i in _optimizer_result()["interventions"][:8]
+            ]
             return render.DataGrid(pd.DataFrame(rows))
         except Exception as e:
             return render.DataGrid(pd.DataFrame({"Error": [str(e)]}))
@@ -0,0 +1,102 @@
+# cloud_refresh.py
+# ─────────────────────────────────────────────────────────────
+# Background Refresh Scheduler — StarGuard Desktop
+# Keeps the Sheets-backed snapshots (gap trail, forecast cache) fresh
+# on one daemon thread so renders never wait on Google. Panels read the
+# last good snapshot and re-render when its generation counter moves.
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+# Seconds between background refreshes of each registered snapshot
+REFRESH_INTERVAL = float(os.environ.get("CLOUD_REFRESH_INTERVAL", "30"))
+
+
+class RefreshScheduler:
+    """
+    Runs registered refresh jobs every ``interval`` seconds on one daemon
+    thread. refresh_now(name) wakes the thread early (e.g. a Refresh
+    button); jobs never run concurrently with themselves.
+    """
+
+    def __init__(self, interval: float = REFRESH_INTERVAL) -> None:
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, fn: Callable[[], Any], interval: float | None = None) -> None:
+        """Add (or replace) a job; it first runs one interval from now."""
+        every = self.interval if interval is None else interval
+        with self._cond:
+            self._jobs[name] = {
+                "fn": fn,
+                "interval": every,
+                "due": time.monotonic() + every,
+                "runs": 0,
+                "last_run": None,
+                "elapsed_ms": None,
+                "error": None,
+            }
+            self._cond.notify()
+
+    def start(self) -> None:
+        """Start the scheduler thread (idempotent)."""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cloud-refresh", daemon=True)
+                self._thread.start()
+
+    def refresh_now(self, name: str | None = None) -> None:
+        """Make ``name`` (or every job) due immediately; returns without waiting."""
+        with self._cond:
+            for job_name, job in self._jobs.items():
+                if name is None or job_name == name:
+                    job["due"] = 0.0
+            self._cond.notify()
+
+    def run_pending(self) -> int:
+        """Run every due job on the calling thread. Returns how many ran."""
+        now = time.monotonic()
+        with self._cond:
+            due = [(n, j) for n, j in self._jobs.items() if j["due"] <= now]
+            for _, job in due:
+                job["due"] = now + job["interval"]
+        for _, job in due:
+            started = time.perf_counter()
+            try:
+                job["fn"]()
+                job["error"] = None
+            except Exception as e:
+                job["error"] = str(e)
+                print(f"[WARN] Background refresh failed: {e}")
+            job["runs"] += 1
+            job["last_run"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            job["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return len(due)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                wait = min((j["due"] for j in self._jobs.values()), default=None)
+                if wait is None or wait > time.monotonic():
+                    self._cond.wait(None if wait is None else wait - time.monotonic())
+                    continue
+            self.run_pending()
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Per-job runs, last_run, elapsed_ms and error for diagnostics panels."""
+        with self._cond:
+            return {
+                name: {k: v for k, v in job.items() if k not in ("fn", "due")}
+                for name, job in self._jobs.items()
+            }
+
+
+# Process-wide scheduler shared by every Shiny session
+refresh_scheduler = RefreshScheduler()
@@ -11,6 +11,8 @@ This module calculates:
 
 from datetime import datetime
 
+import numpy as np
+
 # ============================================================================
 # CMS STAR RATING CONFIGURATION (2024-2025)
 # ============================================================================
@@ -48,6 +50,18 @@ STAR_CUTPOINTS = {
     "HEI": {"5_star": 0.15, "4_star": 0.18, "3_star": 0.21, "2_star": 0.24},  # Lower is better
 }
 
+# Measures where a lower rate earns more stars
+INVERSE_MEASURES = ["HEI"]
+
+# Precompiled lookup tables for the batch engine. Each cut-point row is
+# [2, 3, 4, 5]-star thresholds multiplied by the measure's sign, so inverse
+# measures become ascending too and stars = 1 + searchsorted(row, sign * rate).
+_MEASURE_INDEX = {m: i for i, m in enumerate(STAR_CUTPOINTS)}
+_MEASURE_SIGN = np.array([-1.0 if m in INVERSE_MEASURES else 1.0 for m in STAR_CUTPOINTS])
+_CUTPOINT_MATRIX = _MEASURE_SIGN[:, None] * np.array(
+    [[c["2_star"], c["3_star"], c["4_star"], c["5_star"]] for c in STAR_CUTPOINTS.values()]
+)
+
 
 # ============================================================================
 # CORE CALCULATION FUNCTIONS
@@ -72,7 +86,7 @@ def calculate_measure_stars(measure_id: str, rate: float) -> float:
         return 3.0
 
     cutpoints = STAR_CUTPOINTS[measure_id]
-    is_inverse = measure_id in ["HEI"]
+    is_inverse = measure_id in INVERSE_MEASURES
 
     if is_inverse:
         if rate <= cutpoints["5_star"]:
@@ -161,6 +175,85 @@ def calculate_overall_star_rating(measure_results: list[dict]) -> dict:
     }
 
 
+def calculate_measure_stars_batch(measure_ids, rates) -> np.ndarray:
+    """
+    Vectorized calculate_measure_stars over arrays of rates
+
+    ``measure_ids`` broadcasts against ``rates``, so a list of column
+    measures scores a (contracts x measures) or (contracts x scenarios x
+    measures) rate array in one call. Unknown measures score 3.0 like the
+    scalar function; NaN rates score NaN (not reported).
+
+    Args:
+        measure_ids: Measure code per rate (array-like of str)
+        rates: Performance rates (0.0 to 1.0), NaN where not reported
+
+    Returns:
+        Float array of star ratings, broadcast shape of the inputs
+    """
+    rates = np.asarray(rates, dtype=float)
+    codes = np.array([_MEASURE_INDEX.get(m, -1) for m in np.ravel(measure_ids)], dtype=int)
+    codes = codes.reshape(np.shape(measure_ids))
+
+    if codes.ndim == 1 and rates.ndim >= 1 and len(codes) == rates.shape[-1]:
+        # one measure per column (the common wide layout): one searchsorted per column
+        stars = np.full(rates.shape, 3.0)
+        for j, code in enumerate(codes):
+            if code >= 0:
+                signed = rates[..., j] * _MEASURE_SIGN[code]
+                stars[..., j] = 1.0 + np.searchsorted(_CUTPOINT_MATRIX[code], signed, side="right")
+        stars[np.isnan(rates)] = np.nan
+        return stars
+
+    codes, rates = np.broadcast_arrays(codes, rates)
+    stars = np.full(rates.shape, 3.0)
+    for code in np.unique(codes[codes >= 0]):
+        mask = codes == code
+        signed = rates[mask] * _MEASURE_SIGN[code]
+        stars[mask] = 1.0 + np.searchsorted(_CUTPOINT_MATRIX[code], signed, side="right")
+    stars[np.isnan(rates)] = np.nan
+    return stars
+
+
+def calculate_overall_star_rating_batch(measure_ids: list[str], rates) -> dict:
+    """
+    Vectorized calculate_overall_star_rating for many contracts/scenarios
+
+    The last axis of ``rates`` lines up with ``measure_ids``; every leading
+    axis is a batch dimension (contracts, scenarios, simulations...). NaN
+    rates are treated as not reported and drop out of the weighted average.
+
+    Args:
+        measure_ids: Measure code for each column of ``rates``
+        rates: Array of shape (..., len(measure_ids))
+
+    Returns:
+        Dict of arrays: stars (same shape as rates), weights (per measure),
+        weighted_score and overall_rating (rates.shape[:-1]), total_measures
+    """
+    rates = np.asarray(rates, dtype=float)
+    if rates.shape[-1:] != (len(measure_ids),):
+        raise ValueError(f"rates last axis must have {len(measure_ids)} columns, got {rates.shape}")
+
+    stars = calculate_measure_stars_batch(np.asarray(measure_ids, dtype=object), rates)
+    weights = np.array([3.0 if m in TRIPLE_WEIGHTED_MEASURES else 1.0 for m in measure_ids])
+    reported = ~np.isnan(stars)
+    total_weight = (reported * weights).sum(axis=-1)
+    weighted_sum = np.where(reported, stars, 0.0) @ weights
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weighted_score = np.where(total_weight > 0, weighted_sum / total_weight, 0.0)
+    overall_rating = np.minimum(5.0, np.round(weighted_score * 2) / 2)
+
+    return {
+        "stars": stars,
+        "weights": weights,
+        "weighted_score": weighted_score,
+        "overall_rating": overall_rating,
+        "total_measures": reported.sum(axis=-1),
+    }
+
+
 def calculate_financial_impact(
     current_rating: float,
     projected_rating: float,
@@ -351,9 +444,12 @@ def generate_gap_closure_recommendations(
 __all__ = [
     "calculate_measure_stars",
     "calculate_overall_star_rating",
+    "calculate_measure_stars_batch",
+    "calculate_overall_star_rating_batch",
     "calculate_financial_impact",
     "calculate_quality_cost_savings",
     "generate_gap_closure_recommendations",
     "STAR_CUTPOINTS",
     "TRIPLE_WEIGHTED_MEASURES",
+    "INVERSE_MEASURES",
 ]
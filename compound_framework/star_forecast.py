@@ -0,0 +1,315 @@
+"""
+Monte Carlo Star Rating forecaster
+
+Projects measure rates forward by simulation instead of fixed offsets:
+1. Current rate drawn from its binomial sampling uncertainty
+   (Jeffreys Beta posterior on numerator/denominator)
+2. Monthly gap-closure velocity drawn around the historical rate
+   reported by get_gap_analysis
+3. Open gaps closed as binomial draws over the forecast horizon
+4. Every simulated rate vector scored with the batch star-rating engine,
+   giving a distribution over overall ratings and CMS bonus payments
+
+Each measure gets its own seeded random stream (SeedSequence.spawn), so a
+forecast is reproducible from its seed and adding a measure does not move
+the draws of the others.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from utils.measure_analysis import MAX_CLOSURE_RATE_PER_QUARTER, get_gap_analysis
+
+from .financial_impact import (
+    INVERSE_MEASURES,
+    STAR_CUTPOINTS,
+    STAR_RATING_BONUSES,
+    calculate_overall_star_rating,
+    calculate_overall_star_rating_batch,
+)
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_HORIZON_MONTHS = 12
+# Eligible population assumed when a measure only has a rate
+DEFAULT_DENOMINATOR = 1000
+# Historical ceiling on closure velocity (12% of open gaps per quarter)
+MAX_MONTHLY_CLOSURE = MAX_CLOSURE_RATE_PER_QUARTER / 3
+# A rate forecast counts as "confident" when it lands within this many points
+RATE_TOLERANCE = 0.025
+
+_BONUS_CUTS = np.array(sorted(STAR_RATING_BONUSES))
+_BONUS_PCTS = np.array([STAR_RATING_BONUSES[k] for k in _BONUS_CUTS])
+
+
+def confidence_level(score: float) -> str:
+    """HIGH | MEDIUM | LOW, using the same cut-offs as the app's confidence badges."""
+    if score >= 0.7:
+        return "HIGH"
+    if score >= 0.5:
+        return "MEDIUM"
+    return "LOW"
+
+
+def closure_velocity(measure_id: str, as_of: date | None = None) -> tuple[float, int]:
+    """
+    Historical monthly closure probability for one open gap
+
+    Uses the trailing 12 months of get_gap_analysis: average intervention
+    closure rate scaled by how many closure cycles fit in a month, capped at
+    the historical benchmark.
+
+    Returns:
+        (monthly closure probability, number of gaps it is based on)
+    """
+    as_of = as_of or date.today()
+    gap = get_gap_analysis(measure_id, (as_of - timedelta(days=365)).isoformat(), as_of.isoformat())
+    success = list(gap.get("closure_rate_by_intervention", {}).values())
+    success_rate = float(np.mean(success)) if success else 0.5
+    days = max(float(gap.get("average_days_to_close") or 30), 1.0)
+    monthly = min(success_rate * 30.0 / days, MAX_MONTHLY_CLOSURE)
+    return monthly, max(int(gap.get("total_gaps") or 0), 1)
+
+
+def _measure_spec(measure: dict) -> dict:
+    """Normalize {'measure_id', 'rate' | 'numerator'+'denominator', ...} for simulation."""
+    measure_id = measure["measure_id"]
+    denominator = int(measure.get("denominator") or 0)
+    if denominator > 0:
+        numerator = min(max(float(measure.get("numerator") or 0), 0.0), denominator)
+    else:
+        denominator = DEFAULT_DENOMINATOR
+        numerator = float(measure.get("rate", 0)) * denominator
+    if "closure_velocity" in measure:
+        velocity, evidence = float(measure["closure_velocity"]), 0
+    else:
+        velocity, evidence = closure_velocity(measure_id)
+    return {
+        "measure_id": measure_id,
+        "numerator": numerator,
+        "denominator": denominator,
+        "velocity": velocity,
+        "evidence": evidence,
+        "inverse": measure_id in INVERSE_MEASURES,
+    }
+
+
+def _simulate_rates(
+    spec: dict, horizons: list[int], n_sims: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Simulated rates for one measure, shape (n_sims, len(horizons)); horizons ascending."""
+    num, den = spec["numerator"], spec["denominator"]
+    rate = rng.beta(num + 0.5, den - num + 0.5, n_sims)
+
+    v = spec["velocity"]
+    if spec["evidence"] and 0.0 < v < 1.0:
+        k = spec["evidence"]
+        velocity = rng.beta(v * k, (1.0 - v) * k, n_sims)
+    else:
+        velocity = np.full(n_sims, v)
+
+    # an open gap is a non-compliant member (a compliant one for inverse measures)
+    still_open = np.rint(den * (rate if spec["inverse"] else 1.0 - rate)).astype(np.int64)
+    closed = np.zeros(n_sims, dtype=np.int64)
+    out = np.empty((n_sims, len(horizons)))
+    elapsed = 0
+    for j, months in enumerate(horizons):
+        hazard = 1.0 - (1.0 - velocity) ** (months - elapsed)
+        step = rng.binomial(still_open, hazard)
+        still_open -= step
+        closed += step
+        elapsed = months
+        shift = closed / den
+        out[:, j] = rate - shift if spec["inverse"] else rate + shift
+    return np.clip(out, 0.0, 1.0)
+
+
+def _streams(seed: int | None, n: int) -> tuple[int, list[np.random.Generator]]:
+    seq = np.random.SeedSequence(seed)
+    return seq.entropy, [np.random.default_rng(s) for s in seq.spawn(n)]
+
+
+def simulate_star_forecast(
+    measures: list[dict],
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: int | None = None,
+    member_count: int = 25000,
+    avg_revenue_per_member: float = 12000,
+) -> dict:
+    """
+    Monte Carlo distribution of the overall Star Rating after ``horizon_months``
+
+    Args:
+        measures: Dicts with 'measure_id' and either 'numerator'/'denominator'
+            or 'rate' (DEFAULT_DENOMINATOR assumed). An optional
+            'closure_velocity' overrides the get_gap_analysis history.
+        horizon_months: Months of gap closure to simulate
+        n_sims: Number of simulated measurement years
+        seed: Seed for reproducible runs (None draws fresh entropy; the
+            entropy used is returned as 'seed')
+        member_count: Members for bonus payment projection
+        avg_revenue_per_member: Annual revenue per member
+
+    Returns:
+        Dict with current_rating, projected_star_rating (most likely rating),
+        expected_rating, rating_ci (95%), rating_distribution, confidence,
+        confidence_level, probability_improved, bonus payment summary and
+        per-measure projected rates
+    """
+    started = time.perf_counter()
+    specs = [_measure_spec(m) for m in measures if m.get("measure_id")]
+    if not specs:
+        raise ValueError("at least one measure with a measure_id is required")
+
+    seed, streams = _streams(seed, len(specs))
+    rates = np.column_stack(
+        [_simulate_rates(s, [horizon_months], n_sims, rng)[:, 0] for s, rng in zip(specs, streams)]
+    )
+    measure_ids = [s["measure_id"] for s in specs]
+    ratings = calculate_overall_star_rating_batch(measure_ids, rates)["overall_rating"]
+
+    current = calculate_overall_star_rating(
+        [{"measure_id": s["measure_id"], "rate": s["numerator"] / s["denominator"]} for s in specs]
+    )["overall_rating"]
+    values, counts = np.unique(ratings, return_counts=True)
+    probs = counts / n_sims
+    projected = float(values[np.argmax(probs)])
+
+    total_revenue = member_count * avg_revenue_per_member
+    idx = np.searchsorted(_BONUS_CUTS, ratings, side="right") - 1
+    bonus = total_revenue * np.where(idx >= 0, _BONUS_PCTS[np.maximum(idx, 0)], 0.0)
+    current_bonus = total_revenue * STAR_RATING_BONUSES.get(current, 0.0)
+    confidence = float(probs.max())
+
+    return {
+        "success": True,
+        "n_sims": n_sims,
+        "seed": seed,
+        "horizon_months": horizon_months,
+        "current_rating": current,
+        "projected_star_rating": projected,
+        "expected_rating": float(ratings.mean()),
+        "rating_ci": tuple(float(x) for x in np.percentile(ratings, [2.5, 97.5])),
+        "rating_distribution": {float(v): float(p) for v, p in zip(values, probs)},
+        "confidence": confidence,
+        "confidence_level": confidence_level(confidence),
+        "probability_improved": float((ratings > current).mean()),
+        "bonus_payment_mean": float(bonus.mean()),
+        "bonus_payment_ci": tuple(float(x) for x in np.percentile(bonus, [2.5, 97.5])),
+        "incremental_bonus_mean": float(bonus.mean() - current_bonus),
+        "measures": [
+            {
+                "measure_id": s["measure_id"],
+                "current_rate": s["numerator"] / s["denominator"],
+                "projected_rate": float(rates[:, j].mean()),
+                "ci_low": float(np.percentile(rates[:, j], 2.5)),
+                "ci_high": float(np.percentile(rates[:, j], 97.5)),
+                "closure_velocity": s["velocity"],
+            }
+            for j, s in enumerate(specs)
+        ],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def simulate_star_forecast_async(measures: list[dict], **kwargs) -> dict:
+    """simulate_star_forecast() on a worker thread, for Shiny extended tasks."""
+    return await asyncio.to_thread(simulate_star_forecast, measures, **kwargs)
+
+
+def forecast_measure_rate(
+    measure_id: str,
+    rate: float,
+    denominator: int = DEFAULT_DENOMINATOR,
+    horizons: tuple[int, ...] = (3, 6, 12),
+    n_sims: int = 20_000,
+    seed: int | None = None,
+) -> list[dict]:
+    """
+    Projected rate for one measure at each horizon (months), from one
+    consistent set of simulated closure paths.
+
+    Returns:
+        One dict per horizon: months, predicted_rate, ci_low, ci_high (95%),
+        confidence (share of runs within RATE_TOLERANCE of the prediction),
+        confidence_level, closure_velocity
+    """
+    horizons = sorted(horizons)
+    spec = _measure_spec(
+        {"measure_id": measure_id, "numerator": rate * denominator, "denominator": denominator}
+    )
+    _, (rng,) = _streams(seed, 1)
+    sims = _simulate_rates(spec, horizons, n_sims, rng)
+
+    out = []
+    for j, months in enumerate(horizons):
+        mean = float(sims[:, j].mean())
+        low, high = np.percentile(sims[:, j], [2.5, 97.5])
+        confidence = float((np.abs(sims[:, j] - mean) <= RATE_TOLERANCE).mean())
+        out.append(
+            {
+                "months": months,
+                "predicted_rate": mean,
+                "ci_low": float(low),
+                "ci_high": float(high),
+                "confidence": confidence,
+                "confidence_level": confidence_level(confidence),
+                "closure_velocity": spec["velocity"],
+            }
+        )
+    return out
+
+
+def benchmark(n_sims: int = DEFAULT_SIMULATIONS, repeats: int = 5, seed: int = 42) -> dict:
+    """Time simulate_star_forecast over every measure with cut points."""
+    measures = [
+        {"measure_id": m, "numerator": 700, "denominator": 1000, "closure_velocity": 0.03}
+        for m in STAR_CUTPOINTS
+    ]
+    timings = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        simulate_star_forecast(measures, n_sims=n_sims, seed=seed + i)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "n_sims": n_sims,
+        "measures": len(measures),
+        "best_ms": round(min(timings), 1),
+        "median_ms": round(float(np.median(timings)), 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m compound_framework.star_forecast",
+        description="Benchmark the Monte Carlo Star Rating forecaster.",
+    )
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMULATIONS)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = benchmark(n_sims=args.sims, repeats=args.repeats)
+    status = "[OK]" if result["best_ms"] < 1000 else "[WARN]"
+    print(
+        f"{status} {result['n_sims']:,} simulations x {result['measures']} measures: "
+        f"best {result['best_ms']} ms, median {result['median_ms']} ms"
+    )
+    return 0
+
+
+__all__ = [
+    "simulate_star_forecast",
+    "simulate_star_forecast_async",
+    "forecast_measure_rate",
+    "closure_velocity",
+    "confidence_level",
+    "benchmark",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
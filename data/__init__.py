@@ -3,6 +3,6 @@ StarGuard AI - Data Layer
 Database connection and query functions
 """
 
-from .db import query
+from .db import cache_stats, execute, invalidate_cache, pool_stats, query, query_async
 
-__all__ = ["query"]
+__all__ = ["query", "query_async", "execute", "invalidate_cache", "cache_stats", "pool_stats"]
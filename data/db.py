@@ -4,16 +4,161 @@ Handles PostgreSQL and SQLite database connections for Shiny application
 Uses same connection logic as Streamlit project
 """
 
+import asyncio
+import functools
 import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import TextClause, create_engine, event, text
 from sqlalchemy.pool import QueuePool
 
+try:
+    import pyarrow as pa
+
+    _ARROW_AVAILABLE = True
+except ImportError:
+    _ARROW_AVAILABLE = False
+
 # Database connection engine (singleton)
 _engine = None
 _db_type = None  # 'postgres' or 'sqlite'
+# Tuned SQLite only: single read-write connection; _engine is then read-only
+_write_engine = None
+
+
+# ─────────────────────────────────────────────────────────────
+# QUERY RESULT CACHE
+# ─────────────────────────────────────────────────────────────
+
+_TABLE_REF_RE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE)\s+([A-Za-z_][A-Za-z0-9_\.]*)", re.IGNORECASE
+)
+_WRITE_TARGET_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM|REPLACE\s+INTO|TRUNCATE(?:\s+TABLE)?)"
+    r"\s+([A-Za-z_][A-Za-z0-9_\.]*)",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and drop the trailing semicolon so equivalent SQL shares a key."""
+    return " ".join(sql.split()).rstrip(";").strip()
+
+
+def referenced_tables(sql: str) -> frozenset[str]:
+    """Table names referenced by FROM/JOIN/INTO/UPDATE clauses (lower-case, schema stripped)."""
+    return frozenset(m.split(".")[-1].lower() for m in _TABLE_REF_RE.findall(sql))
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results with per-entry TTL.
+
+    Keys are (normalized SQL, params). Each entry remembers the tables it
+    read so a write to one table evicts only the results that depend on it.
+    """
+
+    def __init__(self, max_entries: int = 256, default_ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[tuple, tuple[float, frozenset[str], pd.DataFrame]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(sql: str, params: dict | None = None) -> tuple:
+        items = tuple(sorted((k, repr(v)) for k, v in (params or {}).items()))
+        return (normalize_sql(sql), items)
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, df = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return df
+
+    def put(
+        self, key: tuple, df: pd.DataFrame, tables: frozenset[str], ttl: float | None = None
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, tables, df)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tables: str) -> int:
+        """Evict entries reading any of ``tables``; with no tables, clear everything."""
+        with self._lock:
+            if not tables:
+                n = len(self._entries)
+                self._entries.clear()
+                self.evictions += n
+                return n
+            wanted = {t.split(".")[-1].lower() for t in tables}
+            stale = [k for k, (_, deps, _) in self._entries.items() if deps & wanted]
+            for k in stale:
+                del self._entries[k]
+            self.evictions += len(stale)
+            return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_query_cache = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "256")),
+    default_ttl=float(os.getenv("QUERY_CACHE_TTL", "300")),
+)
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query result cache."""
+    return _query_cache
+
+
+def invalidate_cache(*tables: str) -> int:
+    """Evict cached results that read any of ``tables`` (all results if none given)."""
+    return _query_cache.invalidate(*tables)
+
+
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss/eviction counters for the query result cache."""
+    return _query_cache.stats()
 
 
 def get_postgres_config() -> dict:
@@ -56,132 +201,457 @@ def get_sqlite_path() -> str:
     return str(local_db_path)
 
 
+# ─────────────────────────────────────────────────────────────
+# ENGINE, POOL AND BACKEND DETECTION
+# ─────────────────────────────────────────────────────────────
+
+# Serializes first-time detection/engine creation so concurrent sessions
+# (and the startup warm-up thread) never build two engines.
+_init_lock = threading.RLock()
+_pool_wait = {"checkouts": 0, "total_s": 0.0, "max_s": 0.0}
+_pool_wait_lock = threading.Lock()
+_warmed = 0
+
+
+def get_pool_config() -> dict:
+    """Pool sizing from DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_TIMEOUT."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (incl. connect)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with _pool_wait_lock:
+                _pool_wait["checkouts"] += 1
+                _pool_wait["total_s"] += waited
+                _pool_wait["max_s"] = max(_pool_wait["max_s"], waited)
+
+
+def _postgres_url(config: dict) -> str:
+    return (
+        f"postgresql://{config['user']}:{config['password']}"
+        f"@{config['host']}:{config['port']}/{config['database']}"
+    )
+
+
+def _create_postgres_engine(config: dict):
+    return create_engine(
+        _postgres_url(config),
+        poolclass=_TimedQueuePool,
+        pool_pre_ping=True,
+        connect_args={"connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5"))},
+        echo=False,
+        **get_pool_config(),
+    )
+
+
+def _sqlite_tuned() -> bool:
+    return os.getenv("SQLITE_TUNED", "1").lower() not in ("0", "false", "no")
+
+
+def _sqlite_pragmas(read_only: bool) -> list[str]:
+    """
+    Per-connection pragmas for the tuned SQLite profile.
+
+    mmap_size lets readers page the file straight from the OS cache, a
+    negative cache_size is KiB rather than pages, and temp_store=MEMORY
+    keeps sort/GROUP BY spill tables off disk.
+    """
+    pragmas = [
+        f"PRAGMA mmap_size = {int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}",
+        f"PRAGMA cache_size = -{int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))}",
+        "PRAGMA temp_store = MEMORY",
+        f"PRAGMA busy_timeout = {int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))}",
+    ]
+    if not read_only:
+        pragmas += ["PRAGMA journal_mode = WAL", "PRAGMA synchronous = NORMAL"]
+    return pragmas
+
+
+def _apply_pragmas(engine, pragmas: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cur.execute(pragma)
+        cur.close()
+
+
+def _create_sqlite_engine(sqlite_path: str):
+    """Default SQLite engine: one pool for reads and writes, no pragmas."""
+    pool = get_pool_config()
+    return create_engine(
+        f"sqlite:///{sqlite_path}",
+        poolclass=_TimedQueuePool,
+        pool_size=pool["pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_timeout=pool["pool_timeout"],
+        echo=False,
+        connect_args={"check_same_thread": False},  # Allow multi-threaded access
+    )
+
+
+def _create_sqlite_engines(sqlite_path: str):
+    """
+    Tuned SQLite profile: (read_engine, write_engine).
+
+    The writer is a single pooled connection that puts the file in WAL mode,
+    so writes queue on checkout instead of contending for the file lock.
+    Dashboard reads use a pool of read-only URI connections, which under
+    WAL never block on (or block) the writer.
+    """
+    pool = get_pool_config()
+    uri = Path(sqlite_path).resolve().as_uri()
+
+    writer = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(f"{uri}?mode=rwc", uri=True, check_same_thread=False),
+        poolclass=_TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=pool["pool_timeout"],
+        echo=False,
+    )
+    _apply_pragmas(writer, _sqlite_pragmas(read_only=False))
+    # First write connection creates the file (if missing) and switches it to WAL
+    with writer.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    reader = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(f"{uri}?mode=ro", uri=True, check_same_thread=False),
+        poolclass=_TimedQueuePool,
+        pool_size=pool["pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_timeout=pool["pool_timeout"],
+        echo=False,
+    )
+    _apply_pragmas(reader, _sqlite_pragmas(read_only=True))
+    return reader, writer
+
+
 def get_db_type() -> str:
     """
-    Detect which database to use.
+    Detect which database to use (once per process).
     Priority: SQLite (if file exists) > PostgreSQL fallback
     Same logic as Streamlit project.
+
+    The Postgres probe is the engine's first pooled connection, so detection
+    and get_engine() share one connect instead of opening a throwaway one.
     """
-    global _db_type
+    global _db_type, _engine
 
     if _db_type:
         return _db_type
 
-    # FIRST: Check if SQLite database file exists
-    sqlite_path = get_sqlite_path()
-    if os.path.exists(sqlite_path):
-        try:
-            # Test SQLite connection
-            import sqlite3
-
-            test_conn = sqlite3.connect(sqlite_path)
-            test_conn.close()
-            _db_type = "sqlite"
-            print(f"[OK] Using SQLite database: {sqlite_path}")
-            return "sqlite"
-        except Exception:
-            pass
-
-    # SECOND: Try PostgreSQL if SQLite is not available
-    has_postgres_config = os.getenv("DB_HOST") or os.getenv("DB_NAME") or os.getenv("DB_USER")
-
-    if has_postgres_config:
-        try:
+    with _init_lock:
+        if _db_type:
+            return _db_type
+
+        # FIRST: Check if SQLite database file exists
+        sqlite_path = get_sqlite_path()
+        if os.path.exists(sqlite_path):
+            try:
+                # Test SQLite connection
+                test_conn = sqlite3.connect(sqlite_path)
+                test_conn.close()
+                _db_type = "sqlite"
+                print(f"[OK] Using SQLite database: {sqlite_path}")
+                return "sqlite"
+            except Exception:
+                pass
+
+        # SECOND: Try PostgreSQL if SQLite is not available
+        has_postgres_config = os.getenv("DB_HOST") or os.getenv("DB_NAME") or os.getenv("DB_USER")
+
+        if has_postgres_config:
             config = get_postgres_config()
-            import psycopg2
-
-            test_conn = psycopg2.connect(**config)
-            test_conn.close()
-            _db_type = "postgres"
-            print(
-                f"[OK] Using PostgreSQL database: {config['host']}:{config['port']}/{config['database']}"
-            )
-            return "postgres"
-        except Exception:
-            pass
+            engine = None
+            try:
+                engine = _create_postgres_engine(config)
+                with engine.connect() as conn:
+                    db_name = conn.execute(text("SELECT current_database()")).scalar()
+                _engine = engine
+                _db_type = "postgres"
+                print(f"[OK] Using PostgreSQL database: {db_name}")
+                print(f"     Host: {config['host']}:{config['port']}")
+                print(f"     User: {config['user']}")
+                return "postgres"
+            except Exception:
+                if engine is not None:
+                    engine.dispose()
 
-    # Fallback to SQLite (will create file if it doesn't exist)
-    _db_type = "sqlite"
-    print(f"[OK] Using SQLite database (fallback): {sqlite_path}")
-    return "sqlite"
+        # Fallback to SQLite (will create file if it doesn't exist)
+        _db_type = "sqlite"
+        print(f"[OK] Using SQLite database (fallback): {sqlite_path}")
+        return "sqlite"
 
 
 def get_engine():
     """
     Get SQLAlchemy engine with connection pooling.
     Creates engine on first call, reuses on subsequent calls.
-    Supports both PostgreSQL and SQLite.
+    Supports both PostgreSQL and SQLite; pool sizing comes from get_pool_config().
     """
-    global _engine
+    global _engine, _write_engine
 
     if _engine is not None:
         return _engine
 
-    db_type = get_db_type()
+    with _init_lock:
+        if _engine is not None:
+            return _engine
 
-    try:
-        if db_type == "postgres":
-            config = get_postgres_config()
+        db_type = get_db_type()
+        if _engine is not None:  # the Postgres probe already built it
+            return _engine
 
-            # Build PostgreSQL connection string
-            connection_string = (
-                f"postgresql://{config['user']}:{config['password']}"
-                f"@{config['host']}:{config['port']}/{config['database']}"
-            )
+        try:
+            if db_type == "postgres":
+                config = get_postgres_config()
+                engine = _create_postgres_engine(config)
+                with engine.connect() as conn:
+                    db_name = conn.execute(text("SELECT current_database()")).scalar()
+                print(f"[OK] Connected to PostgreSQL database: {db_name}")
+            elif _sqlite_tuned():
+                sqlite_path = get_sqlite_path()
+                engine, writer = _create_sqlite_engines(sqlite_path)
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                _write_engine = writer
+                print(f"[OK] Connected to SQLite database (WAL, read-only pool): {sqlite_path}")
+            else:
+                sqlite_path = get_sqlite_path()
+                engine = _create_sqlite_engine(sqlite_path)
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                print(f"[OK] Connected to SQLite database: {sqlite_path}")
 
-            # Create PostgreSQL engine with connection pooling
-            _engine = create_engine(
-                connection_string,
-                poolclass=QueuePool,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
-                echo=False,
-            )
+            _engine = engine
+            return _engine
 
-            # Test connection
-            with _engine.connect() as conn:
-                result = conn.execute(text("SELECT current_database()"))
-                db_name = result.scalar()
-                print(f"[OK] Connected to PostgreSQL database: {db_name}")
-                print(f"     Host: {config['host']}:{config['port']}")
-                print(f"     User: {config['user']}")
+        except Exception as e:
+            print(f"[ERROR] Database connection error: {e}")
+            if db_type == "postgres":
+                print(
+                    "        Check your DB_HOST, DB_NAME, DB_USER, DB_PASSWORD environment variables"
+                )
+            else:
+                print(f"        Check SQLite database file: {get_sqlite_path()}")
+            raise
 
-        else:
-            # SQLite
-            sqlite_path = get_sqlite_path()
-            connection_string = f"sqlite:///{sqlite_path}"
-
-            # Create SQLite engine (no pooling needed for SQLite)
-            _engine = create_engine(
-                connection_string,
-                echo=False,
-                connect_args={"check_same_thread": False},  # Allow multi-threaded access
-            )
 
-            # Test connection
-            with _engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                print(f"[OK] Connected to SQLite database: {sqlite_path}")
+def get_write_engine():
+    """
+    Engine for INSERT/UPDATE/DELETE and DDL.
 
-        return _engine
+    With the tuned SQLite profile this is the single writer connection;
+    otherwise it is the same engine as get_engine().
+    """
+    engine = get_engine()
+    return _write_engine if _write_engine is not None else engine
 
+
+def warm_pool(connections: int | None = None) -> int:
+    """
+    Open up to ``connections`` (default pool_size) pooled connections at once
+    and return them to the pool, so the first dashboard requests skip connect.
+    Returns the number warmed; never raises.
+    """
+    global _warmed
+    try:
+        engine = get_engine()
+        n = get_pool_config()["pool_size"] if connections is None else connections
+        held = []
+        try:
+            for _ in range(n):
+                held.append(engine.connect())
+        finally:
+            for conn in held:
+                conn.close()
+        _warmed = len(held)
+        return _warmed
     except Exception as e:
-        print(f"[ERROR] Database connection error: {e}")
-        if db_type == "postgres":
-            print("        Check your DB_HOST, DB_NAME, DB_USER, DB_PASSWORD environment variables")
+        print(f"[WARN] Connection pool warm-up skipped: {e}")
+        return 0
+
+
+def pool_stats() -> dict[str, Any]:
+    """Connection pool counters for status panels and diagnostics."""
+    with _pool_wait_lock:
+        checkouts = _pool_wait["checkouts"]
+        stats: dict[str, Any] = {
+            "db_type": _db_type,
+            "checkouts": checkouts,
+            "avg_wait_ms": round(_pool_wait["total_s"] / checkouts * 1000, 2) if checkouts else 0.0,
+            "max_wait_ms": round(_pool_wait["max_s"] * 1000, 2),
+            "warmed": _warmed,
+        }
+    pool = _engine.pool if _engine is not None else None
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=get_pool_config()["max_overflow"],
+        )
+    return stats
+
+
+# ─────────────────────────────────────────────────────────────
+# NAMED QUERIES + POSTGRES PREPARED STATEMENTS
+# ─────────────────────────────────────────────────────────────
+
+_QUERY_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_BIND_PARAM_RE = re.compile(r"(?<![:\w]):([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _use_prepared_statements() -> bool:
+    return os.getenv("PG_PREPARED_STATEMENTS", "1").lower() not in ("0", "false", "no")
+
+
+def _resolve_statement(sql: str | TextClause, params: dict | None) -> tuple[str, dict, str | None]:
+    """
+    Normalize the accepted query forms to (sql_text, params, registry_name).
+
+    - a registered name from utils.queries.NAMED_QUERIES ("roi_by_measure")
+    - a text() clause, e.g. from the utils.queries builders, with bound values
+    - a raw SQL string (registry_name is None)
+    """
+    if isinstance(sql, TextClause):
+        from utils.queries import find_query_name
+
+        bound = {k: v for k, v in sql.compile().params.items() if v is not None}
+        return sql.text, {**bound, **(params or {})}, find_query_name(sql.text)
+
+    name = sql.strip()
+    if _QUERY_NAME_RE.fullmatch(name):
+        from utils.queries import get_named_query, get_named_sql
+
+        entry = get_named_query(name)
+        sql_text = get_named_sql(name, get_db_type())
+        return sql_text, {**entry["defaults"], **(params or {})}, name
+
+    return sql, params or {}, None
+
+
+def _read_prepared(engine, name: str, sql_text: str, params: dict) -> tuple[list[str], list]:
+    """
+    Run a registered query as a Postgres server-side prepared statement.
+
+    PREPARE is issued once per pooled DBAPI connection (tracked in the
+    connection's ``info`` dict, which lives as long as the connection), so
+    repeated dashboard loads skip parse/plan and only send EXECUTE.
+    """
+    order = list(dict.fromkeys(_BIND_PARAM_RE.findall(sql_text)))
+    # one registry name can render several texts (dialect/rollup) — key on the text too
+    stmt_name = f"sg_{name}_{zlib.crc32(sql_text.encode()):08x}"
+    with engine.connect() as conn:
+        dbapi_conn = conn.connection
+        prepared = dbapi_conn.info.setdefault("sg_prepared", set())
+        try:
+            with dbapi_conn.cursor() as cur:
+                if stmt_name not in prepared:
+                    pg_sql = _BIND_PARAM_RE.sub(
+                        lambda m: f"${order.index(m.group(1)) + 1}", normalize_sql(sql_text)
+                    )
+                    cur.execute(f"PREPARE {stmt_name} AS {pg_sql}")
+                    prepared.add(stmt_name)
+                placeholders = ", ".join(["%s"] * len(order))
+                cur.execute(
+                    f"EXECUTE {stmt_name}({placeholders})" if order else f"EXECUTE {stmt_name}",
+                    [params[k] for k in order],
+                )
+                columns = [d[0] for d in cur.description]
+                rows = cur.fetchall()
+            dbapi_conn.commit()
+        except Exception:
+            # Session state is uncertain (e.g. PREPARE inside an aborted
+            # transaction) — drop the connection rather than guess.
+            conn.invalidate()
+            raise
+    return columns, rows
+
+
+# ─────────────────────────────────────────────────────────────
+# ARROW FETCH PATH
+# ─────────────────────────────────────────────────────────────
+
+
+def _read_rows(engine, sql_text: str, params: dict, bound: bool) -> tuple[list[str], list]:
+    """Plain DBAPI fetch: column names and row tuples, no pandas inference."""
+    with engine.connect() as conn:
+        if bound:
+            result = conn.execute(text(sql_text), params)
         else:
-            print(f"        Check SQLite database file: {get_sqlite_path()}")
-        raise
+            result = conn.exec_driver_sql(sql_text, params or None)
+        return list(result.keys()), result.fetchall()
 
 
-def query(sql: str, params: dict | None = None) -> pd.DataFrame:
+def _arrow_frame(columns: list[str], rows: list, schema: dict[str, str]) -> pd.DataFrame:
+    """
+    Build an Arrow-backed DataFrame column by column.
+
+    ``schema`` maps column name to a pyarrow type name ("string", "int64",
+    "float64", "date32", ...); unlisted columns keep Arrow's inferred type.
+    """
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = []
+    for col, vals in zip(columns, values):
+        arr = pa.array(list(vals))
+        if col in schema:
+            arr = arr.cast(getattr(pa, schema[col])())
+        arrays.append(arr)
+    table = pa.Table.from_arrays(arrays, names=columns)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _apply_schema(df: pd.DataFrame, schema: dict[str, str]) -> pd.DataFrame:
+    """Cast ``df`` (already Arrow-backed) to the declared column types."""
+    casts = {c: pd.ArrowDtype(getattr(pa, t)()) for c, t in schema.items() if c in df.columns}
+    return df.astype(casts) if casts else df
+
+
+def query(
+    sql: str | TextClause,
+    params: dict | None = None,
+    *,
+    use_cache: bool = True,
+    ttl: float | None = None,
+    arrow: bool = False,
+    schema: dict[str, str] | None = None,
+) -> pd.DataFrame:
     """
     Execute a SQL query and return results as a pandas DataFrame.
 
+    Results are served from the process-wide cache when an identical
+    (normalized SQL, params) pair was read within its TTL. Callers get a
+    copy, so mutating the returned frame never alters the cached one.
+
+    Registered queries (utils.queries.NAMED_QUERIES) run as server-side
+    prepared statements on Postgres; set PG_PREPARED_STATEMENTS=0 to disable.
+
     Args:
-        sql: SQL query string
+        sql: SQL string, a registered query name, or a text() clause
         params: Optional dictionary of parameters for parameterized queries
+        use_cache: Set False to always hit the database
+        ttl: Seconds to keep this result (defaults to QUERY_CACHE_TTL)
+        arrow: Return Arrow-backed columns (pd.ArrowDtype) instead of
+            object/NumPy dtypes; ignored when pyarrow is not installed
+        schema: Column -> pyarrow type name for arrow mode; registered
+            queries default to their declared schema
 
     Returns:
         DataFrame with query results
@@ -190,14 +660,53 @@ def query(sql: str, params: dict | None = None) -> pd.DataFrame:
         Exception: If query execution fails
     """
     try:
-        engine = get_engine()
+        sql_text, params, name = _resolve_statement(sql, params)
+        bound = not isinstance(sql, str) or name is not None
+
+        arrow = arrow and _ARROW_AVAILABLE
+        key = QueryCache.make_key(sql_text, params) if use_cache else None
+        if key is not None and arrow:
+            key = (*key, "arrow")
+        if key is not None:
+            cached = _query_cache.get(key)
+            if cached is not None:
+                return cached.copy()
 
+        engine = get_engine()
+        prepared = name and get_db_type() == "postgres" and _use_prepared_statements()
+        if arrow and schema is None and name:
+            from utils.queries import get_named_query
+
+            schema = get_named_query(name)["schema"]
+
+        if arrow and get_db_type() == "postgres" and not prepared:
+            df = pd.read_sql(
+                text(sql_text) if bound else sql_text,
+                engine,
+                params=params or None,
+                dtype_backend="pyarrow",
+            )
+            df = _apply_schema(df, schema or {})
+        elif arrow:
+            if prepared:
+                columns, rows = _read_prepared(engine, name, sql_text, params)
+            else:
+                columns, rows = _read_rows(engine, sql_text, params, bound)
+            df = _arrow_frame(columns, rows, schema or {})
+        elif prepared:
+            columns, rows = _read_prepared(engine, name, sql_text, params)
+            df = pd.DataFrame(rows, columns=columns)
+        elif bound:
+            df = pd.read_sql(text(sql_text), engine, params=params)
         # Use pandas read_sql for better compatibility
-        if params:
-            df = pd.read_sql(sql, engine, params=params)
+        elif params:
+            df = pd.read_sql(sql_text, engine, params=params)
         else:
-            df = pd.read_sql(sql, engine)
+            df = pd.read_sql(sql_text, engine)
 
+        if key is not None:
+            _query_cache.put(key, df, referenced_tables(sql_text), ttl=ttl)
+            return df.copy()
         return df
 
     except Exception as e:
@@ -206,6 +715,84 @@ def query(sql: str, params: dict | None = None) -> pd.DataFrame:
         raise Exception(error_msg)
 
 
+# Bounded pool for off-loop reads. Kept at or below the engine's pool_size so
+# async callers queue here instead of waiting on connection checkout.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _async_workers() -> int:
+    return max(1, int(os.getenv("DB_ASYNC_WORKERS", "4")))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared thread pool used by query_async() and run_in_db_executor()."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_async_workers(), thread_name_prefix="db-query"
+            )
+        return _executor
+
+
+async def run_in_db_executor(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` on the database thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def query_async(
+    sql: str | TextClause,
+    params: dict | None = None,
+    *,
+    use_cache: bool = True,
+    ttl: float | None = None,
+    arrow: bool = False,
+    schema: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    """
+    Awaitable query(): same arguments, cache and errors, but the database
+    round trip runs on a bounded thread pool (DB_ASYNC_WORKERS, default 4)
+    so the event loop keeps serving other outputs and sessions.
+
+    Use from async code such as a Shiny @reactive.extended_task.
+    """
+    return await run_in_db_executor(
+        query, sql, params, use_cache=use_cache, ttl=ttl, arrow=arrow, schema=schema
+    )
+
+
+def execute(sql: str, params: dict | None = None) -> int:
+    """
+    Execute a write statement (INSERT/UPDATE/DELETE) in its own transaction.
+
+    Cached results that read the written table are evicted afterwards so
+    the next dashboard read sees the change; writes to member_interventions
+    also mark the daily rollup dirty. Returns the affected row count.
+    """
+    try:
+        engine = get_write_engine()
+        with engine.begin() as conn:
+            result = conn.execute(text(sql), params or {})
+            rowcount = result.rowcount
+    except Exception as e:
+        error_msg = f"Database execute error: {e}"
+        print(f"[ERROR] {error_msg}")
+        raise Exception(error_msg)
+
+    m = _WRITE_TARGET_RE.match(sql)
+    if m:
+        invalidate_cache(m.group(1))
+    else:
+        invalidate_cache()
+    if not m or m.group(1).lower().rsplit(".", 1)[-1] == "member_interventions":
+        from .rollups import mark_rollups_dirty
+
+        mark_rollups_dirty()
+    return rowcount
+
+
 def test_connection() -> bool:
     """
     Test database connection and return True if successful.
@@ -0,0 +1,229 @@
+"""
+StarGuard AI - Index Advisor / Schema Bootstrap
+Ensures the columns the dashboard filters and joins on are indexed, for
+both SQLite and PostgreSQL, and reports EXPLAIN plans before and after.
+
+Startup:  bootstrap_indexes()               (AUTO_CREATE_INDEXES=0 disables)
+CLI:      python -m data.indexes [--dry-run] [--explain]
+"""
+
+import argparse
+import os
+from typing import Any
+
+from sqlalchemy import inspect, text
+
+from .db import get_db_type, get_engine, get_write_engine
+
+# Covering indexes for the queries registered in utils.queries.
+# "columns" are the search key; "include" columns make the index covering
+# (INCLUDE on Postgres, trailing key columns on SQLite).
+INDEX_SPECS: list[dict[str, Any]] = [
+    {
+        "name": "idx_mi_date_cover",
+        "table": "member_interventions",
+        "columns": ["intervention_date"],
+        "include": ["measure_id", "activity_id", "status", "cost_per_intervention"],
+    },
+    {
+        "name": "idx_mi_measure_date",
+        "table": "member_interventions",
+        "columns": ["measure_id", "intervention_date"],
+        "include": ["status", "cost_per_intervention"],
+    },
+    {
+        "name": "idx_mi_activity_date",
+        "table": "member_interventions",
+        "columns": ["activity_id", "intervention_date"],
+        "include": ["status", "cost_per_intervention"],
+    },
+    {
+        "name": "idx_mi_status",
+        "table": "member_interventions",
+        "columns": ["status"],
+        "include": [],
+    },
+    {
+        "name": "idx_gaps_member_status",
+        "table": "gaps",
+        "columns": ["member_id", "gap_status"],
+        "include": [],
+    },
+    {
+        "name": "idx_gaps_status_member",
+        "table": "gaps",
+        "columns": ["gap_status", "member_id"],
+        "include": [],
+    },
+    {
+        "name": "idx_budget_period",
+        "table": "budget_allocations",
+        "columns": ["period_start", "period_end"],
+        "include": ["measure_id", "budget_amount"],
+    },
+    {
+        "name": "idx_spending_measure_date",
+        "table": "actual_spending",
+        "columns": ["measure_id", "spending_date"],
+        "include": ["amount_spent"],
+    },
+]
+
+
+def _auto_create_enabled() -> bool:
+    return os.getenv("AUTO_CREATE_INDEXES", "1").lower() not in ("0", "false", "no")
+
+
+def _has_leading_columns(existing: list[dict], columns: list[str]) -> str | None:
+    """Name of an existing index whose leading key columns are ``columns``."""
+    for idx in existing:
+        cols = [c for c in idx.get("column_names") or [] if c]
+        if cols[: len(columns)] == columns:
+            return idx.get("name") or "(unnamed)"
+    return None
+
+
+def missing_indexes(engine=None) -> list[dict[str, Any]]:
+    """
+    Specs from INDEX_SPECS whose table exists, has every referenced column,
+    and is not already served by an index with the same leading columns.
+    """
+    engine = engine or get_engine()
+    insp = inspect(engine)
+    missing = []
+    for spec in INDEX_SPECS:
+        if not insp.has_table(spec["table"]):
+            continue
+        table_cols = {c["name"] for c in insp.get_columns(spec["table"])}
+        if not set(spec["columns"] + spec["include"]) <= table_cols:
+            continue
+        indexes = insp.get_indexes(spec["table"])
+        pk = insp.get_pk_constraint(spec["table"]).get("constrained_columns") or []
+        if pk:
+            indexes = [*indexes, {"name": "primary key", "column_names": pk}]
+        if _has_leading_columns(indexes, spec["columns"]) is None:
+            missing.append(spec)
+    return missing
+
+
+def _create_index_sql(spec: dict[str, Any], dialect: str) -> str:
+    if dialect == "postgres":
+        include = f" INCLUDE ({', '.join(spec['include'])})" if spec["include"] else ""
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {spec['name']} "
+            f"ON {spec['table']} ({', '.join(spec['columns'])}){include}"
+        )
+    cols = spec["columns"] + spec["include"]
+    return f"CREATE INDEX IF NOT EXISTS {spec['name']} ON {spec['table']} ({', '.join(cols)})"
+
+
+def explain_registered_queries(engine=None) -> dict[str, list[str]]:
+    """EXPLAIN plan lines for every registered query that can run on this schema."""
+    from utils.queries import NAMED_QUERIES, get_named_sql
+
+    engine = engine or get_engine()
+    dialect = get_db_type()
+    prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+    plans: dict[str, list[str]] = {}
+    for name, entry in NAMED_QUERIES.items():
+        sql = get_named_sql(name, dialect, "base").strip().rstrip(";")
+        try:
+            with engine.connect() as conn:
+                rows = conn.execute(text(f"{prefix} {sql}"), entry["defaults"]).fetchall()
+            plans[name] = [str(r[-1]) for r in rows]
+        except Exception as e:
+            plans[name] = [f"(not explainable: {str(e).splitlines()[0]})"]
+    return plans
+
+
+def bootstrap_indexes(dry_run: bool = False, explain: bool = False) -> dict[str, Any]:
+    """
+    Create any missing dashboard indexes.
+
+    Postgres indexes are built CONCURRENTLY in autocommit mode so startup
+    never blocks writers on member_interventions.
+
+    Returns:
+        Dict with created, failed, (planned when dry_run) and, when
+        explain=True, plans_before / plans_after keyed by query name
+    """
+    engine = get_write_engine()
+    dialect = get_db_type()
+    result: dict[str, Any] = {"dialect": dialect, "created": [], "failed": {}}
+
+    if explain:
+        result["plans_before"] = explain_registered_queries(engine)
+
+    todo = missing_indexes(engine)
+    if dry_run:
+        result["planned"] = [_create_index_sql(s, dialect) for s in todo]
+        return result
+
+    for spec in todo:
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text(_create_index_sql(spec, dialect)))
+            result["created"].append(spec["name"])
+            print(f"[OK] Created index {spec['name']} on {spec['table']}")
+        except Exception as e:
+            result["failed"][spec["name"]] = str(e)
+            print(f"[WARN] Could not create index {spec['name']}: {e}")
+
+    if result["created"] and dialect == "postgres":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in sorted({s["table"] for s in todo}):
+                conn.execute(text(f"ANALYZE {table}"))
+    elif result["created"]:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+
+    if explain:
+        result["plans_after"] = explain_registered_queries(engine)
+    return result
+
+
+def bootstrap_indexes_on_startup() -> dict[str, Any] | None:
+    """Startup hook: bootstrap_indexes() unless AUTO_CREATE_INDEXES=0. Never raises."""
+    if not _auto_create_enabled():
+        return None
+    try:
+        return bootstrap_indexes()
+    except Exception as e:
+        print(f"[WARN] Index bootstrap skipped: {e}")
+        return None
+
+
+def _print_plans(title: str, plans: dict[str, list[str]]) -> None:
+    print(f"\n{title}")
+    print("-" * len(title))
+    for name, lines in plans.items():
+        print(f"  {name}:")
+        for line in lines:
+            print(f"      {line}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m data.indexes",
+        description="Create missing hedis_portfolio indexes and report EXPLAIN plans.",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="list indexes without creating")
+    parser.add_argument("--explain", action="store_true", help="print plans before and after")
+    args = parser.parse_args(argv)
+
+    result = bootstrap_indexes(dry_run=args.dry_run, explain=args.explain)
+    if args.explain:
+        _print_plans("EXPLAIN (before)", result["plans_before"])
+    if args.dry_run:
+        print("\nPlanned:" if result["planned"] else "\n[OK] All dashboard indexes present")
+        for sql in result["planned"]:
+            print(f"  {sql}")
+        return 0
+    if "plans_after" in result:
+        _print_plans("EXPLAIN (after)", result["plans_after"])
+    print(f"\n[OK] Created {len(result['created'])} index(es); {len(result['failed'])} failed")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+"""
+StarGuard AI - Materialized Rollups
+Daily aggregates of member_interventions so dashboard queries scale with
+days x measures instead of raw intervention rows.
+
+mi_daily_rollup grain: (day, has_time, measure_id, activity_id, status, cost_tier)
+    intervention_count, cost_sum, completed_cost_sum
+
+cost_tier is part of the grain so the cost-tier comparison can be served
+from the rollup as well; it has only three values. has_time flags rows whose
+intervention_date carries a time of day: the base queries compare
+``intervention_date <= :end_date``, which drops those rows on the end day,
+so the rollup renderings drop them too.
+
+Refresh is incremental: rows from (high-water mark - lookback) onward are
+re-aggregated, so same-day appends and late status changes inside the
+lookback window are picked up. Older corrections need refresh_rollups(full=True).
+
+Refreshes never run on the query path. data.db.execute() calls
+mark_rollups_dirty() after writing member_interventions, which sends reads
+back to the base table and catches the rollup up on a background thread;
+refresh_if_due() is the periodic job for the cloud_refresh scheduler and
+picks up writes made outside this process.
+"""
+
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import inspect, text
+
+from utils.sql_dialect import day_of
+
+from .db import get_db_type, get_write_engine, invalidate_cache
+
+ROLLUP_TABLE = "mi_daily_rollup"
+STATE_TABLE = "rollup_state"
+
+_state: dict[str, Any] = {
+    "enabled": False,
+    "ready": False,
+    "refreshed_at": 0.0,
+    "high_water_mark": None,
+    "last_error": None,
+    # writes counts mark_rollups_dirty() calls; synced_writes is the count the
+    # last successful refresh started from, so the rollup is behind while they differ
+    "writes": 0,
+    "synced_writes": 0,
+    "catching_up": False,
+}
+_refresh_lock = threading.Lock()
+_dirty_lock = threading.Lock()
+
+
+def _rollups_enabled() -> bool:
+    return os.getenv("USE_ROLLUPS", "1").lower() not in ("0", "false", "no")
+
+
+def _refresh_interval() -> float:
+    return float(os.getenv("ROLLUP_REFRESH_INTERVAL", "300"))
+
+
+def _lookback_days() -> int:
+    return int(os.getenv("ROLLUP_LOOKBACK_DAYS", "7"))
+
+
+def _aggregate_select(dialect: str) -> str:
+    day = day_of("mi.intervention_date", dialect)
+    return f"""
+        SELECT
+            {day} as day,
+            CASE WHEN mi.intervention_date > {day} THEN 1 ELSE 0 END as has_time,
+            mi.measure_id,
+            mi.activity_id,
+            mi.status,
+            CASE
+                WHEN mi.cost_per_intervention < 20 THEN 'Low Touch'
+                WHEN mi.cost_per_intervention < 90 THEN 'Medium Touch'
+                ELSE 'High Touch'
+            END as cost_tier,
+            COUNT(*) as intervention_count,
+            COALESCE(SUM(mi.cost_per_intervention), 0) as cost_sum,
+            COALESCE(SUM(CASE WHEN mi.status = 'completed' THEN mi.cost_per_intervention ELSE 0 END), 0)
+                as completed_cost_sum
+        FROM member_interventions mi
+        WHERE mi.intervention_date IS NOT NULL
+        AND (:since IS NULL OR mi.intervention_date >= :since)
+        GROUP BY {day}, has_time, mi.measure_id, mi.activity_id, mi.status, cost_tier
+    """
+
+
+def _create_tables(conn, dialect: str) -> bool:
+    """Create the rollup tables; True when an outdated rollup table was dropped."""
+    inspector = inspect(conn)
+    rebuilt = inspector.has_table(ROLLUP_TABLE) and "has_time" not in {
+        c["name"] for c in inspector.get_columns(ROLLUP_TABLE)
+    }
+    if rebuilt:
+        conn.execute(text(f"DROP TABLE {ROLLUP_TABLE}"))
+    # CREATE TABLE AS keeps column types identical to member_interventions on both engines
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} AS "
+            f"SELECT * FROM ({_aggregate_select(dialect)}) seed WHERE 1 = 0"
+        ),
+        {"since": None},
+    )
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_day ON {ROLLUP_TABLE} (day)"))
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} ("
+            "rollup_name VARCHAR(64) PRIMARY KEY, high_water_mark VARCHAR(32), refreshed_at VARCHAR(32))"
+        )
+    )
+    return rebuilt
+
+
+def refresh_rollups(full: bool = False, lookback_days: int | None = None) -> dict[str, Any]:
+    """
+    Bring mi_daily_rollup up to date with member_interventions.
+
+    Args:
+        full: Rebuild every day instead of starting from the high-water mark
+        lookback_days: Days before the high-water mark to re-aggregate
+            (defaults to ROLLUP_LOOKBACK_DAYS)
+
+    Returns:
+        Dict with success, since, high_water_mark, rows, elapsed_ms (or error)
+    """
+    lookback = _lookback_days() if lookback_days is None else lookback_days
+    started = time.perf_counter()
+    with _refresh_lock:
+        # taken before reading, so a write that lands mid-refresh keeps the rollup dirty
+        writes = _state["writes"]
+        try:
+            dialect = get_db_type()
+            with get_write_engine().begin() as conn:
+                if _create_tables(conn, dialect):
+                    full = True
+                hwm = conn.execute(
+                    text(f"SELECT high_water_mark FROM {STATE_TABLE} WHERE rollup_name = :n"),
+                    {"n": ROLLUP_TABLE},
+                ).scalar()
+
+                since: str | None = None
+                if hwm and not full:
+                    since = (
+                        date.fromisoformat(str(hwm)[:10]) - timedelta(days=lookback)
+                    ).isoformat()
+
+                if since is None:
+                    conn.execute(text(f"DELETE FROM {ROLLUP_TABLE}"))
+                else:
+                    conn.execute(
+                        text(f"DELETE FROM {ROLLUP_TABLE} WHERE day >= :since"), {"since": since}
+                    )
+                rows = conn.execute(
+                    text(f"INSERT INTO {ROLLUP_TABLE} {_aggregate_select(dialect)}"),
+                    {"since": since},
+                ).rowcount
+
+                new_hwm = conn.execute(
+                    text("SELECT MAX(intervention_date) FROM member_interventions")
+                ).scalar()
+                conn.execute(
+                    text(
+                        f"INSERT INTO {STATE_TABLE} (rollup_name, high_water_mark, refreshed_at) "
+                        "VALUES (:n, :hwm, :at) "
+                        "ON CONFLICT (rollup_name) DO UPDATE SET "
+                        "high_water_mark = excluded.high_water_mark, refreshed_at = excluded.refreshed_at"
+                    ),
+                    {
+                        "n": ROLLUP_TABLE,
+                        "hwm": str(new_hwm)[:19] if new_hwm is not None else None,
+                        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    },
+                )
+        except Exception as e:
+            # refresh_if_due() backs off until the next interval
+            _state.update(ready=False, refreshed_at=time.monotonic(), last_error=str(e))
+            print(f"[WARN] Rollup refresh failed: {e}")
+            return {"success": False, "error": str(e)}
+
+        invalidate_cache(ROLLUP_TABLE)
+        _state.update(
+            ready=True,
+            refreshed_at=time.monotonic(),
+            high_water_mark=new_hwm,
+            last_error=None,
+            synced_writes=max(_state["synced_writes"], writes),
+        )
+        return {
+            "success": True,
+            "since": since,
+            "high_water_mark": new_hwm,
+            "rows": rows,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def ensure_rollups() -> bool:
+    """
+    Create and refresh the rollup tables; call once at startup.
+    After this, register refresh_if_due() with the refresh scheduler.
+    """
+    if not _rollups_enabled():
+        return False
+    _state["enabled"] = True
+    return bool(refresh_rollups().get("success"))
+
+
+def rollup_ready() -> bool:
+    """
+    True when dashboard queries may read from mi_daily_rollup.
+
+    Only checks in-memory flags: False until ensure_rollups() has run and
+    while a member_interventions write has not been rolled up yet.
+    """
+    if not _state["enabled"] or not _rollups_enabled():
+        return False
+    return bool(_state["ready"]) and _state["synced_writes"] >= _state["writes"]
+
+
+def _catch_up() -> None:
+    while True:
+        with _dirty_lock:
+            if _state["synced_writes"] >= _state["writes"]:
+                _state["catching_up"] = False
+                return
+        if not refresh_rollups().get("success"):
+            with _dirty_lock:
+                _state["catching_up"] = False
+            return
+
+
+def mark_rollups_dirty() -> None:
+    """
+    Record a member_interventions write.
+
+    Evicts cached results built from the rollup, routes reads to the base
+    table until the rollup catches up, and starts that catch-up on a
+    background thread if one is not already running.
+    """
+    if not _state["enabled"]:
+        return
+    with _dirty_lock:
+        _state["writes"] += 1
+        start = not _state["catching_up"]
+        _state["catching_up"] = True
+    invalidate_cache(ROLLUP_TABLE)
+    if start:
+        threading.Thread(target=_catch_up, name="rollup-refresh", daemon=True).start()
+
+
+def refresh_if_due() -> bool:
+    """
+    Scheduler job: refresh once ROLLUP_REFRESH_INTERVAL has passed or a
+    write is pending. Returns True when a refresh ran and succeeded.
+    """
+    if not _state["enabled"] or not _rollups_enabled():
+        return False
+    due = time.monotonic() - _state["refreshed_at"] > _refresh_interval()
+    if not due and _state["synced_writes"] >= _state["writes"]:
+        return False
+    return bool(refresh_rollups().get("success"))
+
+
+def rollup_status() -> dict[str, Any]:
+    """Current rollup state for status panels and diagnostics."""
+    return {
+        "enabled": _state["enabled"],
+        "ready": _state["ready"],
+        "dirty": _state["synced_writes"] < _state["writes"],
+        "high_water_mark": _state["high_water_mark"],
+        "age_seconds": (
+            round(time.monotonic() - _state["refreshed_at"], 1) if _state["refreshed_at"] else None
+        ),
+        "error": _state["last_error"],
+    }
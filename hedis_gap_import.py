@@ -0,0 +1,254 @@
+# hedis_gap_import.py
+# ─────────────────────────────────────────────────────────────
+# HEDIS Gap Bulk Import — CSV / Parquet → Gap Trail
+# StarGuard Desktop + Mobile | reichert-science-intelligence
+# Streams the file in chunks, validates each chunk vectorized against
+# HEDIS_COLUMNS / HEDIS_MEASURES, then writes through the gap replica,
+# the batched Sheets write queue and batched Supabase inserts.
+# CLI: python -m hedis_gap_import gaps.csv [--chunk-size N] [--dry-run]
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from hedis_gap_trail import (
+    HEDIS_COLUMNS,
+    HEDIS_MEASURES,
+    HedisGapDB,
+    _push_gaps_to_supabase,
+    flush_supabase_mirror,
+)
+from utils.ids import new_ids
+
+GAP_STATUSES = ("OPEN", "CLOSED", "EXCLUDED")
+INTERVENTION_TYPES = ("Outreach", "Clinical", "Administrative")
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+# Columns a file may supply; gap_id, timestamps, measure_name and
+# care_domain are assigned here.
+_INPUT_COLUMNS = [
+    "member_id",
+    "member_name",
+    "measure_code",
+    "measure_name",
+    "gap_status",
+    "due_date",
+    "provider_name",
+    "intervention_type",
+    "star_impact",
+    "roi_estimate",
+    "claude_recommendation",
+]
+_MEASURE_NAMES = {code: name for code, (name, _) in HEDIS_MEASURES.items()}
+_CARE_DOMAINS = {code: domain for code, (_, domain) in HEDIS_MEASURES.items()}
+
+
+def iter_gap_chunks(
+    path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Yield string-typed DataFrames of at most ``chunk_size`` rows from a CSV or Parquet file."""
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet import needs pyarrow (pip install pyarrow)") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas().astype("string")
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def validate_gap_chunk(chunk: pd.DataFrame, first_row: int = 1) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Normalize and validate one chunk.
+
+    Returns (valid, errors): ``valid`` has every _INPUT_COLUMNS column with
+    defaults applied and measure_name/care_domain derived from the measure
+    code; ``errors`` lists {"row": n, "error": msg} for rejected rows, where
+    n is the 1-based data row in the source file.
+    """
+    df = chunk.reindex(columns=_INPUT_COLUMNS).astype("string").fillna("")
+    df = df.apply(lambda col: col.str.strip())
+    df.index = pd.RangeIndex(first_row, first_row + len(df))
+
+    code = df["measure_code"].str.upper()
+    status = df["gap_status"].str.upper().replace("", "OPEN")
+    itype = df["intervention_type"].replace("", "Outreach")
+    star = pd.to_numeric(df["star_impact"].replace("", "3"), errors="coerce")
+    roi = pd.to_numeric(df["roi_estimate"].replace("", "0"), errors="coerce")
+    due = pd.to_datetime(df["due_date"], errors="coerce", format="mixed")
+
+    checks = [
+        (df["member_id"] == "", "missing member_id"),
+        (code == "", "missing measure_code"),
+        ((code != "") & ~code.isin(list(HEDIS_MEASURES)), "unknown measure_code"),
+        (~status.isin(list(GAP_STATUSES)), f"gap_status must be one of {', '.join(GAP_STATUSES)}"),
+        (
+            ~itype.isin(list(INTERVENTION_TYPES)),
+            f"intervention_type must be one of {', '.join(INTERVENTION_TYPES)}",
+        ),
+        (star.isna() | (star < 1) | (star > 5), "star_impact must be a number from 1 to 5"),
+        (roi.isna(), "roi_estimate must be numeric"),
+        ((df["due_date"] != "") & due.isna(), "due_date is not a valid date"),
+    ]
+    failed = pd.DataFrame({msg: mask.fillna(True).astype(bool) for mask, msg in checks})
+    bad = failed.any(axis=1)
+    errors = [
+        {"row": int(i), "error": "; ".join(failed.columns[flags])}
+        for i, flags in zip(failed.index[bad], failed[bad].to_numpy())
+    ]
+
+    ok = ~bad
+    valid = df[ok].copy()
+    valid["measure_code"] = code[ok]
+    valid["measure_name"] = code[ok].map(_MEASURE_NAMES)
+    valid["care_domain"] = code[ok].map(_CARE_DOMAINS)
+    valid["gap_status"] = status[ok]
+    valid["intervention_type"] = itype[ok]
+    valid["star_impact"] = star[ok].round().astype(int)
+    valid["roi_estimate"] = roi[ok].astype(float)
+    valid["due_date"] = due[ok].dt.strftime("%Y-%m-%d").fillna("")
+    valid["claude_recommendation"] = valid["claude_recommendation"].str.slice(0, 500)
+    return valid, errors
+
+
+def _to_sheet_rows(valid: pd.DataFrame, now: datetime) -> list[list[Any]]:
+    stamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    out = valid.assign(gap_id=new_ids("GAP", len(valid), now), timestamp=stamp, last_updated=stamp)
+    # object dtype boxes numpy scalars as Python int/float/str, which gspread can serialize
+    return out[HEDIS_COLUMNS].astype(object).values.tolist()
+
+
+def import_gaps(
+    db: HedisGapDB | None,
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """
+    Stream a CSV/Parquet gap file into the HEDIS gap trail.
+
+    Valid rows are added to the replica and queued on the Sheets write
+    queue chunk by chunk, and handed to the background Supabase mirror.
+    Invalid rows are skipped and reported. With dry_run=True (or no
+    connected db) rows are only validated.
+
+    Returns:
+        Dict with success, rows_read, rows_imported, rows_rejected,
+        errors (first MAX_REPORTED_ERRORS), tickets, elapsed_s, rows_per_sec
+    """
+    started = time.perf_counter()
+    report: dict[str, Any] = {
+        "success": True,
+        "rows_read": 0,
+        "rows_imported": 0,
+        "rows_rejected": 0,
+        "errors": [],
+        "tickets": [],
+        "dry_run": dry_run,
+    }
+    write = not dry_run and db is not None and db.connected
+    if not dry_run and not write:
+        report.update(success=False, error="Cloud disconnected — nothing written")
+
+    try:
+        for chunk in iter_gap_chunks(path, chunk_size):
+            valid, errors = validate_gap_chunk(chunk, first_row=report["rows_read"] + 1)
+            report["rows_read"] += len(chunk)
+            report["rows_rejected"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(report["errors"])
+            report["errors"].extend(errors[: max(0, room)])
+            if valid.empty or not write:
+                continue
+
+            rows = _to_sheet_rows(valid, datetime.now(timezone(timedelta(hours=-5))))
+            ids = [r[0] for r in rows]
+            db.add_local(*rows)
+            report["tickets"].append(
+                db.write_queue().append(
+                    rows,
+                    on_done=lambda r, ids=ids: [
+                        db.confirm_local(g, n) for g, n in zip(ids, r["rows"] or [None] * len(ids))
+                    ],
+                    on_error=lambda _err, ids=ids: [db.drop_local(g) for g in ids],
+                )
+            )
+            _push_gaps_to_supabase(rows)
+            report["rows_imported"] += len(rows)
+    except Exception as e:
+        report.update(success=False, error=str(e))
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 3)
+    report["rows_per_sec"] = round(report["rows_read"] / elapsed, 1) if elapsed else 0.0
+    return report
+
+
+def flush_import(db: HedisGapDB, report: dict[str, Any], timeout: float = 600.0) -> dict[str, Any]:
+    """
+    Wait for an import's queued Sheets batches and Supabase mirror rows.
+
+    Marks the report failed (success=False, error) when the write queue does
+    not drain in time, any batch ticket did not finish "done", or the mirror
+    did not drain. failed_tickets lists the tickets that did not land.
+    """
+    if not report["tickets"]:
+        return report
+    queue = db.write_queue()
+    problems = []
+    if not queue.flush(timeout=timeout):
+        problems.append(f"Sheets write queue did not drain within {timeout:.0f}s")
+    failed = [t for t in report["tickets"] if queue.ticket(t)["status"] != "done"]
+    if failed:
+        first = queue.ticket(failed[0])
+        problems.append(
+            f"{len(failed)} of {len(report['tickets'])} Sheets batch(es) not written "
+            f"({first['status']}: {first['error'] or 'no error reported'})"
+        )
+    if not flush_supabase_mirror(timeout=timeout):
+        problems.append("Supabase mirror did not drain")
+    report["failed_tickets"] = failed
+    if problems:
+        report.update(success=False, error="; ".join(problems))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m hedis_gap_import",
+        description="Bulk-load HEDIS gaps from CSV or Parquet into the gap trail.",
+    )
+    parser.add_argument("path", help="CSV or Parquet file of gaps")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args(argv)
+
+    db = None if args.dry_run else HedisGapDB()
+    report = import_gaps(db, args.path, chunk_size=args.chunk_size, dry_run=args.dry_run)
+    if db is not None and report["tickets"]:
+        print(f"Flushing {len(report['tickets'])} queued batch(es) to Sheets...")
+        flush_import(db, report)
+
+    for err in report["errors"][:20]:
+        print(f"  row {err['row']}: {err['error']}")
+    status = "[OK]" if report["success"] else "[ERROR]"
+    print(
+        f"{status} read {report['rows_read']}, imported {report['rows_imported']}, "
+        f"rejected {report['rows_rejected']} in {report['elapsed_s']}s "
+        f"({report['rows_per_sec']} rows/s)"
+    )
+    if not report["success"]:
+        print(f"        {report.get('error', '')}")
+    return 0 if report["success"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
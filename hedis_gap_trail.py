@@ -9,15 +9,29 @@
 
 import json
 import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import gspread
+import numpy as np
 import pandas as pd
 from google.oauth2.service_account import Credentials
 
+from sheets_write_queue import SheetWriteQueue
+from utils.ids import new_id
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are serialized within one process only
+    fcntl = None  # type: ignore[assignment]
+
 try:
-    from supabase import create_client
+    import supabase  # noqa: F401
 
     _SUPABASE_AVAILABLE = True
 except ImportError:
@@ -25,6 +39,12 @@ except ImportError:
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
+# Seconds between delta pulls from the Sheet into the local replica
+GAP_SYNC_INTERVAL = float(os.environ.get("GAP_SYNC_INTERVAL", "60"))
+
+# Rows per insert() call when mirroring gaps to Supabase
+SUPABASE_MIRROR_BATCH = int(os.environ.get("SUPABASE_MIRROR_BATCH", "500"))
+
 # ── Sheet Column Schema ───────────────────────────────────────
 HEDIS_COLUMNS = [
     "gap_id",
@@ -70,6 +90,11 @@ class HedisGapDB:
     Manages Google Sheets read/write for StarGuard HEDIS Gap Refresh.
     Credentials: GSHEETS_CREDS_JSON (HF Secret) or service_account.json
     Sheet name:  HEDIS_SHEET_ID env var or 'StarGuard_HEDIS_Gap_Tracker'
+
+    Reads are served from a local replica of the sheet. Writes land in the
+    replica first; the Sheet is reconciled by delta pulls every
+    GAP_SYNC_INTERVAL seconds (new rows + the gap_status/last_updated
+    columns in one batch_get) instead of a full download per render.
     """
 
     def __init__(self) -> None:
@@ -78,6 +103,18 @@ class HedisGapDB:
         self.connected: bool = False
         self.last_error: str | None = None
         self.record_count: int = 0
+        self._lock = threading.RLock()
+        self._rows: dict[int, list[Any]] = {}  # sheet row number -> values
+        self._row_of: dict[str, int] = {}  # gap_id -> sheet row number
+        self._pending: dict[str, list[Any]] = {}  # written locally, row not yet known
+        self._frame: pd.DataFrame | None = None
+        self._ordered: pd.DataFrame | None = None  # _frame sorted by gap_id
+        # (status, measure, suppressed ids) filter -> (row positions, gap_ids)
+        self._views: dict[tuple[str, str, frozenset[str]], tuple[np.ndarray, np.ndarray]] = {}
+        self._synced_at: float | None = None
+        self._sync_lock = threading.Lock()  # one pull at a time
+        self.generation = 0  # bumped on every replica change; Shiny polls it
+        self._writes: SheetWriteQueue | None = None
         self._connect()
 
     def _connect(self) -> None:
@@ -106,7 +143,7 @@ class HedisGapDB:
             self.sheet = workbook.sheet1
             self._ensure_headers()
             self.connected = True
-            self.record_count = max(0, len(self.sheet.get_all_values()) - 1)
+            self.sync(full=True)
 
         except Exception as e:
             self.connected = False
@@ -125,16 +162,289 @@ class HedisGapDB:
             "timestamp": datetime.now(timezone(timedelta(hours=-5))).strftime("%I:%M:%S %p EST"),
         }
 
+    def write_queue(self) -> SheetWriteQueue:
+        """Batched, backoff-aware writer for this sheet (created on first use)."""
+        with self._lock:
+            if self._writes is None:
+                self._writes = SheetWriteQueue(
+                    self.sheet, "hedis-gaps", key_col=HEDIS_COLUMNS.index("gap_id")
+                )
+            return self._writes
+
+    # ── Local replica ─────────────────────────────────────────
+
+    def sync(self, full: bool = False, force: bool = False) -> bool:
+        """
+        Reconcile the replica with the Sheet. Returns True if a pull ran.
+
+        Skipped while the last pull is younger than GAP_SYNC_INTERVAL unless
+        ``force``; ``full`` re-downloads every row. A failed pull keeps the
+        current replica and waits for the next interval. The Sheets call runs
+        outside the replica lock, so readers keep the current snapshot while
+        a pull is in flight.
+        """
+        if not self.connected:
+            return False
+        with self._sync_lock:
+            with self._lock:
+                fresh = (
+                    self._synced_at is not None
+                    and time.monotonic() - self._synced_at < GAP_SYNC_INTERVAL
+                )
+                if fresh and not (force or full):
+                    return False
+                if self._writes is not None and self._writes.pending() and not full:
+                    return False  # reconcile after queued writes land, not before
+                full = full or self._synced_at is None
+                last = max(self._rows, default=1)
+            try:
+                if full or not self._delta_pull(last):
+                    values = self.sheet.get_all_values()
+                    with self._lock:
+                        self._apply_full(values)
+            except Exception as e:
+                self.last_error = str(e)
+            with self._lock:
+                self._synced_at = time.monotonic()
+            return True
+
+    def revalidate(self, force: bool = False) -> None:
+        """Stale-while-revalidate: start a background sync if due (or ``force``); never blocks."""
+        with self._lock:
+            due = self._synced_at is None or time.monotonic() - self._synced_at >= GAP_SYNC_INTERVAL
+        if (due or force) and self.connected and not self._sync_lock.locked():
+            threading.Thread(
+                target=self.sync, kwargs={"force": force}, name="hedis-gap-sync", daemon=True
+            ).start()
+
+    def _apply_full(self, values: list[list[Any]]) -> None:
+        self._rows = {}
+        self._row_of = {}
+        for i, row in enumerate(values[1:], start=2):
+            self._store_row(i, row)
+        self._settle()
+
+    def _delta_pull(self, last: int) -> bool:
+        """
+        New rows + gap_id/status/last_updated columns in one batch_get.
+
+        False if a full pull is needed: any known row whose gap_id moved
+        (rows sorted, filtered, inserted or deleted in the Sheet UI), since
+        the status columns are read by row number.
+        """
+        end = _col_letter(len(HEDIS_COLUMNS))
+        key = _col_letter(HEDIS_COLUMNS.index("gap_id") + 1)
+        status = _col_letter(HEDIS_COLUMNS.index("gap_status") + 1)
+        updated = _col_letter(HEDIS_COLUMNS.index("last_updated") + 1)
+        ranges = [f"A{last + 1}:{end}"]
+        if last >= 2:
+            ranges += [
+                f"{key}2:{key}{last}",
+                f"{status}2:{status}{last}",
+                f"{updated}2:{updated}{last}",
+            ]
+        results = self.sheet.batch_get(ranges)
+
+        with self._lock:
+            changed = False
+            if last >= 2:
+                ids, statuses, stamps = results[1], results[2], results[3]
+                for row_num, row in self._rows.items():
+                    k = row_num - 2
+                    sheet_id = ids[k][0] if k < len(ids) and ids[k] else ""
+                    if str(sheet_id) != str(row[0]):
+                        return False
+                si = HEDIS_COLUMNS.index("gap_status")
+                ui_ = HEDIS_COLUMNS.index("last_updated")
+                for row_num, row in self._rows.items():
+                    k = row_num - 2
+                    for col, column in ((si, statuses), (ui_, stamps)):
+                        if k < len(column) and column[k] and row[col] != column[k][0]:
+                            row[col] = column[k][0]
+                            changed = True
+            for i, row in enumerate(results[0], start=last + 1):
+                if self._rows.get(i) != row:
+                    self._store_row(i, row)
+                    changed = True
+            if changed:
+                self._settle()
+        return True
+
+    def _store_row(self, row_num: int, row: list[Any]) -> None:
+        row = list(row)[: len(HEDIS_COLUMNS)]
+        row += [""] * (len(HEDIS_COLUMNS) - len(row))
+        if not any(row):
+            return
+        self._rows[row_num] = row
+        if row[0]:
+            self._row_of[str(row[0])] = row_num
+            self._pending.pop(str(row[0]), None)
+
+    def _settle(self) -> None:
+        self._frame = None
+        self._ordered = None
+        self._views = {}
+        self.record_count = len(self._rows) + len(self._pending)
+        self.generation += 1
+
+    def add_local(self, *rows: list[Any]) -> None:
+        """Write-through step 1: new gap rows are visible to reads immediately."""
+        with self._lock:
+            for row in rows:
+                self._pending[str(row[0])] = list(row)
+            self._settle()
+
+    def confirm_local(self, gap_id: str, row_num: int | None) -> None:
+        """The Sheet accepted ``gap_id`` at ``row_num`` (None when unknown)."""
+        with self._lock:
+            row = self._pending.get(gap_id)
+            if row is not None and row_num is not None:
+                self._store_row(row_num, row)
+                self._settle()
+
+    def drop_local(self, gap_id: str) -> None:
+        """Roll back a local write the Sheet rejected."""
+        with self._lock:
+            self._pending.pop(gap_id, None)
+            self._settle()
+
+    def update_local(self, gap_id: str, **changes: Any) -> int | None:
+        """Apply column changes to ``gap_id``; returns its sheet row if known."""
+        with self._lock:
+            row_num = self._row_of.get(gap_id)
+            row = self._rows.get(row_num) if row_num else self._pending.get(gap_id)
+            if row is None:
+                return None
+            for col, value in changes.items():
+                row[HEDIS_COLUMNS.index(col)] = value
+            self._settle()
+            return row_num
+
+    def find_row(self, gap_id: str) -> int | None:
+        """Sheet row of ``gap_id`` from the replica (no API call)."""
+        with self._lock:
+            return self._row_of.get(gap_id)
+
+    def has_gap(self, gap_id: str) -> bool:
+        """True if ``gap_id`` is in the replica, written or still queued."""
+        with self._lock:
+            return gap_id in self._row_of or gap_id in self._pending
+
+    def locate_row(self, gap_id: str, moved: bool = False) -> int | None:
+        """
+        Current sheet row of ``gap_id`` for a queued cell update (write-queue thread).
+
+        Returns 0 while its append is still queued and None if it is not on
+        the sheet. ``moved`` (the row no longer holds this gap_id) forces a
+        full re-read, since the Sheet was reordered behind the replica.
+        """
+        if not moved:
+            row_num = self.find_row(gap_id)
+            if row_num is not None:
+                return row_num
+            with self._lock:
+                writes = self._writes if gap_id in self._pending else None
+            if writes is not None and writes.pending_appends():
+                return 0
+        self.sync(full=True)
+        return self.find_row(gap_id)
+
+    def gaps_frame(self) -> pd.DataFrame:
+        """All gaps as a DataFrame (copy); a stale replica is refreshed in the background."""
+        self.revalidate()
+        with self._lock:
+            return self._replica_frame().copy()
+
+    def _replica_frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            rows = [self._rows[k] for k in sorted(self._rows)]
+            rows += [r for g, r in self._pending.items() if g not in self._row_of]
+            df = pd.DataFrame(rows, columns=HEDIS_COLUMNS)
+            for col in ("star_impact", "roi_estimate"):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            self._frame = df
+        return self._frame
+
+    def page(
+        self,
+        status: str = "ALL",
+        measure: str = "ALL",
+        after: str | None = None,
+        limit: int = 15,
+        suppressed: frozenset[str] = frozenset(),
+    ) -> dict[str, Any]:
+        """
+        One page of gaps, newest first, from the replica's gap_id index.
+
+        Filters and ``suppressed`` are applied before ``limit``. ``after`` is
+        the next_cursor of the previous page (the oldest gap_id it showed).
+        Returns {rows, next_cursor, total}; next_cursor is None on the last page.
+        """
+        self.revalidate()
+        with self._lock:
+            ordered = self._ordered_frame()
+            pos, ids = self._view(ordered, status, measure, suppressed)
+            end = len(ids) if after is None else int(np.searchsorted(ids, after, side="left"))
+            start = max(0, end - max(0, limit))
+            rows = ordered.iloc[pos[start:end][::-1]].reset_index(drop=True)
+            return {
+                "rows": rows,
+                "next_cursor": str(ids[start]) if start > 0 and end > start else None,
+                "total": len(ids),
+            }
+
+    def _ordered_frame(self) -> pd.DataFrame:
+        if self._ordered is None:
+            self._ordered = (
+                self._replica_frame().sort_values("gap_id", kind="stable").reset_index(drop=True)
+            )
+        return self._ordered
+
+    def _view(
+        self, ordered: pd.DataFrame, status: str, measure: str, suppressed: frozenset[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Row positions and sorted gap_ids matching a filter (cached until the replica changes)."""
+        key = (status, measure, suppressed)
+        if key not in self._views:
+            mask = np.ones(len(ordered), dtype=bool)
+            if status != "ALL":
+                mask &= (ordered["gap_status"] == status).to_numpy()
+            if measure != "ALL":
+                mask &= (ordered["measure_code"] == measure).to_numpy()
+            if suppressed:
+                mask &= ~ordered["gap_id"].isin(suppressed).to_numpy()
+            pos = np.flatnonzero(mask)
+            if len(self._views) >= 32:
+                self._views.clear()
+            self._views[key] = (pos, ordered["gap_id"].to_numpy(dtype=object)[pos])
+        return self._views[key]
+
+
+def _col_letter(n: int) -> str:
+    """1-based column number -> A1 letter (A..Z, AA..)."""
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
 
 # ─────────────────────────────────────────────────────────────
 # HEDIS GAP OPERATIONS
 # ─────────────────────────────────────────────────────────────
 
 
+def _new_gap_id(now: datetime) -> str:
+    return new_id("GAP", now)
+
+
 def push_hedis_gap(db: HedisGapDB, record: dict[str, Any]) -> dict[str, Any]:
     """
     Push a single HEDIS gap record to Google Sheets.
 
+    The gap is readable immediately; the Sheet append is queued and
+    batched with other writes. Poll gap_write_status(db, result["ticket"]).
+
     record keys:
         member_id, member_name, measure_code, gap_status,
         due_date, provider_name, intervention_type,
@@ -146,7 +456,7 @@ def push_hedis_gap(db: HedisGapDB, record: dict[str, Any]) -> dict[str, Any]:
 
     try:
         now = datetime.now(timezone(timedelta(hours=-5)))
-        gap_id = f"GAP-{now.strftime('%Y%m%d-%H%M%S')}"
+        gap_id = _new_gap_id(now)
         measure_code = record.get("measure_code", "")
         measure_name, care_domain = HEDIS_MEASURES.get(
             measure_code, (record.get("measure_name", ""), "Effectiveness")
@@ -170,8 +480,13 @@ def push_hedis_gap(db: HedisGapDB, record: dict[str, Any]) -> dict[str, Any]:
             now.strftime("%Y-%m-%d %H:%M:%S"),
         ]
 
-        db.sheet.append_row(row)
-        db.record_count += 1
+        # Replica first (readable now); the Sheet append is batched by the write queue
+        db.add_local(row)
+        ticket = db.write_queue().append(
+            [row],
+            on_done=lambda r: db.confirm_local(gap_id, r["rows"][0] if r["rows"] else None),
+            on_error=lambda _err: db.drop_local(gap_id),
+        )
 
         # Phase 1: Supabase parallel write (fire-and-forget)
         _push_gap_to_supabase(row)
@@ -181,42 +496,80 @@ def push_hedis_gap(db: HedisGapDB, record: dict[str, Any]) -> dict[str, Any]:
             "gap_id": gap_id,
             "timestamp": now.strftime("%I:%M:%S %p EST"),
             "measure_name": measure_name,
+            "ticket": ticket,
         }
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def gap_write_status(db: HedisGapDB, ticket: str) -> dict[str, Any]:
+    """Poll a write ticket from push_hedis_gap/close_hedis_gap: {status, error, rows}."""
+    return db.write_queue().ticket(ticket)
+
+
 def _push_gap_to_supabase(row: list[Any]) -> None:
     """Parallel write to Supabase if configured. Silent on failure."""
-    if not _SUPABASE_AVAILABLE:
-        return
-    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_ANON_KEY")
-    if not url or not key:
+    _push_gaps_to_supabase([row])
+
+
+# Mirror writes are queued and drained by one background worker, so a push
+# never waits on Supabase and rows that arrive together share an insert().
+_mirror_rows: list[list[Any]] = []
+_mirror_lock = threading.Lock()
+_mirror_draining = False
+_mirror_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gap-mirror")
+mirror_stats = {"rows": 0, "inserts": 0, "errors": 0}
+
+
+def _mirror_client() -> Any | None:
+    from supabase_platform import get_client
+
+    return get_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_ANON_KEY"))
+
+
+def _push_gaps_to_supabase(rows: list[list[Any]]) -> None:
+    """Queue gap rows for the Supabase mirror. Returns at once; silent on failure."""
+    global _mirror_draining
+    if not _SUPABASE_AVAILABLE or not rows:
         return
+    with _mirror_lock:
+        _mirror_rows.extend(list(r) for r in rows)
+        if _mirror_draining:
+            return
+        _mirror_draining = True
+    _mirror_executor.submit(_drain_mirror)
+
+
+def _drain_mirror() -> None:
+    global _mirror_draining
+    while True:
+        with _mirror_lock:
+            batch = _mirror_rows[:SUPABASE_MIRROR_BATCH]
+            del _mirror_rows[: len(batch)]
+            if not batch:
+                _mirror_draining = False
+                return
+        try:
+            client = _mirror_client()
+            if client is None:
+                continue  # not configured; drop the rows
+            records = [dict(zip(HEDIS_COLUMNS, row)) for row in batch]
+            client.table("hedis_gap_trail").insert(records).execute()
+            mirror_stats["rows"] += len(batch)
+            mirror_stats["inserts"] += 1
+        except Exception:
+            mirror_stats["errors"] += 1  # non-blocking; Sheets is source of truth
+
+
+def flush_supabase_mirror(timeout: float = 30.0) -> bool:
+    """Wait until queued mirror rows have been sent. True if drained in time."""
     try:
-        client = create_client(url, key)
-        client.table("hedis_gap_trail").insert(
-            {
-                "gap_id": row[0],
-                "timestamp": row[1],
-                "member_id": row[2],
-                "member_name": row[3],
-                "measure_code": row[4],
-                "measure_name": row[5],
-                "care_domain": row[6],
-                "gap_status": row[7],
-                "due_date": row[8],
-                "provider_name": row[9],
-                "intervention_type": row[10],
-                "star_impact": row[11],
-                "roi_estimate": row[12],
-                "claude_recommendation": row[13],
-                "last_updated": row[14],
-            }
-        ).execute()
+        _mirror_executor.submit(lambda: None).result(timeout=timeout)
     except Exception:
-        pass  # non-blocking; Sheets is source of truth
+        return False
+    with _mirror_lock:
+        return not _mirror_rows and not _mirror_draining
 
 
 # ─────────────────────────────────────────────────────────────
@@ -227,59 +580,202 @@ _SUPPRESSION_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
     os.environ.get("GAP_SUPPRESSION_FILE", ".gap_suppressions.json"),
 )
-_GAP_SUPPRESSIONS_CACHE: list[dict[str, Any]] | None = None
 
+# The file is an append-only JSON-lines log ({"op": "add"|"remove", "gap_id", ...}),
+# so a change appends one line instead of rewriting every rule. It is compacted
+# (temp file + os.replace, so readers never see a partial file) once dead lines
+# outnumber live rules. A legacy JSON array file is read as-is and converted on
+# the first write. The in-memory index is reloaded only when the file's
+# mtime/size changes (e.g. another worker wrote it). Writers hold an flock on
+# a sidecar .lock file and reload before writing, so appends and compactions
+# from several worker processes never drop each other's lines.
+_GAP_SUPPRESSIONS_CACHE: dict[str, dict[str, Any]] | None = None  # gap_id -> rule
+_SUPPRESSED_IDS: frozenset[str] = frozenset()
+_suppression_stamp: tuple[str, int, int] | None = None  # (path, mtime_ns, size)
+_suppression_log_lines = 0
+_suppression_lock = threading.RLock()
+_COMPACT_MIN_LINES = 1000
+
+
+def _suppression_file_stamp() -> tuple[str, int, int] | None:
+    try:
+        st = os.stat(_SUPPRESSION_FILE)
+        return (_SUPPRESSION_FILE, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
 
-def _load_gap_suppressions() -> list[dict[str, Any]]:
-    """Load suppression rules from JSON file."""
-    global _GAP_SUPPRESSIONS_CACHE
-    if os.path.exists(_SUPPRESSION_FILE):
+
+def _parse_suppression_file(text: str) -> tuple[dict[str, dict[str, Any]], int, bool]:
+    """(rules by gap_id, log line count, is_legacy_json_array)."""
+    rules: dict[str, dict[str, Any]] = {}
+    stripped = text.lstrip()
+    if stripped.startswith("["):
         try:
-            with open(_SUPPRESSION_FILE, encoding="utf-8") as f:
-                _GAP_SUPPRESSIONS_CACHE = json.load(f)
+            rules = {str(r["gap_id"]): r for r in json.loads(stripped) if r.get("gap_id")}
         except Exception:
-            _GAP_SUPPRESSIONS_CACHE = []
-    else:
-        _GAP_SUPPRESSIONS_CACHE = []
-    return _GAP_SUPPRESSIONS_CACHE
+            pass
+        return rules, 0, True
+    lines = 0
+    for line in text.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # torn trailing write from a crash
+        lines += 1
+        gap_id = str(entry.get("gap_id", ""))
+        if entry.get("op") == "remove":
+            rules.pop(gap_id, None)
+        elif gap_id:
+            rules[gap_id] = {k: v for k, v in entry.items() if k != "op"}
+    return rules, lines, False
+
+
+def _load_gap_suppressions() -> dict[str, dict[str, Any]]:
+    """Suppression index, re-read only when the file changed on disk."""
+    global _GAP_SUPPRESSIONS_CACHE, _SUPPRESSED_IDS, _suppression_stamp, _suppression_log_lines
+    with _suppression_lock:
+        stamp = _suppression_file_stamp()
+        if _GAP_SUPPRESSIONS_CACHE is not None and stamp == _suppression_stamp:
+            return _GAP_SUPPRESSIONS_CACHE
+        rules: dict[str, dict[str, Any]] = {}
+        lines, legacy = 0, False
+        if stamp is not None:
+            try:
+                with open(_SUPPRESSION_FILE, encoding="utf-8") as f:
+                    rules, lines, legacy = _parse_suppression_file(f.read())
+            except Exception:
+                rules = {}
+        _GAP_SUPPRESSIONS_CACHE = rules
+        _SUPPRESSED_IDS = frozenset(rules)
+        _suppression_stamp = stamp
+        # a legacy array file can't be appended to; force a compaction on first write
+        _suppression_log_lines = lines if not legacy else -1
+        return rules
+
+
+@contextmanager
+def _suppression_write_lock() -> Iterator[None]:
+    """Serialize suppression writers across threads and (with fcntl) worker processes."""
+    with _suppression_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{_SUPPRESSION_FILE}.lock", "a", encoding="utf-8") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
 
 
-def _save_gap_suppressions(rules: list[dict[str, Any]]) -> None:
-    """Persist suppression rules to JSON."""
-    global _GAP_SUPPRESSIONS_CACHE
-    _GAP_SUPPRESSIONS_CACHE = rules
-    try:
-        with open(_SUPPRESSION_FILE, "w", encoding="utf-8") as f:
-            json.dump(rules, f, indent=2)
-    except Exception:
-        pass
+def _write_suppression_log(entries: list[dict[str, Any]]) -> None:
+    """
+    Append log entries (or compact); then apply them to the in-memory index.
+    Callers hold _suppression_write_lock and loaded the index under it.
+    """
+    global _SUPPRESSED_IDS, _suppression_stamp, _suppression_log_lines
+    rules = _load_gap_suppressions()  # picks up lines other processes appended
+    for entry in entries:
+        gap_id = str(entry["gap_id"])
+        if entry["op"] == "remove":
+            rules.pop(gap_id, None)
+        else:
+            rules[gap_id] = {k: v for k, v in entry.items() if k != "op"}
+
+    dead = _suppression_log_lines + len(entries) - len(rules)
+    if _suppression_log_lines < 0 or (dead > len(rules) and dead > _COMPACT_MIN_LINES):
+        tmp = f"{_SUPPRESSION_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for rule in rules.values():
+                f.write(json.dumps({"op": "add", **rule}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, _SUPPRESSION_FILE)
+        _suppression_log_lines = len(rules)
+    else:
+        with open(_SUPPRESSION_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e) + "\n" for e in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        _suppression_log_lines += len(entries)
+    _SUPPRESSED_IDS = frozenset(rules)
+    # Under the flock the file is exactly what we loaded plus our lines. Without
+    # one another process may have appended too, so keep the stamp from before
+    # our write: the next read re-parses instead of trusting one covering its lines.
+    if fcntl is not None:
+        _suppression_stamp = _suppression_file_stamp()
 
 
 def get_gap_suppressions() -> list[dict[str, Any]]:
     """Return all active gap suppression rules."""
-    return list(_load_gap_suppressions())
+    return [dict(r) for r in _load_gap_suppressions().values()]
+
+
+def suppressed_gap_ids() -> frozenset[str]:
+    """Set of suppressed gap_ids (shared, rebuilt only when the store changes)."""
+    with _suppression_lock:
+        _load_gap_suppressions()
+        return _SUPPRESSED_IDS
+
+
+def add_gap_suppressions(gap_ids: list[str], reason: str = "") -> dict[str, Any]:
+    """Suppress many gaps in one write. Returns {success, added, skipped, error}."""
+    created = datetime.now(timezone(timedelta(hours=-5))).isoformat()
+    with _suppression_write_lock():
+        existing = _load_gap_suppressions()
+        new_ids = list(dict.fromkeys(g for g in gap_ids if g and g not in existing))
+        entries = [
+            {
+                "op": "add",
+                "gap_id": g,
+                "reason": reason or "Manual suppression",
+                "created": created,
+            }
+            for g in new_ids
+        ]
+        try:
+            if entries:
+                _write_suppression_log(entries)
+        except Exception as e:
+            _invalidate_suppressions()
+            return {"success": False, "error": str(e)}
+    return {"success": True, "added": len(entries), "skipped": len(gap_ids) - len(entries)}
+
+
+def remove_gap_suppressions(gap_ids: list[str]) -> dict[str, Any]:
+    """Lift suppression for many gaps in one write. Returns {success, removed, error}."""
+    with _suppression_write_lock():
+        existing = _load_gap_suppressions()
+        gone = list(dict.fromkeys(g for g in gap_ids if g in existing))
+        try:
+            if gone:
+                _write_suppression_log([{"op": "remove", "gap_id": g} for g in gone])
+        except Exception as e:
+            _invalidate_suppressions()
+            return {"success": False, "error": str(e)}
+    return {"success": True, "removed": len(gone)}
+
+
+def _invalidate_suppressions() -> None:
+    global _GAP_SUPPRESSIONS_CACHE
+    _GAP_SUPPRESSIONS_CACHE = None  # a failed write may have left memory ahead of disk
 
 
 def add_gap_suppression(gap_id: str, reason: str = "") -> dict[str, Any]:
     """Add a suppression rule for a gap. Returns {success, error}."""
-    rules = _load_gap_suppressions()
-    if any(r.get("gap_id") == gap_id for r in rules):
+    r = add_gap_suppressions([gap_id], reason)
+    if not r["success"]:
+        return r
+    if not r["added"]:
         return {"success": False, "error": "Already suppressed"}
-    rules.append(
-        {
-            "gap_id": gap_id,
-            "reason": reason or "Manual suppression",
-            "created": datetime.now(timezone(timedelta(hours=-5))).isoformat(),
-        }
-    )
-    _save_gap_suppressions(rules)
     return {"success": True, "gap_id": gap_id}
 
 
 def remove_gap_suppression(gap_id: str) -> dict[str, Any]:
     """Remove suppression for a gap. Returns {success, error}."""
-    rules = [r for r in _load_gap_suppressions() if r.get("gap_id") != gap_id]
-    _save_gap_suppressions(rules)
+    r = remove_gap_suppressions([gap_id])
+    if not r["success"]:
+        return r
     return {"success": True, "gap_id": gap_id}
 
 
@@ -287,56 +783,70 @@ def apply_gap_suppression_filter(df: pd.DataFrame) -> pd.DataFrame:
     """Filter out suppressed gaps from DataFrame. Uses 'gap_id' column."""
     if df.empty or "gap_id" not in df.columns:
         return df
-    suppressed_ids = {r["gap_id"] for r in get_gap_suppressions()}
+    suppressed_ids = suppressed_gap_ids()
     if not suppressed_ids:
         return df
     return df[~df["gap_id"].isin(suppressed_ids)].reset_index(drop=True)
 
 
+_GAP_DISPLAY_COLUMNS = [
+    "gap_id",
+    "member_id",
+    "measure_code",
+    "measure_name",
+    "gap_status",
+    "due_date",
+    "star_impact",
+    "roi_estimate",
+    "intervention_type",
+]
+
+
+def fetch_hedis_gaps_page(
+    db: HedisGapDB,
+    filter_status: str = "ALL",
+    filter_measure: str = "ALL",
+    after: str | None = None,
+    limit: int = 15,
+) -> dict[str, Any]:
+    """
+    Cursor-paginated gap records, newest first, suppressed gaps excluded.
+    Pass the returned next_cursor as ``after`` for the next (older) page.
+
+    Returns: { rows (DataFrame), next_cursor, total } — total counts every
+    matching, unsuppressed gap.
+    """
+    empty = pd.DataFrame(columns=_GAP_DISPLAY_COLUMNS)
+    if not db.connected:
+        return {"rows": empty, "next_cursor": None, "total": 0}
+    assert db.sheet is not None
+
+    try:
+        page = db.page(
+            filter_status,
+            filter_measure,
+            after=after,
+            limit=limit,
+            suppressed=suppressed_gap_ids(),
+        )
+        page["rows"] = page["rows"][_GAP_DISPLAY_COLUMNS]
+        return page
+    except Exception as e:
+        return {"rows": pd.DataFrame({"Error": [str(e)]}), "next_cursor": None, "total": 0}
+
+
 def fetch_hedis_gaps(
     db: HedisGapDB, n: int = 15, filter_status: str = "ALL", filter_measure: str = "ALL"
 ) -> pd.DataFrame:
     """
-    Pull gap records with optional filters.
+    Pull the newest ``n`` gap records with optional filters.
     filter_status: ALL | OPEN | CLOSED | EXCLUDED
     filter_measure: ALL | CBP | CDC | W34 | etc.
+    Suppressed gaps are dropped before the limit, so up to ``n`` rows return.
     """
     if not db.connected:
         return pd.DataFrame(columns=HEDIS_COLUMNS)
-    assert db.sheet is not None
-
-    try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
-        if df.empty:
-            return df
-
-        if filter_status != "ALL":
-            df = df[df["gap_status"] == filter_status]
-        if filter_measure != "ALL":
-            df = df[df["measure_code"] == filter_measure]
-
-        df = df.sort_values("timestamp", ascending=False).head(n)
-
-        display_cols = [
-            "gap_id",
-            "member_id",
-            "measure_code",
-            "measure_name",
-            "gap_status",
-            "due_date",
-            "star_impact",
-            "roi_estimate",
-            "intervention_type",
-        ]
-        available = [c for c in display_cols if c in df.columns]
-        out = df[available].reset_index(drop=True)
-        # Phase 2: apply suppression filter
-        out = apply_gap_suppression_filter(out)
-        return out
-
-    except Exception as e:
-        return pd.DataFrame({"Error": [str(e)]})
+    return fetch_hedis_gaps_page(db, filter_status, filter_measure, limit=n)["rows"]
 
 
 def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
@@ -348,8 +858,7 @@ def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
         return {"total": 0, "open": 0, "closed": 0, "avg_star_impact": 0.0, "total_roi": 0.0}
     assert db.sheet is not None
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = db.gaps_frame()
         if df.empty:
             return {"total": 0, "open": 0, "closed": 0, "avg_star_impact": 0.0, "total_roi": 0.0}
 
@@ -365,19 +874,44 @@ def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
 
 
 def close_hedis_gap(db: HedisGapDB, gap_id: str) -> dict[str, Any]:
-    """Mark a gap as CLOSED by gap_id."""
+    """
+    Mark a gap as CLOSED by gap_id.
+
+    The close is queued (poll gap_write_status); the write queue checks the
+    row still holds gap_id before writing and re-locates it if not.
+    """
     if not db.connected:
         return {"success": False, "error": "Cloud disconnected"}
     assert db.sheet is not None
     try:
-        cell = db.sheet.find(gap_id)
-        if not cell:
+        if not db.has_gap(gap_id):
+            # may have been added in the Sheet UI: pull in the background for a retry
+            db.revalidate(force=True)
             return {"success": False, "error": f"{gap_id} not found"}
 
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # row 0 = its append is still queued; the write queue places it once written
+        row_num = db.update_local(gap_id, gap_status="CLOSED", last_updated=stamp) or 0
+
+        def _locate(moved: bool) -> int | None:
+            row = db.locate_row(gap_id, moved)
+            if row:  # a re-read reverted the local close; keep showing it
+                db.update_local(gap_id, gap_status="CLOSED", last_updated=stamp)
+            return row
+
+        def _reread(_err: str) -> None:
+            # re-read the Sheet rather than keep an unsaved close
+            db.sync(full=True)
+
         status_col = HEDIS_COLUMNS.index("gap_status") + 1
         updated_col = HEDIS_COLUMNS.index("last_updated") + 1
-        db.sheet.update_cell(cell.row, status_col, "CLOSED")
-        db.sheet.update_cell(cell.row, updated_col, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        return {"success": True, "gap_id": gap_id, "status": "CLOSED"}
+        ticket = db.write_queue().update(
+            [(row_num, status_col, "CLOSED"), (row_num, updated_col, stamp)],
+            on_error=_reread,
+            # never close another member's gap if the Sheet was reordered
+            guard=(HEDIS_COLUMNS.index("gap_id") + 1, gap_id),
+            locate=_locate,
+        )
+        return {"success": True, "gap_id": gap_id, "status": "CLOSED", "ticket": ticket}
     except Exception as e:
         return {"success": False, "error": str(e)}
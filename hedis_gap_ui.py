@@ -166,6 +166,16 @@ def hedis_gap_panel() -> ui.div:
                 col_widths=[6, 6],
             ),
             ui.output_data_frame("hedis_gap_table"),
+            ui.div(
+                ui.input_action_button(
+                    "btn_gap_page_newer", "‹ Newer", class_="btn btn-sm btn-outline-secondary"
+                ),
+                ui.output_text("gap_page_label", inline=True),
+                ui.input_action_button(
+                    "btn_gap_page_older", "Older ›", class_="btn btn-sm btn-outline-secondary"
+                ),
+                style="display:flex; gap:12px; align-items:center; justify-content:flex-end;",
+            ),
         ),
         # ── Close Gap ──
         ui.card(
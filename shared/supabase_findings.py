@@ -22,7 +22,7 @@ platform_hub_kpis VIEW filters:
 Silent-fail design: all errors logged to stderr only.
 Never raises — insert failures must never crash the UI.
 
-Connection (read from os.environ on each insert, not at import):
+Connection (DSN read from os.environ on each insert, not at import):
     Uses psycopg2 with a Postgres connection string (``postgresql://`` or ``postgres://``).
     Hugging Face Spaces may block HTTP/HTTPS to ``*.supabase.co`` (REST and supabase-py);
     direct Postgres (port 5432 / pooler) uses the DSN from the Supabase dashboard.
@@ -35,18 +35,38 @@ Connection (read from os.environ on each insert, not at import):
     Values that start with ``http://`` or ``https://`` are ignored (those are REST API bases,
     not TCP DSNs). Set a dedicated secret, e.g. ``DATABASE_URL``, to the **Session pooler** or
     **Direct connection** string from Supabase → Project Settings → Database.
+
+Write path:
+    insert_finding() only validates and buffers the row. A background writer
+    sends buffered rows with one execute_values() INSERT per DSN once
+    FINDINGS_BATCH_SIZE rows are waiting or FINDINGS_FLUSH_INTERVAL seconds
+    have passed, over a ThreadedConnectionPool kept per DSN (at most
+    FINDINGS_POOL_MAX connections). flush_findings() drains the buffer; it
+    also runs at process exit.
 """
 from __future__ import annotations
 
+import atexit
 import os
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from typing import Any
 
-import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 _TABLE = "cross_app_findings"
+_COLUMNS = "source_app, finding_type, severity, status, title, description, metadata, created_at, updated_at"
+
+FLUSH_INTERVAL = float(os.environ.get("FINDINGS_FLUSH_INTERVAL", "2.0"))
+BATCH_SIZE = int(os.environ.get("FINDINGS_BATCH_SIZE", "50"))
+POOL_MAX = int(os.environ.get("FINDINGS_POOL_MAX", "4"))
+CONNECT_TIMEOUT = 10
+
+_pools: dict[str, ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
 
 
 def _get_postgres_dsn() -> str:
@@ -76,7 +96,12 @@ def insert_finding(
     measure_id: str | None = None,
     policy_id: str | None = None,
 ) -> bool:
-    """Insert one row into cross_app_findings. Returns True on success.
+    """Queue one row for cross_app_findings. Returns True once buffered (False without a DSN).
+
+    True only means the row was accepted into the buffer: the INSERT happens
+    later on the background writer, and a failure there is reported to
+    stderr and counted, not returned. Use findings_status() (failed,
+    last_error) to tell whether buffered rows actually landed.
 
     Args:
         source_app:     "auditshield" | "starguard" | "sovereignshield"
@@ -111,12 +136,7 @@ def insert_finding(
     if policy_id is not None:
         meta["policy_id"] = str(policy_id)
 
-    sql = (
-        f"INSERT INTO {_TABLE} "
-        "(source_app, finding_type, severity, status, title, description, metadata, created_at, updated_at) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
-    )
-    args = (
+    row = (
         source_app,
         finding_type,
         severity,
@@ -127,20 +147,155 @@ def insert_finding(
         now,
         now,
     )
+    _writer.add(dsn, row)
+    return True
 
+
+def _get_pool(dsn: str) -> ThreadedConnectionPool:
+    """Connection pool for ``dsn``, created on first use (connects lazily)."""
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            pool = ThreadedConnectionPool(0, POOL_MAX, dsn, connect_timeout=CONNECT_TIMEOUT)
+            _pools[dsn] = pool
+        return pool
+
+
+def _write_rows(dsn: str, rows: list[tuple]) -> str | None:
+    """One multi-row INSERT over a pooled connection; returns the error, or None once written.
+
+    Broken connections are discarded.
+    """
+    pool = _get_pool(dsn)
+    conn = None
     try:
-        conn = psycopg2.connect(dsn, connect_timeout=10)
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql, args)
-            conn.commit()
-        finally:
-            conn.close()
-        return True
+        conn = pool.getconn()
+        with conn.cursor() as cur:
+            execute_values(cur, f"INSERT INTO {_TABLE} ({_COLUMNS}) VALUES %s", rows)
+        conn.commit()
+        pool.putconn(conn)
+        return None
     except Exception as exc:
+        if conn is not None:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            pool.putconn(conn, close=True)
+        kinds = sorted({f"{r[0]}/{r[1]}" for r in rows})
         print(
-            f"[findings] insert failed ({exc}) — source_app={source_app} "
-            f"finding_type={finding_type} trigger_type={trigger_type}",
+            f"[findings] insert of {len(rows)} row(s) failed ({exc}) — {', '.join(kinds)}",
             file=sys.stderr,
         )
+        return str(exc)
+
+
+class _FindingsWriter:
+    """Buffers finding rows per DSN and flushes them on a daemon thread."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._buffer: dict[str, list[tuple]] = {}
+        self._oldest = 0.0
+        self._inflight = 0
+        self._thread: threading.Thread | None = None
+        self.stats = {"queued": 0, "written": 0, "failed": 0, "batches": 0}
+        self.last_error: str | None = None
+        self.last_error_at: str | None = None
+
+    def add(self, dsn: str, row: tuple) -> None:
+        with self._cond:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.setdefault(dsn, []).append(row)
+            self.stats["queued"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="findings-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _pending(self) -> int:
+        return sum(len(rows) for rows in self._buffer.values())
+
+    def _take(self) -> dict[str, list[tuple]]:
+        batch, self._buffer = self._buffer, {}
+        self._inflight += 1
+        return batch
+
+    def _send(self, batch: dict[str, list[tuple]]) -> None:
+        try:
+            for dsn, rows in batch.items():
+                error = _write_rows(dsn, rows)
+                with self._cond:
+                    self.stats["failed" if error else "written"] += len(rows)
+                    self.stats["batches"] += 1
+                    if error:
+                        self.last_error = error
+                        self.last_error_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        finally:
+            with self._cond:
+                self._inflight -= 1
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    pending = self._pending()
+                    due = self._oldest + FLUSH_INTERVAL - time.monotonic()
+                    if pending and (pending >= BATCH_SIZE or due <= 0):
+                        break
+                    self._cond.wait(timeout=due if pending else None)
+                batch = self._take()
+            self._send(batch)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Write everything buffered now, on the calling thread. True if fully drained."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            batch = self._take() if self._buffer else None
+        if batch is not None:
+            self._send(batch)
+        with self._cond:
+            while self._inflight and time.monotonic() < deadline:
+                self._cond.wait(timeout=max(0.0, deadline - time.monotonic()))
+            return not self._buffer and not self._inflight
+
+
+_writer = _FindingsWriter()
+
+
+def flush_findings(timeout: float = 30.0) -> bool:
+    """Send buffered findings now and wait for in-flight batches. Never raises."""
+    try:
+        return _writer.flush(timeout)
+    except Exception as exc:
+        print(f"[findings] flush failed ({exc})", file=sys.stderr)
         return False
+
+
+def findings_stats() -> dict[str, int]:
+    """Counters for the buffered writer: queued, written, failed, batches, pending."""
+    with _writer._cond:
+        return {**_writer.stats, "pending": _writer._pending()}
+
+
+def findings_status() -> dict[str, Any]:
+    """findings_stats() plus last_error / last_error_at of the most recent failed batch.
+
+    healthy is False once any buffered row failed to insert, since
+    insert_finding() cannot report that to its caller.
+    """
+    stats = findings_stats()
+    with _writer._cond:
+        return {
+            **stats,
+            "last_error": _writer.last_error,
+            "last_error_at": _writer.last_error_at,
+            "healthy": stats["failed"] == 0,
+        }
+
+
+atexit.register(flush_findings)
@@ -0,0 +1,442 @@
+# sheets_write_queue.py
+# ─────────────────────────────────────────────────────────────
+# Batched Google Sheets Writes — StarGuard Desktop
+# Coalesces row appends into one append_rows() (at most MAX_BATCH_ROWS
+# rows; larger items are split) and cell updates into one batch_update()
+# per flush, on a background thread, with exponential backoff on 429 /
+# quota errors. Appends are retried only when they cannot have landed,
+# or after dropping rows whose key already reached the sheet. Callers
+# get a ticket.
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from gspread.utils import rowcol_to_a1
+
+# Seconds between flushes. Each flush is at most two write requests, so the
+# default stays under the Sheets 60 writes/minute/user quota.
+FLUSH_INTERVAL = float(os.environ.get("SHEETS_FLUSH_INTERVAL", "2.0"))
+MAX_BATCH_ROWS = int(os.environ.get("SHEETS_MAX_BATCH_ROWS", "1000"))
+MAX_ATTEMPTS = int(os.environ.get("SHEETS_MAX_ATTEMPTS", "6"))
+MAX_BACKOFF = 64.0
+_KEEP_TICKETS = 2000
+
+_ticket_seq = itertools.count(1)
+_UPDATED_RANGE_RE = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?")
+
+# A queued append item and the indices of its rows going out in one request
+_Piece = tuple[dict[str, Any], list[int]]
+
+
+def _status_code(e: Exception) -> int | None:
+    code = getattr(e, "code", None)
+    if code is None:
+        code = getattr(getattr(e, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def _is_quota_error(e: Exception) -> bool:
+    text = str(e).lower()
+    return _status_code(e) == 429 or "429" in text or "quota" in text or "rate limit" in text
+
+
+def appended_rows(response: Any) -> list[int]:
+    """Row numbers from an append_rows() response's updatedRange ("Sheet1!A12:O14")."""
+    try:
+        m = _UPDATED_RANGE_RE.search(response["updates"]["updatedRange"])
+        if m is None:
+            return []
+        first = int(m.group(1))
+        last = int(m.group(2) or first)
+        return list(range(first, last + 1))
+    except Exception:
+        return []
+
+
+class SheetWriteQueue:
+    """
+    Write-behind queue for one worksheet.
+
+    append()/update() return immediately with a ticket id; ticket(tid)
+    reports queued | done | failed plus, for appends, the sheet rows
+    written. Optional on_done(result) / on_error(message) callbacks run
+    on the flusher thread.
+
+    A rejected append (429 / quota) never landed and is simply resent. Any
+    other append error is ambiguous - the rows may have been written - so
+    with ``key_col`` (the 0-based column holding a unique row id) the next
+    attempt first reads that column and skips rows already present;
+    without it the append fails instead of risking duplicates. Cell
+    updates are idempotent and retried on any error.
+    """
+
+    def __init__(self, sheet: Any, name: str = "sheet", key_col: int | None = None) -> None:
+        self.sheet = sheet
+        self.name = name
+        self.key_col = key_col
+        self._reconcile = False
+        self._cond = threading.Condition()
+        self._appends: list[dict[str, Any]] = []
+        self._updates: list[dict[str, Any]] = []
+        self._tickets: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._thread: threading.Thread | None = None
+        self._flushing = False
+        self._attempts = 0
+        self._retry_at = 0.0
+        self.stats = {"flushes": 0, "requests": 0, "rows": 0, "cells": 0, "retries": 0}
+
+    # ── Enqueue ───────────────────────────────────────────────
+
+    def append(
+        self,
+        rows: list[list[Any]],
+        on_done: Callable[[dict[str, Any]], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+    ) -> str:
+        """Queue rows for append_rows(); the ticket result has "rows": [sheet row numbers]."""
+        rows = [list(r) for r in rows]
+        item: dict[str, Any] = {
+            "rows": rows,
+            "pending": list(range(len(rows))),
+            "written": [None] * len(rows),
+        }
+        return self._enqueue(self._appends, item, on_done, on_error)
+
+    def update(
+        self,
+        cells: list[tuple[int, int, Any]],
+        on_done: Callable[[dict[str, Any]], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+        guard: tuple[int, Any] | None = None,
+        locate: Callable[[bool], int | None] | None = None,
+    ) -> str:
+        """
+        Queue (row, col, value) cell writes for one batch_update().
+
+        With ``guard=(col, key)`` every cell must be in one row, and that row's
+        ``col`` cell is read back before writing: if it no longer holds ``key``
+        (rows sorted, deleted or inserted in the Sheet UI) ``locate(True)`` is
+        asked for the row's new number. A row of 0 means not known yet and is
+        resolved with ``locate(False)``. locate returns the row, 0 to wait for
+        a later flush (e.g. the row's append is still queued), or None when the
+        row is gone, which fails the ticket.
+        """
+        item: dict[str, Any] = {"cells": list(cells), "guard": guard, "locate": locate}
+        return self._enqueue(self._updates, item, on_done, on_error)
+
+    def _enqueue(
+        self,
+        target: list[dict[str, Any]],
+        item: dict[str, Any],
+        on_done: Callable[[dict[str, Any]], None] | None,
+        on_error: Callable[[str], None] | None,
+    ) -> str:
+        tid = f"{self.name}-{next(_ticket_seq)}"
+        item.update(ticket=tid, on_done=on_done, on_error=on_error)
+        with self._cond:
+            target.append(item)
+            self._tickets[tid] = {"status": "queued", "error": None, "rows": []}
+            while len(self._tickets) > _KEEP_TICKETS:
+                self._tickets.popitem(last=False)
+            self._ensure_thread()
+            self._cond.notify()
+        return tid
+
+    def ticket(self, tid: str) -> dict[str, Any]:
+        """Status of a ticket: {status, error, rows}; unknown ids report "unknown"."""
+        with self._cond:
+            t = self._tickets.get(tid)
+            return dict(t) if t else {"status": "unknown", "error": None, "rows": []}
+
+    def pending(self) -> int:
+        with self._cond:
+            return self.pending_appends() + sum(len(i["cells"]) for i in self._updates)
+
+    def pending_appends(self) -> int:
+        """Queued rows not yet sent to append_rows()."""
+        with self._cond:
+            return sum(len(i["pending"]) for i in self._appends)
+
+    # ── Flushing ──────────────────────────────────────────────
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f"sheets-writer-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not (self._appends or self._updates):
+                    self._cond.wait()
+                delay = max(FLUSH_INTERVAL, self._retry_at - time.monotonic())
+            time.sleep(max(0.0, delay))
+            self.flush_once()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Drain the queue on the calling thread (honouring backoff).
+        True once nothing is queued; check tickets for individual failures.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                idle = not (self._appends or self._updates)
+                busy = self._flushing
+                wait = self._retry_at - time.monotonic()
+            if idle and not busy:
+                return True
+            if busy or wait > 0:
+                time.sleep(min(max(wait, 0.05), max(0.0, deadline - time.monotonic())))
+                continue
+            self.flush_once()
+        return False
+
+    def flush_once(self) -> bool:
+        """Send one batch: queued appends, then queued cell updates. True on success."""
+        with self._cond:
+            if self._flushing:
+                return True
+            self._flushing = True
+            # (item, row indices) pieces; an item larger than the room left is
+            # split and its remainder stays at the head of the queue
+            appends: list[_Piece] = []
+            rows_taken = 0
+            while self._appends and rows_taken < MAX_BATCH_ROWS:
+                item = self._appends[0]
+                n = min(len(item["pending"]), MAX_BATCH_ROWS - rows_taken)
+                appends.append((item, item["pending"][:n]))
+                item["pending"] = item["pending"][n:]
+                rows_taken += n
+                if not item["pending"]:
+                    self._appends.pop(0)
+            updates, self._updates = self._updates, []
+            reconcile, self._reconcile = self._reconcile, False
+
+        try:
+            ok = True
+            if appends and reconcile:
+                appends = self._skip_landed(appends)
+            if appends:
+                ok = self._send_appends(appends)
+            if ok and updates:
+                ok = self._send_updates(updates)
+            elif updates:
+                with self._cond:  # appends are backing off; keep updates queued
+                    self._updates[:0] = updates
+            return ok
+        finally:
+            with self._cond:
+                self._flushing = False
+                self.stats["flushes"] += 1
+
+    def _skip_landed(self, pieces: list[_Piece]) -> list[_Piece]:
+        """After an ambiguous append error: record rows whose key is already on the sheet."""
+        key_col = self.key_col
+        if key_col is None:
+            return pieces
+        letter = rowcol_to_a1(1, key_col + 1)[:-1]
+        try:
+            column = self.sheet.batch_get([f"{letter}1:{letter}"])[0]
+        except Exception:
+            with self._cond:
+                self._reconcile = True  # still unknown; check again before the next send
+            return self._requeue_unsent(pieces)
+        landed = {str(r[0]): n for n, r in enumerate(column, start=1) if r and r[0] != ""}
+        out: list[_Piece] = []
+        for item, indices in pieces:
+            for i in indices:
+                row_num = landed.get(str(item["rows"][i][key_col]))
+                if row_num is not None:
+                    item["written"][i] = row_num
+            rest = [i for i in indices if item["written"][i] is None]
+            if rest:
+                out.append((item, rest))
+            elif not item["pending"]:
+                self._finish_append(item)
+        return out
+
+    def _requeue_unsent(self, pieces: list[_Piece]) -> list[_Piece]:
+        with self._cond:
+            for item, indices in reversed(pieces):
+                item["pending"] = indices + item["pending"]
+                if not (self._appends and self._appends[0] is item):
+                    self._appends.insert(0, item)
+        return []
+
+    def _send_appends(self, pieces: list[_Piece]) -> bool:
+        rows = [item["rows"][i] for item, indices in pieces for i in indices]
+        try:
+            response = self.sheet.append_rows(rows)
+        except Exception as e:
+            return self._failed_appends(pieces, e)
+        written = appended_rows(response)
+        self._succeeded()
+        self.stats["requests"] += 1
+        self.stats["rows"] += len(rows)
+        offset = 0
+        for item, indices in pieces:
+            if len(written) == len(rows):
+                for i, row_num in zip(indices, written[offset : offset + len(indices)]):
+                    item["written"][i] = row_num
+            offset += len(indices)
+            if not item["pending"]:
+                self._finish_append(item)
+        return True
+
+    def _finish_append(self, item: dict[str, Any]) -> None:
+        written = item["written"]
+        self._finish(item, {"rows": written if None not in written else []})
+
+    def _failed_appends(self, pieces: list[_Piece], e: Exception) -> bool:
+        """Resend rejected appends; an ambiguous error needs key_col to retry without duplicates."""
+        if not _is_quota_error(e):
+            if self.key_col is None:
+                items = list({id(item): item for item, _ in pieces}.values())
+                with self._cond:
+                    self._appends = [i for i in self._appends if all(i is not x for x in items)]
+                for item in items:
+                    self._finish(item, None, str(e))
+                return False
+            with self._cond:
+                self._reconcile = True
+        self._requeue_unsent(pieces)
+        items = list({id(item): item for item, _ in pieces}.values())
+        return self._failed(items, None, e)
+
+    def _place_updates(self, items: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        """
+        Resolve guarded items to their current rows. Items still waiting go
+        back on the queue and vanished rows fail; returns the items to send,
+        or None when the guard read failed (the items are requeued).
+        """
+        waiting: list[dict[str, Any]] = []
+
+        def _move(item: dict[str, Any], moved: bool) -> bool:
+            row = item["locate"](moved) if item["locate"] else None
+            if row is None:
+                self._finish(item, None, f"{item['guard'][1]} is no longer on the sheet")
+            elif row == 0:
+                waiting.append(item)
+            else:
+                item["cells"] = [(row, c, v) for _, c, v in item["cells"]]
+                return True
+            return False
+
+        placed = [i for i in items if not i["guard"] or i["cells"][0][0] or _move(i, False)]
+        if waiting:
+            with self._cond:
+                self._updates[:0] = waiting
+        guarded = [i for i in placed if i["guard"]]
+        if guarded:
+            ranges = []
+            for item in guarded:
+                cell = rowcol_to_a1(item["cells"][0][0], item["guard"][0])
+                ranges.append(f"{cell}:{cell}")
+            try:
+                found = self.sheet.batch_get(ranges)
+            except Exception as e:
+                self._failed(placed, self._updates, e)
+                return None
+            waiting.clear()
+            stale = {
+                id(item)
+                for item, value in zip(guarded, found)
+                if not value or not value[0] or str(value[0][0]) != str(item["guard"][1])
+            }
+            send = [i for i in placed if id(i) not in stale or _move(i, True)]
+            if waiting:  # a moved row whose new position is not known yet
+                with self._cond:
+                    self._updates[:0] = waiting
+        else:
+            send = placed
+        return send
+
+    def _send_updates(self, queued: list[dict[str, Any]]) -> bool:
+        items = self._place_updates(queued)
+        if items is None:
+            return False
+        if not items:
+            return True
+        data = [
+            {"range": rowcol_to_a1(r, c), "values": [[v]]}
+            for item in items
+            for (r, c, v) in item["cells"]
+        ]
+        try:
+            self.sheet.batch_update(data)
+        except Exception as e:
+            return self._failed(items, self._updates, e)
+        self._succeeded()
+        self.stats["requests"] += 1
+        self.stats["cells"] += len(data)
+        for item in items:
+            self._finish(item, {"rows": sorted({r for r, _, _ in item["cells"]})})
+        return True
+
+    def _succeeded(self) -> None:
+        with self._cond:
+            self._attempts = 0
+            self._retry_at = 0.0
+
+    def _failed(
+        self,
+        items: list[dict[str, Any]],
+        queue: list[dict[str, Any]] | None,
+        e: Exception,
+    ) -> bool:
+        """
+        Back off and retry (quota errors get twice the attempts); give up after
+        MAX_ATTEMPTS. ``queue`` is where to put ``items`` back; None means the
+        caller already requeued them (appends) and they are dropped on give-up.
+        """
+        with self._cond:
+            self._attempts += 1
+            limit = MAX_ATTEMPTS * 2 if _is_quota_error(e) else MAX_ATTEMPTS
+            if self._attempts < limit:
+                backoff = min(MAX_BACKOFF, 2 ** (self._attempts - 1))
+                self._retry_at = time.monotonic() + backoff * random.uniform(1.0, 1.25)
+                if queue is not None:
+                    queue[:0] = items
+                self.stats["retries"] += 1
+                for item in items:
+                    self._tickets.get(item["ticket"], {})["error"] = str(e)
+                return False
+            self._attempts = 0
+            self._retry_at = 0.0
+            if queue is None:
+                self._appends = [i for i in self._appends if all(i is not x for x in items)]
+                self._reconcile = False
+        for item in items:
+            self._finish(item, None, str(e))
+        return False
+
+    def _finish(
+        self, item: dict[str, Any], result: dict[str, Any] | None, error: str | None = None
+    ) -> None:
+        with self._cond:
+            t = self._tickets.get(item["ticket"])
+            if t is not None:
+                t.update(
+                    status="failed" if error else "done",
+                    error=error,
+                    rows=(result or {}).get("rows", []),
+                )
+        try:
+            if error and item["on_error"]:
+                item["on_error"](error)
+            elif not error and item["on_done"]:
+                item["on_done"](result)
+        except Exception:
+            pass  # callbacks must never stop the flusher
@@ -8,14 +8,23 @@
 
 import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 
 import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from gspread.utils import rowcol_to_a1
+
+from sheets_write_queue import SheetWriteQueue
+from utils.ids import new_id
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
+# Seconds between pulls of rows appended to the Sheet since the last sync
+CACHE_SYNC_INTERVAL = float(os.environ.get("STAR_CACHE_SYNC_INTERVAL", "60"))
+
 # ── Sheet Column Schema ───────────────────────────────────────
 FORECAST_COLUMNS = [
     "forecast_id",
@@ -39,6 +48,22 @@ FORECAST_COLUMNS = [
     "cached_by",
     "last_updated",
 ]
+_LAST_COL = rowcol_to_a1(1, len(FORECAST_COLUMNS)).rstrip("0123456789")
+_CONTRACT = FORECAST_COLUMNS.index("contract_id")
+_STATUS = FORECAST_COLUMNS.index("cache_status")
+_STATUS_COL = rowcol_to_a1(1, _STATUS + 1).rstrip("0123456789")
+_NUMERIC_COLUMNS = [
+    "measurement_year",
+    "current_star_rating",
+    "projected_star_rating",
+    "star_delta",
+    "gaps_open",
+    "gaps_closed",
+    "hedis_completion_rate",
+    "hcc_risk_score",
+    "cahps_score",
+    "roi_projection",
+]
 
 # ── Star Rating Thresholds ────────────────────────────────────
 STAR_THRESHOLDS = {
@@ -59,6 +84,17 @@ def star_label(rating: float) -> tuple:
     return ("⭐", "#f87171", "Low Performing")
 
 
+def _record(row: list) -> dict:
+    """Sheet row -> forecast dict, numeric columns as floats (NaN when blank)."""
+    rec = dict(zip(FORECAST_COLUMNS, row))
+    for col in _NUMERIC_COLUMNS:
+        try:
+            rec[col] = float(rec[col])
+        except (TypeError, ValueError):
+            rec[col] = float("nan")
+    return rec
+
+
 # ─────────────────────────────────────────────────────────────
 # CONNECTION MANAGER
 # ─────────────────────────────────────────────────────────────
@@ -70,6 +106,16 @@ class StarRatingCacheDB:
     Credentials: GSHEETS_CREDS_JSON (HF Secret) or service_account.json
     Sheet name:  STAR_CACHE_SHEET_ID env var or
                  'StarGuard_Star_Rating_Cache'
+
+    Readers share one local snapshot of the sheet. Forecast rows are
+    append-only, so after the first full download a sync only fetches the
+    rows past the last-row watermark plus the cache_status column (one
+    batch_get), at most every STAR_CACHE_SYNC_INTERVAL seconds; the status
+    column picks up rows other writers flipped to STALE. Local writes land
+    in the snapshot first.
+
+    A contract_id -> FRESH forecast index, rebuilt on every full sync, makes
+    fetch_latest_forecast a lookup and stale-marking one batch_update.
     """
 
     def __init__(self):
@@ -79,6 +125,18 @@ class StarRatingCacheDB:
         self.last_error = None
         self.last_cached_at = None
         self.cache_count = 0
+        self._writes = None
+        self._lock = threading.RLock()
+        self._rows: dict[int, list] = {}  # sheet row number -> values
+        self._pending: dict[str, list] = {}  # written locally, row not yet known
+        self._row_of: dict[str, int] = {}  # forecast_id -> sheet row number
+        self._fresh: dict[str, list[str]] = {}  # contract_id -> FRESH forecast_ids, oldest first
+        self._restale: set[str] = set()  # staled while their append was still queued
+        self._last_row = 1  # watermark: highest sheet row pulled (1 = header)
+        self._frame: pd.DataFrame | None = None
+        self._synced_at: float | None = None
+        self._sync_lock = threading.Lock()  # one pull at a time
+        self.generation = 0  # bumped on every snapshot change; Shiny polls it
         self._connect()
 
     def _connect(self):
@@ -104,13 +162,7 @@ class StarRatingCacheDB:
             self.sheet = wb.sheet1
             self._ensure_headers()
             self.connected = True
-
-            # Load last cached timestamp from sheet
-            rows = self.sheet.get_all_values()
-            self.cache_count = max(0, len(rows) - 1)
-            if self.cache_count > 0:
-                # timestamp is column index 1 (0-based)
-                self.last_cached_at = rows[-1][1]
+            self.sync(full=True)
 
         except Exception as e:
             self.connected = False
@@ -120,6 +172,15 @@ class StarRatingCacheDB:
         if not self.sheet.row_values(1):
             self.sheet.insert_row(FORECAST_COLUMNS, index=1)
 
+    def write_queue(self) -> SheetWriteQueue:
+        """Batched, backoff-aware writer for this sheet (created on first use)."""
+        with self._lock:
+            if self._writes is None:
+                self._writes = SheetWriteQueue(
+                    self.sheet, "star-cache", key_col=FORECAST_COLUMNS.index("forecast_id")
+                )
+            return self._writes
+
     def status(self) -> dict:
         return {
             "connected": self.connected,
@@ -129,6 +190,212 @@ class StarRatingCacheDB:
             "timestamp": datetime.now(timezone(timedelta(hours=-5))).strftime("%I:%M:%S %p EST"),
         }
 
+    # ── Local snapshot ────────────────────────────────────────
+
+    def sync(self, full: bool = False, force: bool = False) -> bool:
+        """
+        Pull new Sheet rows into the snapshot. Returns True if a pull ran.
+
+        Skipped while the last pull is younger than STAR_CACHE_SYNC_INTERVAL
+        unless ``force``; ``full`` re-downloads every row. A failed pull keeps
+        the current snapshot and waits for the next interval. The Sheets call
+        runs outside the snapshot lock, so readers are never held up by it.
+        """
+        if not self.connected:
+            return False
+        with self._sync_lock:
+            with self._lock:
+                fresh = (
+                    self._synced_at is not None
+                    and time.monotonic() - self._synced_at < CACHE_SYNC_INTERVAL
+                )
+                if fresh and not (force or full):
+                    return False
+                full = full or self._synced_at is None
+                first = 2 if full else self._last_row + 1
+            try:
+                statuses = []
+                if full:
+                    rows = self.sheet.get_all_values()[1:]
+                else:
+                    ranges = [f"A{first}:{_LAST_COL}"]
+                    if first > 2:
+                        ranges.append(f"{_STATUS_COL}2:{_STATUS_COL}{first - 1}")
+                    rows, *rest = self.sheet.batch_get(ranges)
+                    statuses = rest[0] if rest else []
+                with self._lock:
+                    changed = self._apply_statuses(statuses)
+                    if full:
+                        self._rows, self._row_of, self._last_row = {}, {}, 1
+                        self._fresh = {}
+                        for fid, row in self._pending.items():
+                            self._index_fresh(fid, row)
+                    for i, row in enumerate(rows, start=first):
+                        self._store_row(i, row)
+                    self._last_row = max(self._last_row, first + len(rows) - 1)
+                    if full or rows or changed:
+                        self._settle()
+            except Exception as e:
+                self.last_error = str(e)
+            with self._lock:
+                self._synced_at = time.monotonic()
+            return True
+
+    def revalidate(self) -> None:
+        """Stale-while-revalidate: start a background sync if due; never blocks."""
+        with self._lock:
+            due = (
+                self._synced_at is None or time.monotonic() - self._synced_at >= CACHE_SYNC_INTERVAL
+            )
+        if due and self.connected and not self._sync_lock.locked():
+            threading.Thread(target=self.sync, name="star-cache-sync", daemon=True).start()
+
+    def _apply_statuses(self, statuses: list) -> bool:
+        """Merge the pulled cache_status column (rows 2..). STALE is final, so a local STALE
+        mark whose update is still queued is never reverted to FRESH."""
+        changed = False
+        for row_num, cell in enumerate(statuses, start=2):
+            row = self._rows.get(row_num)
+            value = cell[0] if cell else ""
+            if row is None or not value or row[_STATUS] in (value, "STALE"):
+                continue
+            row[_STATUS] = value
+            self._index_fresh(str(row[0]), row)
+            changed = True
+        return changed
+
+    def _store_row(self, row_num: int, row: list, pulled: bool = True) -> None:
+        """Store a sheet row. Only ``pulled`` rows move the watermark, so a confirmed
+        append never skips rows other writers added above it."""
+        row = list(row)[: len(FORECAST_COLUMNS)]
+        row += [""] * (len(FORECAST_COLUMNS) - len(row))
+        if not any(row):
+            return
+        known = self._rows.get(row_num)
+        if known is not None and known[0] == row[0] and known[_STATUS] == "STALE":
+            row[_STATUS] = "STALE"  # our STALE update may still be queued
+        self._rows[row_num] = row
+        if pulled:
+            self._last_row = max(self._last_row, row_num)
+        self._pending.pop(str(row[0]), None)
+        self._row_of[str(row[0])] = row_num
+        self._index_fresh(str(row[0]), row)
+
+    def _index_fresh(self, forecast_id: str, row: list) -> None:
+        contract = str(row[_CONTRACT])
+        ids = self._fresh.setdefault(contract, [])
+        if forecast_id in ids:
+            ids.remove(forecast_id)
+        if row[_STATUS] == "FRESH":
+            ids.append(forecast_id)
+            ids.sort()  # ids are time-ordered; the last one is the latest
+        if not ids:
+            del self._fresh[contract]
+
+    def _settle(self) -> None:
+        self._frame = None
+        self.generation += 1
+        self.cache_count = len(self._rows) + len(self._pending)
+        ts = FORECAST_COLUMNS.index("timestamp")
+        stamps = [r[ts] for r in self._rows.values()] + [r[ts] for r in self._pending.values()]
+        self.last_cached_at = max((str(t) for t in stamps if t), default=None)
+
+    def add_local(self, row: list) -> None:
+        """A new forecast row is visible to readers before its Sheet append lands."""
+        with self._lock:
+            self._pending[str(row[0])] = list(row)
+            self._index_fresh(str(row[0]), self._pending[str(row[0])])
+            self._settle()
+
+    def confirm_local(self, forecast_id: str, row_num: int | None) -> None:
+        """The Sheet accepted ``forecast_id`` at ``row_num`` (None when unknown)."""
+        with self._lock:
+            row = self._pending.get(forecast_id)
+            if row is not None and row_num is not None:
+                self._store_row(row_num, row, pulled=False)
+                self._settle()
+                if forecast_id in self._restale:
+                    # superseded before it landed: the Sheet still has it FRESH
+                    self._restale.discard(forecast_id)
+                    self.write_queue().update([(row_num, _STATUS + 1, "STALE")])
+
+    def drop_local(self, forecast_id: str) -> None:
+        """Roll back a local write the Sheet rejected."""
+        with self._lock:
+            row = self._pending.pop(forecast_id, None)
+            if row is not None:
+                row[_STATUS] = "DROPPED"
+                self._index_fresh(forecast_id, row)
+            self._restale.discard(forecast_id)
+            self._settle()
+
+    def mark_contract_stale(self, contract_id: str, keep: int = 0) -> list[int]:
+        """
+        Flip the contract's FRESH forecasts, except the newest ``keep``, to
+        STALE in the snapshot. Returns their sheet rows; rows whose append is
+        still queued are re-staled by confirm_local once their row number is
+        known.
+        """
+        with self._lock:
+            ids = self._fresh.pop(contract_id, [])
+            cut = len(ids) - keep
+            if ids[cut:]:
+                self._fresh[contract_id] = ids[cut:]
+            rows = []
+            for fid in ids[:cut]:
+                row_num = self._row_of.get(fid)
+                row = self._rows.get(row_num) if row_num else self._pending.get(fid)
+                if row is None:
+                    continue
+                row[_STATUS] = "STALE"
+                if row_num:
+                    rows.append(row_num)
+                else:
+                    self._restale.add(fid)
+            self._settle()
+            return rows
+
+    def stale_superseded(self, contract_id: str) -> None:
+        """
+        Write-queue thread, once a forecast append lands: pull rows and
+        statuses other writers changed, then queue STALE for every FRESH
+        forecast of the contract but the latest.
+        """
+        self.sync(force=True)
+        rows = self.mark_contract_stale(contract_id, keep=1)
+        if rows:
+            self.write_queue().update([(r, _STATUS + 1, "STALE") for r in rows])
+
+    def latest_fresh(self, contract_id: str = "") -> dict | None:
+        """Most recent FRESH forecast for ``contract_id`` (any contract if empty), as a record."""
+        self.revalidate()
+        with self._lock:
+            if contract_id:
+                ids = self._fresh.get(contract_id)
+                fid = ids[-1] if ids else None
+            else:
+                fid = max((ids[-1] for ids in self._fresh.values()), default=None)
+            if fid is None:
+                return None
+            row_num = self._row_of.get(fid)
+            row = self._rows.get(row_num) if row_num else self._pending.get(fid)
+            return _record(row) if row is not None else None
+
+    def forecasts_frame(self) -> pd.DataFrame:
+        """All forecasts as a DataFrame (copy) with a sheet_row column; refreshed in the background."""
+        self.revalidate()
+        with self._lock:
+            if self._frame is None:
+                nums = sorted(self._rows)
+                rows = [self._rows[k] for k in nums]
+                pending = [r for g, r in self._pending.items()]
+                df = pd.DataFrame(rows + pending, columns=FORECAST_COLUMNS)
+                for col in _NUMERIC_COLUMNS:
+                    df[col] = pd.to_numeric(df[col], errors="coerce")
+                df["sheet_row"] = pd.array(nums + [None] * len(pending), dtype="Int64")
+                self._frame = df
+            return self._frame.copy()
+
 
 # ─────────────────────────────────────────────────────────────
 # CACHE OPERATIONS
@@ -139,6 +406,11 @@ def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
     """
     Write a forecast run to the Google Sheets cache.
 
+    The append and the STALE marks for prior rows go through the sheet's
+    write queue; poll db.write_queue().ticket(result["ticket"]). Nothing
+    here calls Sheets: once the append lands, the queue thread re-syncs and
+    stales FRESH rows other writers added meanwhile.
+
     forecast keys:
         contract_id, plan_name, measurement_year,
         current_star_rating, projected_star_rating,
@@ -152,10 +424,11 @@ def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
 
     try:
         # Mark all previous FRESH rows as STALE for this contract
-        _mark_prior_stale(db, forecast.get("contract_id", ""))
+        contract_id = forecast.get("contract_id", "")
+        _mark_prior_stale(db, contract_id)
 
         now = datetime.now(timezone(timedelta(hours=-5)))
-        forecast_id = f"FCST-{now.strftime('%Y%m%d-%H%M%S')}"
+        forecast_id = new_id("FCST", now)
         current = float(forecast.get("current_star_rating", 0))
         projected = float(forecast.get("projected_star_rating", 0))
 
@@ -182,15 +455,24 @@ def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
             now.strftime("%Y-%m-%d %H:%M:%S"),
         ]
 
-        db.sheet.append_row(row)
-        db.cache_count += 1
-        db.last_cached_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        def _landed(result: dict) -> None:
+            db.confirm_local(forecast_id, result["rows"][0] if result["rows"] else None)
+            if contract_id:
+                db.stale_superseded(contract_id)
+
+        db.add_local(row)
+        ticket = db.write_queue().append(
+            [row],
+            on_done=_landed,
+            on_error=lambda _err: db.drop_local(forecast_id),
+        )
 
         return {
             "success": True,
             "forecast_id": forecast_id,
             "timestamp": now.strftime("%I:%M:%S %p EST"),
             "star_delta": round(projected - current, 2),
+            "ticket": ticket,
         }
 
     except Exception as e:
@@ -198,17 +480,13 @@ def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
 
 
 def _mark_prior_stale(db: StarRatingCacheDB, contract_id: str):
-    """Internal: mark all FRESH rows for this contract as STALE."""
+    """Internal: mark this contract's known FRESH rows STALE (one queued batch_update, no I/O)."""
     if not contract_id or not db.connected:
         return
     try:
-        records = db.sheet.get_all_records()
-        cache_col = FORECAST_COLUMNS.index("cache_status") + 1
-        FORECAST_COLUMNS.index("contract_id") + 1
-
-        for i, rec in enumerate(records, start=2):  # row 1 = headers
-            if rec.get("contract_id") == contract_id and rec.get("cache_status") == "FRESH":
-                db.sheet.update_cell(i, cache_col, "STALE")
+        rows = db.mark_contract_stale(contract_id)
+        if rows:
+            db.write_queue().update([(r, _STATUS + 1, "STALE") for r in rows])
     except Exception:
         pass  # non-fatal
 
@@ -221,20 +499,7 @@ def fetch_latest_forecast(db: StarRatingCacheDB, contract_id: str = ""):
     if not db.connected:
         return None
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
-        if df.empty:
-            return None
-
-        df = df[df["cache_status"] == "FRESH"]
-        if contract_id:
-            df = df[df["contract_id"] == contract_id]
-        if df.empty:
-            return None
-
-        df = df.sort_values("timestamp", ascending=False)
-        return df.iloc[0].to_dict()
-
+        return db.latest_fresh(contract_id)
     except Exception:
         return None
 
@@ -249,15 +514,14 @@ def fetch_forecast_history(
     if not db.connected:
         return pd.DataFrame()
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = db.forecasts_frame()
         if df.empty:
-            return df
+            return df.drop(columns="sheet_row")
 
         if contract_id:
             df = df[df["contract_id"] == contract_id]
 
-        df = df.sort_values("timestamp", ascending=True).tail(n)
+        df = df.sort_values("forecast_id", ascending=True).tail(n)
         cols = [
             "forecast_id",
             "timestamp",
@@ -281,8 +545,7 @@ def fetch_cache_summary(db: StarRatingCacheDB) -> dict:
     if not db.connected:
         return {}
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = db.forecasts_frame()
         if df.empty:
             return {
                 "total": 0,
@@ -4,38 +4,49 @@ Shared by AuditShield, StarGuard, and SovereignShield integrations.
 Uses PLATFORM_SUPABASE_URL (platform hub project) when set, else SUPABASE_URL.
 Uses PLATFORM_SUPABASE_ANON_KEY when set, else SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, SUPABASE_KEY.
 Schema: platform_sessions (app_name, created_at), cross_app_findings (status DEFAULT 'open').
+Clients are created once per (url, key) and reused by every caller, so the
+underlying HTTP session keeps its pooled keep-alive connections.
 """
 from __future__ import annotations
 
 import os
+import threading
 from typing import Any
 
-_client: Any = None
+_clients: dict[tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
 
 
-def _get_client():
-    """Lazy Supabase client. Returns None if not configured."""
-    global _client
-    if _client is not None:
-        return _client
-    try:
-        from supabase import create_client
-        url = os.environ.get("PLATFORM_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
-        key = (
-            os.environ.get("PLATFORM_SUPABASE_ANON_KEY")
-            or os.environ.get("SUPABASE_ANON_KEY")
-            or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-            or os.environ.get("SUPABASE_KEY")
-        )
-        if url and key:
-            _client = create_client(url, key)
-            return _client
-    except Exception:
-        pass
-    return None
+def get_client(url: str | None, key: str | None) -> Any | None:
+    """Shared Supabase client for (url, key), created on first use. None if unavailable."""
+    if not url or not key:
+        return None
+    client = _clients.get((url, key))
+    if client is not None:
+        return client
+    with _clients_lock:
+        if (url, key) not in _clients:
+            try:
+                from supabase.client import create_client
+                _clients[(url, key)] = create_client(url, key)
+            except Exception:
+                return None
+        return _clients[(url, key)]
+
+
+def _get_client() -> Any | None:
+    """Lazy platform hub client. Returns None if not configured."""
+    url = os.environ.get("PLATFORM_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
+    key = (
+        os.environ.get("PLATFORM_SUPABASE_ANON_KEY")
+        or os.environ.get("SUPABASE_ANON_KEY")
+        or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        or os.environ.get("SUPABASE_KEY")
+    )
+    return get_client(url, key)
 
 
-def insert_platform_session(app_name: str, session_id: str | None = None, **kwargs) -> str | None:
+def insert_platform_session(app_name: str, session_id: str | None = None, **kwargs: Any) -> str | None:
     """Insert a row into platform_sessions. Returns UUID string or None."""
     client = _get_client()
     if not client:
@@ -61,7 +72,7 @@ def insert_cross_app_finding(
     description: str | None = None,
     severity: str = "medium",
     session_id: str | None = None,
-    **kwargs,
+    **kwargs: Any,
 ) -> str | None:
     """Insert a row into cross_app_findings. Returns UUID string or None."""
     client = _get_client()
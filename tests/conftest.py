@@ -0,0 +1,118 @@
+"""
+Shared fixtures — in-memory hedis_portfolio database for the data layer tests.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+_FIXTURE_SQL = [
+    """CREATE TABLE hedis_measures (measure_id TEXT PRIMARY KEY, measure_name TEXT)""",
+    """CREATE TABLE intervention_activities (activity_id INTEGER PRIMARY KEY, activity_name TEXT)""",
+    """CREATE TABLE member_interventions (
+        intervention_id INTEGER PRIMARY KEY, member_id TEXT, measure_id TEXT,
+        activity_id INTEGER, intervention_date TEXT, status TEXT, cost_per_intervention REAL
+    )""",
+    """INSERT INTO hedis_measures VALUES ('CBP', 'Controlling Blood Pressure'),
+                                         ('BCS', 'Breast Cancer Screening')""",
+    """INSERT INTO intervention_activities VALUES (1, 'Phone Outreach'), (2, 'Home Visit')""",
+    """CREATE TABLE budget_allocations (
+        measure_id TEXT, period_start TEXT, period_end TEXT, budget_amount REAL
+    )""",
+    """CREATE TABLE actual_spending (measure_id TEXT, spending_date TEXT, amount_spent REAL)""",
+    """INSERT INTO budget_allocations VALUES ('CBP', '2024-10-01', '2024-12-31', 500),
+                                             ('BCS', '2024-10-01', '2024-12-31', 300)""",
+    """INSERT INTO actual_spending VALUES ('CBP', '2024-10-15', 275), ('CBP', '2024-11-20', 300),
+                                          ('BCS', '2024-11-02', 120)""",
+    """CREATE TABLE gaps (gap_id INTEGER PRIMARY KEY, member_id TEXT, gap_status TEXT)""",
+    """INSERT INTO gaps (member_id, gap_status) VALUES ('M001', 'open'), ('M002', 'closed')""",
+]
+
+
+def _intervention_rows():
+    rows = []
+    for i in range(40):
+        rows.append(
+            {
+                "intervention_id": i + 1,
+                "member_id": f"M{i % 13:03d}",
+                "measure_id": "CBP" if i % 3 else "BCS",
+                "activity_id": 1 if i % 4 else 2,
+                "intervention_date": f"2024-{10 + i % 3:02d}-{1 + i % 28:02d}",
+                "status": "completed" if i % 5 < 3 else "pending",
+                "cost_per_intervention": 10.0 + (i % 7) * 15.0,
+            }
+        )
+    return rows
+
+
+@pytest.fixture
+def intervention_rows():
+    """The member_interventions rows seeded into portfolio_db."""
+    return _intervention_rows()
+
+
+@pytest.fixture
+def portfolio_db(monkeypatch):
+    """Seed an in-memory hedis_portfolio and point data.db at it."""
+    from data import db
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        for stmt in _FIXTURE_SQL:
+            conn.execute(text(stmt))
+        conn.execute(
+            text(
+                "INSERT INTO member_interventions VALUES (:intervention_id, :member_id, "
+                ":measure_id, :activity_id, :intervention_date, :status, :cost_per_intervention)"
+            ),
+            _intervention_rows(),
+        )
+    monkeypatch.setattr(db, "_engine", engine)
+    monkeypatch.setattr(db, "_db_type", "sqlite")
+    monkeypatch.setattr(db, "_write_engine", None)
+    monkeypatch.setattr(db, "_query_cache", db.QueryCache(max_entries=32, default_ttl=60))
+    yield db
+    engine.dispose()
+
+
+@pytest.fixture
+def postgres_db():
+    """The same fixture seeded into a scratch schema on TEST_POSTGRES_URL (skipped when unset)."""
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    pytest.importorskip("psycopg2")
+
+    schema = f"starguard_test_{os.getpid()}"
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        for stmt in _FIXTURE_SQL:
+            # native column types, so date_trunc and date comparisons run as in production
+            conn.execute(
+                text(
+                    stmt.replace("_date TEXT", "_date DATE")
+                    .replace("gap_id INTEGER PRIMARY KEY", "gap_id SERIAL PRIMARY KEY")
+                    .replace(
+                        "period_start TEXT, period_end TEXT", "period_start DATE, period_end DATE"
+                    )
+                    .replace(" REAL", " DOUBLE PRECISION")
+                )
+            )
+        conn.execute(
+            text(
+                "INSERT INTO member_interventions VALUES (:intervention_id, :member_id, "
+                ":measure_id, :activity_id, CAST(:intervention_date AS DATE), :status, "
+                ":cost_per_intervention)"
+            ),
+            _intervention_rows(),
+        )
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
@@ -0,0 +1,31 @@
+"""
+Background refresh scheduler — cloud_refresh.RefreshScheduler
+"""
+
+import threading
+
+
+def test_scheduler_runs_jobs_on_interval_and_on_demand():
+    """refresh_now() wakes the thread; jobs otherwise wait out their interval."""
+    from cloud_refresh import RefreshScheduler
+
+    ran = threading.Event()
+    sched = RefreshScheduler(interval=3600)
+    sched.register("job", ran.set)
+    sched.start()
+    assert not ran.wait(0.2)
+    sched.refresh_now("job")
+    assert ran.wait(5)
+    assert sched.status()["job"]["runs"] == 1
+
+
+def test_failed_job_is_reported_not_raised():
+    from cloud_refresh import RefreshScheduler
+
+    def _boom():
+        raise RuntimeError("APIError: [503]")
+
+    sched = RefreshScheduler(interval=3600)
+    sched.register("job", _boom, interval=0)
+    assert sched.run_pending() == 1
+    assert sched.status()["job"]["error"] == "APIError: [503]"
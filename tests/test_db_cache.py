@@ -0,0 +1,111 @@
+"""
+Query result cache — data.db.query() / execute()
+Uses an in-memory SQLite engine; no live DB calls.
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """Point data.db at an in-memory SQLite engine with a fresh cache."""
+    from data import db
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE member_interventions (id INTEGER, status TEXT)"))
+        conn.execute(text("CREATE TABLE hedis_measures (measure_id TEXT)"))
+        conn.execute(text("INSERT INTO member_interventions VALUES (1, 'completed')"))
+        conn.execute(text("INSERT INTO hedis_measures VALUES ('CBP')"))
+    monkeypatch.setattr(db, "_engine", engine)
+    monkeypatch.setattr(db, "_db_type", "sqlite")
+    monkeypatch.setattr(db, "_write_engine", None)
+    monkeypatch.setattr(db, "_query_cache", db.QueryCache(max_entries=4, default_ttl=60))
+    yield db
+    engine.dispose()
+
+
+def test_query_cache_hit_on_whitespace_variant(memory_db):
+    """Equivalent SQL differing only in whitespace shares one cache entry."""
+    memory_db.query("SELECT * FROM member_interventions")
+    memory_db.query("  SELECT *\n  FROM member_interventions ; ")
+    s = memory_db.cache_stats()
+    assert s["misses"] == 1
+    assert s["hits"] == 1
+
+
+def test_query_cache_returns_copy(memory_db):
+    """Mutating a returned frame does not alter the cached result."""
+    df = memory_db.query("SELECT * FROM member_interventions")
+    df["status"] = "changed"
+    again = memory_db.query("SELECT * FROM member_interventions")
+    assert again["status"].iloc[0] == "completed"
+
+
+def test_query_cache_params_are_part_of_key(memory_db):
+    """Different bound params produce different entries."""
+    sql = "SELECT * FROM member_interventions WHERE id = :id"
+    assert len(memory_db.query(sql, {"id": 1})) == 1
+    assert len(memory_db.query(sql, {"id": 2})) == 0
+    assert memory_db.cache_stats()["size"] == 2
+
+
+def test_execute_invalidates_dependent_entries_only(memory_db):
+    """A write to member_interventions evicts its readers, not other tables."""
+    memory_db.query("SELECT * FROM member_interventions")
+    memory_db.query("SELECT * FROM hedis_measures")
+    memory_db.execute("INSERT INTO member_interventions VALUES (2, 'pending')")
+    assert memory_db.cache_stats()["size"] == 1
+    assert len(memory_db.query("SELECT * FROM member_interventions")) == 2
+
+
+def test_query_cache_ttl_expiry(monkeypatch, memory_db):
+    """Entries past their TTL are treated as misses."""
+    clock = [1000.0]
+    monkeypatch.setattr(memory_db.time, "monotonic", lambda: clock[0])
+    memory_db.query("SELECT * FROM hedis_measures", ttl=5)
+    clock[0] += 10
+    memory_db.query("SELECT * FROM hedis_measures", ttl=5)
+    assert memory_db.cache_stats()["hits"] == 0
+
+
+def test_query_cache_lru_bound():
+    """Cache never grows past max_entries; least recently used goes first."""
+    from data.db import QueryCache
+
+    cache = QueryCache(max_entries=2, default_ttl=60)
+    df = pd.DataFrame({"a": [1]})
+    for sql in ("SELECT 1", "SELECT 2"):
+        cache.put(cache.make_key(sql), df, frozenset())
+    cache.get(cache.make_key("SELECT 1"))
+    cache.put(cache.make_key("SELECT 3"), df, frozenset())
+    assert cache.get(cache.make_key("SELECT 2")) is None
+    assert cache.get(cache.make_key("SELECT 1")) is not None
+
+
+def test_query_async_runs_off_loop_and_shares_cache(memory_db):
+    """query_async() reads on the DB thread pool and fills the same cache as query()."""
+    import asyncio
+    import threading
+
+    seen = []
+
+    def _spy(*args, **kwargs):
+        seen.append(threading.current_thread().name)
+        return memory_db.query(*args, **kwargs)
+
+    async def _load():
+        df = await memory_db.query_async("SELECT * FROM member_interventions")
+        thread = await memory_db.run_in_db_executor(_spy, "SELECT * FROM member_interventions")
+        return df, thread
+
+    df, again = asyncio.run(_load())
+    assert df["status"].tolist() == ["completed"]
+    assert again.equals(df)
+    assert seen[0].startswith("db-query")
+    assert memory_db.cache_stats()["hits"] == 1
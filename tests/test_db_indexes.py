@@ -0,0 +1,45 @@
+"""
+Index advisor — data.indexes against the in-memory hedis_portfolio fixture.
+"""
+
+
+def test_missing_indexes_reports_unindexed_dashboard_columns(portfolio_db):
+    """Fresh fixture has no secondary indexes, so every applicable spec is missing."""
+    from data.indexes import missing_indexes
+
+    names = {s["name"] for s in missing_indexes()}
+    assert "idx_mi_date_cover" in names
+    assert "idx_gaps_member_status" in names
+    assert "idx_budget_period" in names
+
+
+def test_dry_run_creates_nothing(portfolio_db):
+    """--dry-run lists CREATE INDEX statements without executing them."""
+    from data.indexes import bootstrap_indexes, missing_indexes
+
+    before = len(missing_indexes())
+    r = bootstrap_indexes(dry_run=True)
+    assert len(r["planned"]) == before
+    assert all(sql.startswith("CREATE INDEX IF NOT EXISTS") for sql in r["planned"])
+    assert len(missing_indexes()) == before
+
+
+def test_bootstrap_creates_indexes_and_changes_plans(portfolio_db):
+    """After bootstrap, nothing is missing and the ROI scan becomes a covering range search."""
+    from data.indexes import bootstrap_indexes, missing_indexes
+
+    r = bootstrap_indexes(explain=True)
+    assert not r["failed"]
+    assert missing_indexes() == []
+    before = " ".join(r["plans_before"]["roi_by_measure"])
+    after = " ".join(r["plans_after"]["roi_by_measure"])
+    assert "SCAN mi" in before
+    assert "SEARCH mi USING COVERING INDEX idx_mi_" in after
+
+
+def test_bootstrap_is_idempotent(portfolio_db):
+    """A second run finds nothing to create."""
+    from data.indexes import bootstrap_indexes
+
+    bootstrap_indexes()
+    assert bootstrap_indexes()["created"] == []
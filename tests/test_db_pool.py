@@ -0,0 +1,78 @@
+"""
+Backend detection, pool warm-up and pool statistics — data.db
+Uses a temporary SQLite file; no live DB calls.
+"""
+
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def fresh_db(monkeypatch, tmp_path):
+    """data.db with no engine yet, pointed at an empty SQLite file."""
+    from data import db
+
+    path = tmp_path / "hedis_portfolio.db"
+    path.touch()
+    monkeypatch.setattr(db, "get_sqlite_path", lambda: str(path))
+    monkeypatch.setattr(db, "_engine", None)
+    monkeypatch.setattr(db, "_db_type", None)
+    monkeypatch.setattr(db, "_write_engine", None)
+    monkeypatch.setattr(db, "_warmed", 0)
+    monkeypatch.setattr(db, "_pool_wait", {"checkouts": 0, "total_s": 0.0, "max_s": 0.0})
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    yield db
+    for engine in (db._engine, db._write_engine):
+        if engine is not None:
+            engine.dispose()
+
+
+def test_concurrent_first_use_builds_one_engine(fresh_db):
+    """Sessions racing on first use share a single engine."""
+    engines = []
+    threads = [
+        threading.Thread(target=lambda: engines.append(fresh_db.get_engine())) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(e) for e in engines}) == 1
+
+
+def test_warm_pool_fills_pool_and_reports_stats(fresh_db):
+    """warm_pool() opens pool_size connections and returns them; pool_stats() reflects it."""
+    assert fresh_db.warm_pool() == 3
+    stats = fresh_db.pool_stats()
+    assert stats["db_type"] == "sqlite"
+    assert stats["pool_size"] == 3
+    assert stats["max_overflow"] == 2
+    assert stats["checked_in"] == 3
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] >= 3
+    assert stats["max_wait_ms"] >= stats["avg_wait_ms"] >= 0
+
+
+def test_tuned_sqlite_reads_read_only_and_writes_through_wal_writer(fresh_db):
+    """Tuned profile: WAL file, read-only read pool, execute() goes through the writer."""
+    from sqlalchemy import text
+
+    fresh_db.execute("CREATE TABLE gaps (member_id TEXT, gap_status TEXT)")
+    fresh_db.execute("INSERT INTO gaps VALUES ('M1', 'open')")
+    assert fresh_db.get_write_engine() is not fresh_db.get_engine()
+
+    with fresh_db.get_engine().connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -65536
+        with pytest.raises(Exception, match="readonly"):
+            conn.execute(text("INSERT INTO gaps VALUES ('M2', 'open')"))
+    assert fresh_db.query("SELECT COUNT(*) AS n FROM gaps")["n"].iloc[0] == 1
+
+
+def test_untuned_sqlite_uses_one_engine(fresh_db, monkeypatch):
+    """SQLITE_TUNED=0 keeps the single read-write engine."""
+    monkeypatch.setenv("SQLITE_TUNED", "0")
+    assert fresh_db.get_write_engine() is fresh_db.get_engine()
@@ -0,0 +1,65 @@
+"""
+Batch star-rating engine — compound_framework.financial_impact
+The vectorized functions must agree with the scalar cut-point ladders.
+"""
+
+import numpy as np
+import pytest
+
+from compound_framework.financial_impact import (
+    STAR_CUTPOINTS,
+    calculate_measure_stars,
+    calculate_measure_stars_batch,
+    calculate_overall_star_rating,
+    calculate_overall_star_rating_batch,
+)
+
+MEASURES = list(STAR_CUTPOINTS) + ["UNKNOWN"]
+
+
+def test_measure_stars_batch_matches_scalar_on_cutpoints_and_random_rates():
+    edges = [c for cuts in STAR_CUTPOINTS.values() for c in cuts.values()]
+    rates = np.concatenate([edges, np.nextafter(edges, 0), np.random.default_rng(7).random(200)])
+    grid = np.broadcast_to(rates[:, None], (len(rates), len(MEASURES)))
+
+    stars = calculate_measure_stars_batch(MEASURES, grid)
+
+    expected = [[calculate_measure_stars(m, r) for m in MEASURES] for r in rates]
+    np.testing.assert_array_equal(stars, expected)
+
+
+def test_overall_batch_matches_scalar_per_contract():
+    rng = np.random.default_rng(11)
+    rates = rng.uniform(0.1, 1.0, size=(300, len(MEASURES)))
+
+    batch = calculate_overall_star_rating_batch(MEASURES, rates)
+
+    for i in range(0, 300, 17):
+        scalar = calculate_overall_star_rating(
+            [{"measure_id": m, "rate": r} for m, r in zip(MEASURES, rates[i])]
+        )
+        assert batch["overall_rating"][i] == scalar["overall_rating"]
+        assert batch["weighted_score"][i] == pytest.approx(scalar["weighted_score"])
+
+
+def test_overall_batch_scores_scenarios_and_skips_unreported():
+    measures = ["GSD", "BCS", "HEI"]
+    rates = np.array([[[0.95, 0.80, 0.10], [0.95, np.nan, np.nan]], [[np.nan] * 3, [0.5] * 3]])
+
+    out = calculate_overall_star_rating_batch(measures, rates)
+
+    assert out["overall_rating"].shape == (2, 2)
+    assert out["overall_rating"][0, 0] == 5.0
+    assert out["total_measures"][0, 1] == 1
+    assert out["overall_rating"][1, 0] == 0.0
+    with pytest.raises(ValueError):
+        calculate_overall_star_rating_batch(measures, rates[..., :2])
+
+
+def test_measure_stars_batch_accepts_elementwise_measure_ids():
+    measures = np.array(["GSD", "HEI", "GSD", "NOPE"])
+    rates = np.array([0.91, 0.19, 0.59, 0.5])
+
+    stars = calculate_measure_stars_batch(measures, rates)
+
+    np.testing.assert_array_equal(stars, [5.0, 3.0, 1.0, 3.0])
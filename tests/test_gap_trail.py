@@ -0,0 +1,507 @@
+"""
+HEDIS gap trail local replica — hedis_gap_trail.HedisGapDB
+An in-memory stand-in for the gspread worksheet counts API calls.
+No live Sheets/Supabase calls.
+"""
+
+import re
+
+import pytest
+
+from hedis_gap_trail import HEDIS_COLUMNS
+
+
+class FakeSheet:
+    """Minimal gspread.Worksheet: values are a list of rows, header first."""
+
+    def __init__(self, rows=None):
+        self.values = [list(HEDIS_COLUMNS)] + [list(r) for r in rows or []]
+        self.calls: dict[str, int] = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def row_values(self, i):
+        return self.values[i - 1] if i <= len(self.values) else []
+
+    def get_all_values(self):
+        self._count("get_all_values")
+        return [list(r) for r in self.values]
+
+    def batch_get(self, ranges):
+        self._count("batch_get")
+        out = []
+        for rng in ranges:
+            c1, r1, c2, r2 = re.fullmatch(r"([A-Z]+)(\d+):([A-Z]+)(\d*)", rng).groups()
+            lo, hi = ord(c1) - 65, ord(c2) - 64
+            rows = self.values[int(r1) - 1 : int(r2) if r2 else None]
+            out.append([r[lo:hi] for r in rows])
+        return out
+
+    def append_rows(self, rows):
+        self._count("append_rows")
+        first = len(self.values) + 1
+        self.values += [[str(v) for v in row] for row in rows]
+        return {"updates": {"updatedRange": f"Sheet1!A{first}:O{len(self.values)}"}}
+
+    def batch_update(self, data):
+        self._count("batch_update")
+        for d in data:
+            col, row = re.fullmatch(r"([A-Z]+)(\d+)", d["range"]).groups()
+            self.values[int(row) - 1][ord(col) - 65] = d["values"][0][0]
+
+    def find(self, _):
+        raise AssertionError("replica lookups should not call sheet.find")
+
+
+def _row(gap_id, status="OPEN", measure="CBP", ts="2026-01-05 09:00:00"):
+    row = [""] * len(HEDIS_COLUMNS)
+    values = {
+        "gap_id": gap_id,
+        "timestamp": ts,
+        "member_id": "M1",
+        "measure_code": measure,
+        "measure_name": "Controlling Blood Pressure",
+        "gap_status": status,
+        "star_impact": "3",
+        "roi_estimate": "250",
+        "last_updated": ts,
+    }
+    for k, v in values.items():
+        row[HEDIS_COLUMNS.index(k)] = v
+    return row
+
+
+@pytest.fixture
+def gap_db(monkeypatch):
+    """HedisGapDB connected to a FakeSheet with two existing gaps."""
+    import hedis_gap_trail
+
+    sheet = FakeSheet([_row("GAP-A"), _row("GAP-B", status="CLOSED", ts="2026-01-06 09:00:00")])
+
+    def _connect(self):
+        self.sheet = sheet
+        self.connected = True
+        self.sync(full=True)
+
+    monkeypatch.setattr(hedis_gap_trail.HedisGapDB, "_connect", _connect)
+    monkeypatch.setattr(hedis_gap_trail, "_push_gap_to_supabase", lambda row: None)
+    monkeypatch.setattr(hedis_gap_trail, "suppressed_gap_ids", lambda: frozenset())
+    return hedis_gap_trail.HedisGapDB()
+
+
+def test_reads_are_served_from_replica(gap_db):
+    """Summary and table renders reuse one download instead of one per call."""
+    from hedis_gap_trail import fetch_gap_summary, fetch_hedis_gaps
+
+    for _ in range(3):
+        summary = fetch_gap_summary(gap_db)
+        table = fetch_hedis_gaps(gap_db, n=15)
+    assert summary["total"] == 2 and summary["open"] == 1 and summary["closed"] == 1
+    assert table["gap_id"].tolist() == ["GAP-B", "GAP-A"]
+    assert gap_db.sheet.calls == {"get_all_values": 1}
+
+
+def test_push_and_close_write_through_replica(gap_db):
+    """A pushed gap is readable at once and closes by row without sheet.find()."""
+    from hedis_gap_trail import close_hedis_gap, fetch_hedis_gaps, gap_write_status, push_hedis_gap
+
+    r = push_hedis_gap(gap_db, {"member_id": "M9", "measure_code": "COL"})
+    assert r["success"]
+    assert r["gap_id"] in fetch_hedis_gaps(gap_db, n=15)["gap_id"].tolist()
+    assert gap_write_status(gap_db, r["ticket"])["status"] in ("queued", "done")
+
+    assert gap_db.write_queue().flush(timeout=5)
+    assert gap_write_status(gap_db, r["ticket"]) == {"status": "done", "error": None, "rows": [4]}
+    assert gap_db.find_row(r["gap_id"]) == 4
+
+    c = close_hedis_gap(gap_db, r["gap_id"])
+    assert c["success"]
+    assert gap_db.write_queue().flush(timeout=5)
+    status_col = HEDIS_COLUMNS.index("gap_status")
+    assert gap_db.sheet.values[3][status_col] == "CLOSED"
+    closed = fetch_hedis_gaps(gap_db, n=15, filter_status="CLOSED")["gap_id"].tolist()
+    assert r["gap_id"] in closed
+    assert gap_db.sheet.calls.get("get_all_values") == 1
+
+
+def test_close_follows_a_row_moved_in_the_sheet_ui(gap_db):
+    """A row inserted above the gap makes the guard re-read; the other member's gap is untouched."""
+    from hedis_gap_trail import close_hedis_gap, gap_write_status
+
+    status_col = HEDIS_COLUMNS.index("gap_status")
+    gap_db.sheet.values.insert(1, _row("GAP-Z"))  # GAP-A moves from row 2 to row 3
+
+    c = close_hedis_gap(gap_db, "GAP-A")
+    assert gap_db.write_queue().flush(timeout=5)
+    assert gap_write_status(gap_db, c["ticket"])["rows"] == [3]
+    assert [r[status_col] for r in gap_db.sheet.values[1:3]] == ["OPEN", "CLOSED"]
+    assert gap_db.find_row("GAP-A") == 3
+    assert gap_db.sheet.calls["get_all_values"] == 2
+
+
+def test_close_of_a_queued_gap_waits_for_its_append(gap_db, monkeypatch):
+    """Closing before the append lands queues the close behind it instead of flushing inline."""
+    from hedis_gap_trail import close_hedis_gap, fetch_gap_summary, push_hedis_gap
+
+    monkeypatch.setattr("sheets_write_queue.FLUSH_INTERVAL", 60.0)
+    r = push_hedis_gap(gap_db, {"member_id": "M9", "measure_code": "COL"})
+    c = close_hedis_gap(gap_db, r["gap_id"])
+    assert c["success"]
+    assert "append_rows" not in gap_db.sheet.calls
+    assert fetch_gap_summary(gap_db)["closed"] == 2
+
+    assert gap_db.write_queue().flush(timeout=5)
+    status_col = HEDIS_COLUMNS.index("gap_status")
+    assert gap_db.sheet.values[3][0] == r["gap_id"]
+    assert gap_db.sheet.values[3][status_col] == "CLOSED"
+    assert gap_db.sheet.calls["get_all_values"] == 1
+    assert not close_hedis_gap(gap_db, "GAP-NOPE")["success"]
+
+
+def test_queued_writes_coalesce_into_one_call_each(gap_db, monkeypatch):
+    """Many pushes -> one append_rows; many closes -> one batch_update."""
+    import hedis_gap_trail
+    from hedis_gap_trail import close_hedis_gap, fetch_gap_summary, push_hedis_gap
+
+    ids = iter(f"GAP-BULK-{i:03d}" for i in range(50))
+    monkeypatch.setattr(hedis_gap_trail, "_new_gap_id", lambda now: next(ids))
+    monkeypatch.setattr("sheets_write_queue.FLUSH_INTERVAL", 60.0)
+    results = [
+        push_hedis_gap(gap_db, {"member_id": f"M{i}", "measure_code": "CBP"}) for i in range(50)
+    ]
+    assert gap_db.write_queue().flush(timeout=5)
+    for r in results[:3]:
+        assert close_hedis_gap(gap_db, r["gap_id"])["success"]
+    assert gap_db.write_queue().flush(timeout=5)
+
+    assert gap_db.sheet.calls["append_rows"] == 1
+    assert gap_db.sheet.calls["batch_update"] == 1
+    assert len(gap_db.sheet.values) == 1 + 2 + 50
+    assert fetch_gap_summary(gap_db)["closed"] == 1 + 3
+
+
+def test_quota_error_backs_off_and_retries(gap_db, monkeypatch):
+    """A 429 requeues the batch; it lands on the next attempt."""
+    import sheets_write_queue
+    from hedis_gap_trail import gap_write_status, push_hedis_gap
+
+    monkeypatch.setattr(sheets_write_queue, "MAX_BACKOFF", 0.01)
+    real_append = gap_db.sheet.append_rows
+    calls = []
+
+    def _flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("APIError: [429]: Quota exceeded for quota metric 'Write requests'")
+        return real_append(rows)
+
+    monkeypatch.setattr(gap_db.sheet, "append_rows", _flaky)
+    r = push_hedis_gap(gap_db, {"member_id": "M9", "measure_code": "COL"})
+    assert gap_db.write_queue().flush(timeout=5)
+    assert gap_write_status(gap_db, r["ticket"])["status"] == "done"
+    assert len(calls) == 2
+    assert gap_db.write_queue().stats["retries"] == 1
+
+
+def test_oversized_append_is_split_at_max_batch_rows(gap_db, monkeypatch):
+    """One 7-row item goes out as 3 + 3 + 1 rows; its ticket reports all 7 sheet rows."""
+    monkeypatch.setattr("sheets_write_queue.MAX_BATCH_ROWS", 3)
+    sizes = []
+    real_append = gap_db.sheet.append_rows
+    monkeypatch.setattr(
+        gap_db.sheet, "append_rows", lambda rows: sizes.append(len(rows)) or real_append(rows)
+    )
+
+    queue = gap_db.write_queue()
+    tid = queue.append([_row(f"GAP-S{i}") for i in range(7)])
+    assert queue.flush(timeout=5)
+    assert sizes == [3, 3, 1]
+    assert queue.ticket(tid) == {"status": "done", "error": None, "rows": list(range(4, 11))}
+
+
+def test_ambiguous_append_error_does_not_duplicate_rows(gap_db, monkeypatch):
+    """A timeout after the rows landed is reconciled by gap_id instead of re-appending."""
+    import sheets_write_queue
+
+    monkeypatch.setattr(sheets_write_queue, "MAX_BACKOFF", 0.01)
+    real_append = gap_db.sheet.append_rows
+    calls = []
+
+    def _lands_then_times_out(rows):
+        calls.append(len(rows))
+        response = real_append(rows)
+        if len(calls) == 1:
+            raise TimeoutError("The read operation timed out")
+        return response
+
+    monkeypatch.setattr(gap_db.sheet, "append_rows", _lands_then_times_out)
+    queue = gap_db.write_queue()
+    first = queue.append([_row("GAP-T1"), _row("GAP-T2")])
+    assert queue.flush(timeout=5)
+    second = queue.append([_row("GAP-T3")])
+    assert queue.flush(timeout=5)
+
+    assert [r[0] for r in gap_db.sheet.values[1:]] == [
+        "GAP-A",
+        "GAP-B",
+        "GAP-T1",
+        "GAP-T2",
+        "GAP-T3",
+    ]
+    assert calls == [2, 1]
+    assert queue.ticket(first)["rows"] == [4, 5] and queue.ticket(second)["rows"] == [6]
+
+
+def test_ambiguous_append_error_without_key_fails_instead_of_retrying():
+    """Without key_col a non-quota append error is final: no blind resend."""
+    from sheets_write_queue import SheetWriteQueue
+
+    sheet = FakeSheet()
+    calls = []
+
+    def _timeout(rows):
+        calls.append(rows)
+        raise TimeoutError("The read operation timed out")
+
+    sheet.append_rows = _timeout
+    queue = SheetWriteQueue(sheet, "no-key")
+    tid = queue.append([_row("GAP-X")])
+    assert queue.flush(timeout=5)
+    assert queue.ticket(tid)["status"] == "failed" and len(calls) == 1
+
+
+def test_failed_append_rolls_back_replica(gap_db, monkeypatch):
+    """A permanent Sheets error leaves no phantom gap in the replica."""
+    from hedis_gap_trail import fetch_gap_summary, gap_write_status, push_hedis_gap
+
+    def _broken(rows):
+        raise RuntimeError("permission denied")
+
+    monkeypatch.setattr("sheets_write_queue.MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(gap_db.sheet, "append_rows", _broken)
+    r = push_hedis_gap(gap_db, {"member_id": "M9", "measure_code": "COL"})
+    assert fetch_gap_summary(gap_db)["total"] == 3  # visible while queued
+    assert gap_db.write_queue().flush(timeout=5)
+    assert gap_write_status(gap_db, r["ticket"])["status"] == "failed"
+    assert fetch_gap_summary(gap_db)["total"] == 2
+
+
+def test_delta_pull_reconciles_external_edits(gap_db):
+    """Rows appended and statuses changed by other writers arrive in one batch_get."""
+    from hedis_gap_trail import fetch_gap_summary
+
+    status_col = HEDIS_COLUMNS.index("gap_status")
+    gap_db.sheet.values.append(_row("GAP-C", ts="2026-01-07 09:00:00"))
+    gap_db.sheet.values[1][status_col] = "EXCLUDED"
+
+    gap_db.sync(force=True)
+    summary = fetch_gap_summary(gap_db)
+    assert summary["total"] == 3
+    assert summary["open"] == 1  # GAP-C; GAP-A is now EXCLUDED
+    assert gap_db.sheet.calls == {"get_all_values": 1, "batch_get": 1}
+
+
+def test_delta_pull_reloads_after_the_sheet_is_sorted(gap_db):
+    """Sorting the Sheet moves statuses to other rows; the replica stays keyed by gap_id."""
+    from hedis_gap_trail import fetch_hedis_gaps
+
+    status_col = HEDIS_COLUMNS.index("gap_status")
+    gap_db.sheet.values[1:] = gap_db.sheet.values[1:][::-1]  # GAP-B, then GAP-A
+    gap_db.sheet.values[2][status_col] = "EXCLUDED"  # GAP-A, now on row 3
+
+    gap_db.sync(force=True)
+    status = dict(zip(*fetch_hedis_gaps(gap_db, n=15)[["gap_id", "gap_status"]].T.values))
+    assert status == {"GAP-A": "EXCLUDED", "GAP-B": "CLOSED"}
+    assert gap_db.find_row("GAP-A") == 3 and gap_db.find_row("GAP-B") == 2
+    assert gap_db.sheet.calls == {"get_all_values": 2, "batch_get": 1}
+
+
+# ── Bulk import (hedis_gap_import) ───────────────────────────────────────────
+
+_CSV = """member_id,member_name,measure_code,gap_status,due_date,intervention_type,star_impact
+M10,Ann,cbp,,2026-03-01,,4
+,Bob,COL,OPEN,,Outreach,3
+M12,Cy,ZZZ,OPENED,notadate,Phone,9
+M13,Di,BCS,CLOSED,,Clinical,
+"""
+
+
+def test_validation_reports_source_rows_and_derives_measure_fields():
+    """Bad rows are rejected with every reason; good rows get names, domains and defaults."""
+    import io
+
+    import pandas as pd
+
+    from hedis_gap_import import validate_gap_chunk
+
+    chunk = pd.read_csv(io.StringIO(_CSV), dtype=str, keep_default_na=False)
+    valid, errors = validate_gap_chunk(chunk, first_row=101)
+    assert [e["row"] for e in errors] == [102, 103]
+    assert errors[0]["error"] == "missing member_id"
+    assert "unknown measure_code" in errors[1]["error"]
+    assert "star_impact" in errors[1]["error"] and "due_date" in errors[1]["error"]
+    assert valid["measure_code"].tolist() == ["CBP", "BCS"]
+    assert valid["measure_name"].tolist() == [
+        "Controlling Blood Pressure",
+        "Breast Cancer Screening",
+    ]
+    assert valid["gap_status"].tolist() == ["OPEN", "CLOSED"]
+    assert valid["intervention_type"].tolist() == ["Outreach", "Clinical"]
+    assert valid["star_impact"].tolist() == [4, 3]
+
+
+def test_bulk_import_streams_chunks_through_one_append(gap_db, tmp_path, monkeypatch):
+    """Every chunk is queued; one append_rows lands them and the replica confirms rows."""
+    import hedis_gap_import
+    from hedis_gap_trail import fetch_gap_summary
+
+    mirrored = []
+    monkeypatch.setattr(hedis_gap_import, "_push_gaps_to_supabase", mirrored.extend)
+    monkeypatch.setattr("sheets_write_queue.FLUSH_INTERVAL", 60.0)
+    path = tmp_path / "gaps.csv"
+    path.write_text(_CSV)
+
+    report = hedis_gap_import.import_gaps(gap_db, path, chunk_size=2)
+    assert report["success"]
+    assert (report["rows_read"], report["rows_imported"], report["rows_rejected"]) == (4, 2, 2)
+    assert len(report["tickets"]) == 2 and len(mirrored) == 2
+    assert fetch_gap_summary(gap_db)["total"] == 4
+
+    assert gap_db.write_queue().flush(timeout=5)
+    assert gap_db.sheet.calls["append_rows"] == 1
+    assert len(gap_db.sheet.values) == 1 + 2 + 2
+    assert [gap_db.find_row(row[0]) for row in gap_db.sheet.values[3:]] == [4, 5]
+
+
+def test_bulk_import_dry_run_and_parquet(gap_db, tmp_path):
+    """dry_run validates a Parquet file without touching the sheet."""
+    pytest.importorskip("pyarrow")
+    import io
+
+    import pandas as pd
+
+    from hedis_gap_import import import_gaps
+
+    path = tmp_path / "gaps.parquet"
+    pd.read_csv(io.StringIO(_CSV), dtype=str, keep_default_na=False).to_parquet(path)
+    report = import_gaps(gap_db, path, dry_run=True)
+    assert (report["rows_read"], report["rows_imported"], report["rows_rejected"]) == (4, 0, 2)
+    assert "append_rows" not in gap_db.sheet.calls
+    assert gap_db.write_queue().pending() == 0
+
+
+def test_import_cli_fails_when_queued_batches_do_not_land(gap_db, tmp_path, monkeypatch, capsys):
+    """A batch that fails after queuing makes the CLI report [ERROR] and exit 1."""
+    import hedis_gap_import
+
+    def _broken(rows):
+        raise RuntimeError("permission denied")
+
+    monkeypatch.setattr(hedis_gap_import, "HedisGapDB", lambda: gap_db)
+    monkeypatch.setattr(hedis_gap_import, "_push_gaps_to_supabase", lambda rows: None)
+    monkeypatch.setattr("sheets_write_queue.MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(gap_db.sheet, "append_rows", _broken)
+    path = tmp_path / "gaps.csv"
+    path.write_text(_CSV)
+
+    assert hedis_gap_import.main([str(path)]) == 1
+    out = capsys.readouterr().out
+    assert "[ERROR]" in out and "permission denied" in out
+
+
+# ── Supabase mirror ──────────────────────────────────────────────────────────
+
+
+def test_supabase_mirror_batches_in_background_on_one_client(monkeypatch):
+    """Pushes return at once; queued rows share insert() calls on a single cached client."""
+    import threading
+
+    import hedis_gap_trail
+    import supabase_platform
+
+    created, inserts = [], []
+    gate = threading.Event()
+
+    class FakeClient:
+        def table(self, name):
+            return self
+
+        def insert(self, records):
+            gate.wait(5)
+            inserts.append(records)
+            return self
+
+        def execute(self):
+            return None
+
+    def _create(url, key):
+        created.append((url, key))
+        return FakeClient()
+
+    monkeypatch.setenv("SUPABASE_URL", "https://mirror.test")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "anon")
+    monkeypatch.setattr(supabase_platform, "_clients", {})
+    monkeypatch.setattr("supabase.client.create_client", _create)
+    monkeypatch.setattr(hedis_gap_trail, "SUPABASE_MIRROR_BATCH", 100)
+
+    for i in range(150):
+        hedis_gap_trail._push_gap_to_supabase(_row(f"GAP-M{i:03d}"))
+    gate.set()  # first insert was held open while the rest queued
+    assert hedis_gap_trail.flush_supabase_mirror(timeout=5)
+
+    assert created == [("https://mirror.test", "anon")]
+    assert sum(len(b) for b in inserts) == 150
+    assert len(inserts) <= 3 and all(len(b) <= 100 for b in inserts)
+    assert inserts[0][0]["gap_id"] == "GAP-M000"
+
+
+# ── Paginated reads ──────────────────────────────────────────────────────────
+
+
+def test_pages_walk_the_trail_newest_first_with_cursors(gap_db):
+    """Cursor pages cover every matching gap exactly once, in id order."""
+    from hedis_gap_trail import fetch_hedis_gaps_page
+
+    gap_db.sheet.values += [
+        _row(f"GAP-P{i:03d}", status="OPEN" if i % 3 else "CLOSED") for i in range(40)
+    ]
+    gap_db.sync(full=True)
+
+    seen, after, pages = [], None, 0
+    while True:
+        page = fetch_hedis_gaps_page(gap_db, filter_status="OPEN", after=after, limit=7)
+        seen += page["rows"]["gap_id"].tolist()
+        pages += 1
+        after = page["next_cursor"]
+        if after is None:
+            break
+    expected = sorted([f"GAP-P{i:03d}" for i in range(40) if i % 3] + ["GAP-A"], reverse=True)
+    assert seen == expected
+    assert page["total"] == len(expected) and pages == 4
+
+
+def test_suppression_applies_before_the_limit(gap_db, monkeypatch):
+    """Suppressed gaps never eat into the page: n rows come back when n exist."""
+    import hedis_gap_trail
+    from hedis_gap_trail import fetch_hedis_gaps, fetch_hedis_gaps_page
+
+    gap_db.sheet.values += [_row(f"GAP-S{i:02d}") for i in range(10)]
+    gap_db.sync(full=True)
+    hidden = frozenset(f"GAP-S{i:02d}" for i in range(5, 10))  # the five newest
+    monkeypatch.setattr(hedis_gap_trail, "suppressed_gap_ids", lambda: hidden)
+
+    rows = fetch_hedis_gaps(gap_db, n=5)
+    assert rows["gap_id"].tolist() == [f"GAP-S{i:02d}" for i in range(4, -1, -1)]
+    assert fetch_hedis_gaps_page(gap_db, limit=5)["total"] == 7
+
+
+def test_page_index_rebuilds_after_writes(gap_db):
+    """A pushed gap shows on the first page without waiting for a sync."""
+    from hedis_gap_trail import fetch_hedis_gaps_page, push_hedis_gap
+
+    assert fetch_hedis_gaps_page(gap_db, filter_measure="COL", limit=1)["total"] == 0
+    r = push_hedis_gap(gap_db, {"member_id": "M9", "measure_code": "COL"})
+    again = fetch_hedis_gaps_page(gap_db, filter_measure="COL", limit=1)
+    assert again["rows"]["gap_id"].tolist() == [r["gap_id"]]
+    assert fetch_hedis_gaps_page(gap_db)["total"] == 3
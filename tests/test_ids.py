@@ -0,0 +1,45 @@
+"""
+Sortable record ids — utils.ids
+"""
+
+import threading
+from datetime import datetime
+
+from utils.ids import new_id, new_ids
+
+
+def test_ids_are_unique_and_ordered_within_one_millisecond():
+    """Same timestamp, many callers: no collisions and string order is call order."""
+    now = datetime(2026, 3, 4, 10, 45, 12, 345678)
+    ids = [new_id("TST", now) for _ in range(500)] + new_ids("TST", 500, now)
+    assert len(set(ids)) == 1000
+    assert ids == sorted(ids)
+    assert ids[0].startswith("TST-20260304-104512-345")
+
+
+def test_clock_stepping_back_never_reorders():
+    """An earlier wall clock keeps extending the last id rather than going backwards."""
+    later = new_id("BACK", datetime(2026, 3, 4, 10, 0, 1))
+    earlier = new_id("BACK", datetime(2026, 3, 4, 10, 0, 0))
+    assert earlier > later
+
+
+def test_legacy_ids_sort_before_same_second_ids():
+    """Old PREFIX-YYYYMMDD-HHMMSS ids keep their place in id order."""
+    new = new_id("LEG", datetime(2026, 3, 4, 10, 45, 12))
+    assert "LEG-20260304-104511" < "LEG-20260304-104512" < new < "LEG-20260304-104513"
+
+
+def test_concurrent_generation_is_collision_free():
+    out: list[str] = []
+    now = datetime(2026, 3, 4, 10, 45, 12)
+
+    def work():
+        out.extend(new_ids("THR", 200, now))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(out)) == 1600
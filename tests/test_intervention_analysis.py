@@ -0,0 +1,264 @@
+"""
+Intervention portfolio optimizer — utils.intervention_analysis
+Exact selections are checked against brute force over the default set.
+"""
+
+import itertools
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import intervention_analysis as ia
+from utils.intervention_analysis import (
+    calculate_intervention_roi,
+    calculate_intervention_roi_frame,
+    get_default_interventions,
+    optimize_intervention_portfolio,
+    select_portfolio,
+)
+
+
+def _rows():
+    return [
+        {
+            **i,
+            **calculate_intervention_roi(
+                i["intervention_type"],
+                i["target_measure"],
+                i["expected_gap_closure"],
+                i["intervention_cost"],
+                i["member_count"],
+            ),
+        }
+        for i in get_default_interventions()
+    ]
+
+
+def _brute_force(rows, budget, values, max_per_measure=None, min_lift=0.0):
+    best = -np.inf
+    for n in range(len(rows) + 1):
+        for combo in itertools.combinations(range(len(rows)), n):
+            if sum(rows[i]["intervention_cost"] for i in combo) > budget:
+                continue
+            per_measure = Counter(rows[i]["target_measure"] for i in combo)
+            if max_per_measure and max(per_measure.values(), default=0) > max_per_measure:
+                continue
+            if sum(rows[i]["star_lift"] for i in combo) < min_lift - 1e-12:
+                continue
+            best = max(best, sum(values[i] for i in combo))
+    return best
+
+
+@pytest.mark.parametrize("budget", [25000, 60000, 100000, 150000])
+@pytest.mark.parametrize(
+    "constraints",
+    [
+        {},
+        {"max_per_measure": 1},
+        {"max_per_measure": 2},
+        {"min_star_lift": 0.2},
+        {"max_per_measure": 1, "min_star_lift": 0.2},
+    ],
+)
+def test_selection_matches_brute_force(budget, constraints):
+    rows = _rows()
+    star = np.array([r["star_rating_bonus_impact"] for r in rows])
+
+    result = select_portfolio(rows, budget, star, constraints)
+
+    expected = _brute_force(
+        rows, budget, star, constraints.get("max_per_measure"), constraints.get("min_star_lift", 0)
+    )
+    assert result["exact"]
+    assert result["feasible"] == np.isfinite(expected)
+    if result["feasible"]:
+        assert star[result["selected"]].sum() == pytest.approx(expected)
+
+
+def test_branch_and_bound_handles_channel_caps(monkeypatch):
+    monkeypatch.setattr(ia, "MAX_DP_STATES", 0)  # force the branch-and-bound path
+    rows = _rows()
+    net = np.array([r["net_roi"] for r in rows])
+
+    result = select_portfolio(
+        rows, 100000, net, {"max_per_channel": {"Member Outreach Campaign": 1}}
+    )
+
+    picked = [r for r, keep in zip(rows, result["selected"]) if keep]
+    assert result["method"] == "branch_and_bound" and result["exact"]
+    assert sum(r["intervention_type"] == "Member Outreach Campaign" for r in picked) <= 1
+    assert sum(r["intervention_cost"] for r in picked) <= 100000
+
+
+def test_portfolio_strategies_and_pareto_front():
+    result = optimize_intervention_portfolio(100000)
+
+    star_best = result["approach_1_max_star"]["total_star_rating_bonus"]
+    net_best = result["approach_2_max_roi"]["net_benefit"]
+    for approach in ("approach_1_max_star", "approach_2_max_roi", "approach_3_balanced"):
+        assert result[approach]["total_cost"] <= 100000
+        assert result[approach]["total_star_rating_bonus"] <= star_best + 1e-6
+        assert result[approach]["net_benefit"] <= net_best + 1e-6
+    front = result["pareto_front"]
+    assert front and result["solver"]["exact"]
+    for p in front:
+        assert not any(
+            q["total_star_rating_bonus"] > p["total_star_rating_bonus"]
+            and q["net_benefit"] > p["net_benefit"]
+            for q in front
+        )
+
+
+def test_dp_scales_to_thousands_of_candidates():
+    rng = np.random.default_rng(0)
+    candidates = [
+        {
+            "id": f"c{i}",
+            "intervention_type": f"Channel {i % 7}",
+            "target_measure": ["BCS", "CBP", "COL", "EED", "CDC"][i % 5],
+            "expected_gap_closure": float(rng.uniform(2, 20)),
+            "intervention_cost": float(rng.integers(5, 100) * 1000),
+            "member_count": int(rng.integers(500, 5000)),
+        }
+        for i in range(3000)
+    ]
+
+    result = optimize_intervention_portfolio(1_000_000, candidates)
+
+    assert result["solver"] == {
+        "method": "dp",
+        "exact": True,
+        "feasible": True,
+        "candidates": 3000,
+    }
+    assert result["approach_1_max_star"]["total_cost"] <= 1_000_000
+
+
+def test_dp_folds_per_measure_caps_into_thousands_of_candidates():
+    rng = np.random.default_rng(1)
+    measures = ["BCS", "CBP", "COL", "EED", "CDC"]
+    candidates = [
+        {
+            "id": f"c{i}",
+            "intervention_type": f"Channel {i % 7}",
+            "target_measure": measures[i % 5],
+            "expected_gap_closure": float(rng.uniform(2, 20)),
+            "intervention_cost": float(rng.integers(5, 100) * 1000),
+            "member_count": int(rng.integers(500, 5000)),
+        }
+        for i in range(3000)
+    ]
+
+    result = optimize_intervention_portfolio(
+        1_000_000, candidates, constraints={"max_per_measure": 4}
+    )
+
+    assert result["solver"]["method"] == "dp" and result["solver"]["exact"]
+    for approach in ("approach_1_max_star", "approach_2_max_roi", "approach_3_balanced"):
+        picked = Counter(i["target_measure"] for i in result[approach]["selected_interventions"])
+        assert max(picked.values()) <= 4
+        assert result[approach]["total_cost"] <= 1_000_000
+
+
+def test_rounded_costs_are_reported_as_inexact():
+    rows = [
+        {**r, "intervention_cost": r["intervention_cost"] + 0.37}
+        for r in get_default_interventions()
+    ]
+    result = optimize_intervention_portfolio(100000, rows)
+    assert result["solver"]["exact"] is False
+
+
+def test_cached_optimizer_shares_results_and_keys_on_inputs():
+    ia.clear_optimizer_cache()
+    hits = ia.optimizer_cache_stats()["hits"]
+    first = ia.optimize_intervention_portfolio_cached(100000)
+    again = ia.optimize_intervention_portfolio_cached(100000.0)
+    assert again == first and again is not first
+    assert first["interventions"][0]["cost_per_closure"] >= 0
+
+    subset = get_default_interventions()[:5]
+    assert ia.optimize_intervention_portfolio_cached(150000) != first
+    assert ia.optimize_intervention_portfolio_cached(100000, subset, version=1) != first
+    capped = ia.optimize_intervention_portfolio_cached(100000, constraints={"max_per_measure": 1})
+    assert capped != first
+
+    stats = ia.optimizer_cache_stats()
+    assert stats["hits"] == hits + 1 and stats["size"] == 4
+
+
+def test_cached_optimizer_returns_private_copies():
+    ia.clear_optimizer_cache()
+    mine = ia.optimize_intervention_portfolio_cached(100000)
+    mine["approach_1_max_star"]["selected_interventions"].clear()
+    mine["interventions"][0]["roi_ratio"] = -1
+    theirs = ia.optimize_intervention_portfolio_cached(100000)
+    assert theirs["approach_1_max_star"]["selected_interventions"]
+    assert theirs["interventions"][0]["roi_ratio"] != -1
+
+
+def test_cached_optimizer_keys_custom_candidates_on_version():
+    ia.clear_optimizer_cache()
+    subset = get_default_interventions()[:5]
+    ia.optimize_intervention_portfolio_cached(100000, subset)
+    assert ia.optimizer_cache_stats()["size"] == 0  # no version: solved uncached
+
+    hits = ia.optimizer_cache_stats()["hits"]
+    ia.optimize_intervention_portfolio_cached(100000, subset, version="load-1")
+    ia.optimize_intervention_portfolio_cached(100000, subset[:3], version="load-1")
+    ia.optimize_intervention_portfolio_cached(100000, subset[:3], version="load-2")
+    stats = ia.optimizer_cache_stats()
+    assert stats["hits"] == hits + 1 and stats["size"] == 2
+
+
+def test_cached_optimizer_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ia, "OPTIMIZER_CACHE_SIZE", 2)
+    ia.clear_optimizer_cache()
+    ia.optimize_intervention_portfolio_cached(50000)
+    ia.optimize_intervention_portfolio_cached(60000)
+    ia.optimize_intervention_portfolio_cached(50000)
+    ia.optimize_intervention_portfolio_cached(70000)  # evicts 60000, not 50000
+
+    assert ia.portfolio_cache_key(50000, "default", None) in ia._optimizer_cache
+    assert ia.portfolio_cache_key(60000, "default", None) not in ia._optimizer_cache
+    assert ia.optimizer_cache_stats()["size"] == 2
+
+
+def test_roi_frame_matches_scalar_roi():
+    """Every rounded field of the frame path equals the scalar result exactly."""
+    rng = np.random.default_rng(3)
+    rows = get_default_interventions() + [
+        {
+            "intervention_type": "Outreach",
+            "target_measure": ["BCS", "CBP", "COL", "EED", "HEI"][k % 5],
+            "expected_gap_closure": float(rng.uniform(0.1, 25)),
+            "intervention_cost": float(rng.integers(0, 60) * 1000 + rng.integers(0, 1000)),
+            "member_count": int(rng.integers(0, 4000)),
+        }
+        for k in range(2000)
+    ]
+
+    scored = calculate_intervention_roi_frame(pd.DataFrame(rows))
+
+    for i, row in zip(rows, scored.to_dict("records")):
+        roi = calculate_intervention_roi(
+            intervention_type=i["intervention_type"],
+            target_measure=i["target_measure"],
+            expected_gap_closure=i["expected_gap_closure"],
+            intervention_cost=i["intervention_cost"],
+            member_count=i["member_count"],
+        )
+        expected = {
+            "estimated_closures": roi["estimated_closures"],
+            "cost_per_closure": roi["cost_per_closure"],
+            "revenue_from_closures": roi["financial_impact"]["revenue_from_closures"],
+            "star_rating_bonus": roi["star_rating_bonus_impact"],
+            "financial_impact_total": roi["financial_impact"]["total"],
+            "roi_ratio": roi["roi_ratio"],
+            "net_roi": roi.get("net_roi", 0.0),
+            "star_lift": roi["star_lift"],
+            "confidence_score": roi["confidence_score"],
+        }
+        assert {k: row[k] for k in expected} == expected
@@ -0,0 +1,507 @@
+"""
+Named, parameterized queries — utils.queries registry + data.db.query()
+Dialect matrix: every query's SQLite rendering runs against an in-memory
+fixture and is compared with a pandas recomputation from the raw tables,
+and the dialect helpers are checked against the exact SQL they emit. The
+PostgreSQL rendering only runs against a real server: set
+TEST_POSTGRES_URL to seed the same fixture there and compare every column.
+"""
+
+import time
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+
+def test_builders_emit_constant_sql_text():
+    """Different date ranges bind different values but share one SQL text."""
+    from utils.queries import get_cost_per_closure_by_activity_query
+
+    a = get_cost_per_closure_by_activity_query("2024-01-01", "2024-03-31")
+    b = get_cost_per_closure_by_activity_query("2024-04-01", "2024-06-30", min_uses=2)
+    assert a.text == b.text
+    assert "2024" not in a.text
+    assert b.compile().params["min_uses"] == 2
+
+
+def test_every_builder_is_registered():
+    """Each builder's SQL resolves back to a registry name."""
+    from utils import queries
+
+    builders = [
+        queries.get_roi_by_measure_query,
+        queries.get_cost_per_closure_by_activity_query,
+        queries.get_monthly_intervention_trend_query,
+        queries.get_budget_variance_by_measure_query,
+        queries.get_cost_tier_comparison_query,
+        queries.get_portfolio_summary_query,
+    ]
+    names = {queries.find_query_name(b().text) for b in builders}
+    assert names == set(queries.NAMED_QUERIES)
+
+
+def test_query_by_name_matches_builder(portfolio_db):
+    """query('name', params) and query(builder(...)) return the same frame and cache entry."""
+    from utils.queries import get_cost_per_closure_by_activity_query
+
+    params = {"start_date": "2024-10-01", "end_date": "2024-12-31", "min_uses": 1}
+    by_name = portfolio_db.query("cost_per_closure_by_activity", params)
+    by_builder = portfolio_db.query(
+        get_cost_per_closure_by_activity_query("2024-10-01", "2024-12-31", min_uses=1)
+    )
+    assert by_name.equals(by_builder)
+    assert portfolio_db.cache_stats()["hits"] == 1
+
+
+def test_unknown_query_name_raises(portfolio_db):
+    """An unregistered bare name is an error, not raw SQL."""
+    with pytest.raises(Exception, match="Unknown named query"):
+        portfolio_db.query("no_such_query")
+
+
+def test_bind_param_pattern_skips_casts():
+    """Postgres ``::type`` casts are not mistaken for bound parameters."""
+    from data.db import _BIND_PARAM_RE
+
+    sql = "SELECT x::date FROM t WHERE d >= :start_date AND d <= :end_date"
+    assert _BIND_PARAM_RE.findall(sql) == ["start_date", "end_date"]
+
+
+def test_arrow_fetch_uses_declared_schema(portfolio_db):
+    """arrow=True returns Arrow dtypes from the registry schema, same values as the default path."""
+    pa = pytest.importorskip("pyarrow")
+    from utils.queries import get_named_query
+
+    params = {"start_date": "2024-10-01", "end_date": "2024-12-31"}
+    plain = portfolio_db.query("monthly_intervention_trend", params)
+    typed = portfolio_db.query("monthly_intervention_trend", params, arrow=True)
+    schema = get_named_query("monthly_intervention_trend")["schema"]
+    assert dict(typed.dtypes) == {c: pd.ArrowDtype(getattr(pa, t)()) for c, t in schema.items()}
+    assert typed["total_interventions"].tolist() == plain["total_interventions"].tolist()
+    # Arrow and NumPy results are cached separately
+    assert portfolio_db.cache_stats()["size"] == 2
+
+
+def test_arrow_fetch_raw_sql_infers_types(portfolio_db):
+    """Raw SQL in arrow mode keeps inferred Arrow types unless a schema is given."""
+    pytest.importorskip("pyarrow")
+    sql = "SELECT measure_id, cost_per_intervention FROM member_interventions"
+    df = portfolio_db.query(sql, arrow=True, schema={"cost_per_intervention": "float32"})
+    assert str(df["measure_id"].dtype) == "string[pyarrow]"
+    assert str(df["cost_per_intervention"].dtype) == "float[pyarrow]"
+
+
+# ── Dialect matrix ───────────────────────────────────────────────────────────
+
+_SORT_KEYS = {
+    "roi_by_measure": ["measure_code"],
+    "cost_per_closure_by_activity": ["activity_name"],
+    "monthly_intervention_trend": ["month"],
+    "budget_variance_by_measure": ["measure_code"],
+    "cost_tier_comparison": ["cost_tier"],
+    "portfolio_summary": [],
+}
+_PARAMS = {"start_date": "2024-10-01", "end_date": "2024-12-31", "min_uses": 1}
+
+
+def _run(engine, name, dialect):
+    from utils.queries import get_named_query, get_named_sql
+
+    params = {k: v for k, v in _PARAMS.items() if k in get_named_query(name)["defaults"]}
+    df = pd.read_sql(text(get_named_sql(name, dialect, "base")), engine, params=params)
+    # psycopg2 returns NUMERIC as Decimal and DATE as date; SQLite gives float and text
+    for col in df.columns:
+        if df[col].map(lambda v: isinstance(v, Decimal)).any():
+            df[col] = df[col].astype(float)
+        elif df[col].map(lambda v: isinstance(v, date)).any():
+            df[col] = df[col].map(lambda v: v.isoformat() if isinstance(v, date) else v)
+    keys = _SORT_KEYS[name]
+    return df.sort_values(keys).reset_index(drop=True) if keys else df
+
+
+_DIALECT_FORMS = {
+    "count_if": (
+        ("x > 0",),
+        "SUM(CASE WHEN x > 0 THEN 1 ELSE 0 END)",
+        "COUNT(*) FILTER (WHERE x > 0)",
+    ),
+    "sum_if": (("c", "x > 0"), "SUM(CASE WHEN x > 0 THEN c END)", "SUM(c) FILTER (WHERE x > 0)"),
+    "round_to": (("c", 2), "ROUND(c, 2)", "ROUND(CAST(c AS NUMERIC), 2)"),
+    "month_key": (("d",), "strftime('%Y-%m', d)", "to_char(date_trunc('month', d), 'YYYY-MM')"),
+    "month_start": (("d",), "date(d, 'start of month')", "CAST(date_trunc('month', d) AS DATE)"),
+    "day_of": (("d",), "date(d)", "CAST(d AS DATE)"),
+}
+
+
+@pytest.mark.parametrize("helper", sorted(_DIALECT_FORMS))
+def test_dialect_helpers_emit_expected_sql(helper):
+    """Each helper renders the exact native form for both engines."""
+    from utils import sql_dialect
+
+    args, lite, pg = _DIALECT_FORMS[helper]
+    fn = getattr(sql_dialect, helper)
+    assert fn(*args, "sqlite") == lite
+    assert fn(*args, "postgres") == pg
+
+
+def test_monthly_trend_postgres_rendering_uses_month_start():
+    """The Postgres trend query buckets with date_trunc and returns month_start as a DATE."""
+    from utils.queries import get_named_sql
+
+    sql = get_named_sql("monthly_intervention_trend", "postgres", "base")
+    assert "CAST(date_trunc('month', mi.intervention_date) AS DATE) as month_start" in sql
+    assert "to_char(date_trunc('month', mi.intervention_date), 'YYYY-MM') as month" in sql
+
+
+@pytest.mark.parametrize("name", sorted(_SORT_KEYS))
+def test_dialect_renderings_agree(portfolio_db, postgres_db, name):
+    """SQLite (CASE/strftime) on SQLite and Postgres (FILTER/date_trunc) on Postgres return the same data."""
+    lite = _run(portfolio_db._engine, name, "sqlite")
+    pg = _run(postgres_db, name, "postgres")
+    assert not lite.empty
+    pd.testing.assert_frame_equal(lite, pg, check_dtype=False)
+
+
+def test_roi_by_measure_matches_pandas_reference(portfolio_db, intervention_rows):
+    """SQLite rendering of ROI by measure matches a pandas groupby over the fixture."""
+    raw = pd.DataFrame(intervention_rows)
+    done = raw[raw["status"] == "completed"]
+    expected = (
+        done.groupby("measure_id")["cost_per_intervention"].sum().round(2).sort_index().tolist()
+    )
+    got = _run(portfolio_db._engine, "roi_by_measure", "sqlite")
+    assert got["total_investment"].tolist() == expected
+    assert got["total_interventions"].sum() == len(raw)
+
+
+def test_monthly_trend_buckets_by_month(portfolio_db, intervention_rows):
+    """Monthly trend produces one row per calendar month in range."""
+    got = _run(portfolio_db._engine, "monthly_intervention_trend", "sqlite")
+    assert got["month"].tolist() == ["2024-10", "2024-11", "2024-12"]
+    assert got["month_start"].tolist() == ["2024-10-01", "2024-11-01", "2024-12-01"]
+    assert got["total_interventions"].sum() == len(intervention_rows)
+
+
+def test_postgres_rendering_has_no_sqlite_functions():
+    """Postgres SQL never uses strftime/date(..., 'start of month'); SQLite never uses FILTER."""
+    from utils.queries import NAMED_QUERIES
+
+    for entry in NAMED_QUERIES.values():
+        for variants in filter(None, (entry["sql"], entry["rollup_sql"])):
+            assert "strftime" not in variants["postgres"]
+            assert "start of month" not in variants["postgres"]
+            assert "FILTER" not in variants["sqlite"]
+            assert "date_trunc" not in variants["sqlite"]
+
+
+# ── Pandas reference for every named query (SQLite) ──────────────────────────
+
+
+def _reference(tables, name):
+    """Each registered query recomputed with pandas from the raw fixture tables."""
+    p = _PARAMS
+    mi = tables["member_interventions"]
+    mi = mi[
+        (mi["intervention_date"] >= p["start_date"]) & (mi["intervention_date"] <= p["end_date"])
+    ]
+    mi = mi.assign(
+        done=(mi["status"] == "completed").astype(int),
+        done_cost=mi["cost_per_intervention"].where(mi["status"] == "completed"),
+    )
+    names = tables["hedis_measures"].set_index("measure_id")["measure_name"]
+
+    def closure_stats(g):
+        closures = g["done"].sum()
+        return {
+            "successful_closures": closures,
+            "success_rate": round(closures * 100.0 / len(g), 1),
+            "total_investment": round(g["done_cost"].sum(), 2),
+            "cost_per_closure": round(g["done_cost"].sum() / closures, 2) if closures else None,
+        }
+
+    rows = []
+    if name == "roi_by_measure":
+        for measure, g in mi.groupby("measure_id"):
+            invested, closures = g["done_cost"].sum(min_count=1), g["done"].sum()
+            rows.append(
+                {
+                    "measure_code": measure,
+                    "measure_name": names.get(measure),
+                    "total_investment": round(invested, 2),
+                    "revenue_impact": closures * 100.0,
+                    "roi_ratio": round(closures * 100.0 / invested, 2) if invested > 0 else 0,
+                    "successful_closures": closures,
+                    "total_interventions": len(g),
+                }
+            )
+    elif name == "cost_per_closure_by_activity":
+        acts = tables["intervention_activities"].set_index("activity_id")["activity_name"]
+        for activity, g in mi.groupby("activity_id"):
+            if len(g) < p["min_uses"]:
+                continue
+            stats = closure_stats(g)
+            rows.append(
+                {
+                    "activity_name": acts[activity],
+                    "avg_cost": round(g["done_cost"].mean(), 2),
+                    "times_used": len(g),
+                    "successful_closures": stats["successful_closures"],
+                    "success_rate": stats["success_rate"],
+                    "cost_per_closure": stats["cost_per_closure"],
+                }
+            )
+    elif name == "monthly_intervention_trend":
+        for month, g in mi.groupby(mi["intervention_date"].str[:7]):
+            stats = closure_stats(g)
+            rows.append(
+                {
+                    "month": month,
+                    "month_start": f"{month}-01",
+                    "total_interventions": len(g),
+                    "successful_closures": stats["successful_closures"],
+                    "avg_cost": round(g["cost_per_intervention"].mean(), 2),
+                    "success_rate": stats["success_rate"],
+                    "total_investment": stats["total_investment"],
+                }
+            )
+    elif name == "budget_variance_by_measure":
+        spend = tables["actual_spending"]
+        budgets = tables["budget_allocations"]
+        budgets = budgets[
+            (budgets["period_start"] >= p["start_date"]) & (budgets["period_end"] <= p["end_date"])
+        ]
+        for b in budgets.itertuples():
+            spent = spend[
+                (spend["measure_id"] == b.measure_id)
+                & (spend["spending_date"] >= b.period_start)
+                & (spend["spending_date"] <= b.period_end)
+            ]["amount_spent"].sum()
+            variance = spent - b.budget_amount
+            rows.append(
+                {
+                    "measure_code": b.measure_id,
+                    "measure_name": names.get(b.measure_id),
+                    "budget_allocated": b.budget_amount,
+                    "actual_spent": spent,
+                    "variance": variance,
+                    "variance_pct": round(variance / b.budget_amount * 100, 1),
+                    "budget_status": "Over Budget"
+                    if variance > 0
+                    else "Under Budget"
+                    if variance < 0
+                    else "On Budget",
+                }
+            )
+    elif name == "cost_tier_comparison":
+        tier = pd.cut(
+            mi["cost_per_intervention"],
+            [-float("inf"), 20, 90, float("inf")],
+            right=False,
+            labels=["Low Touch", "Medium Touch", "High Touch"],
+        )
+        for cost_tier, g in mi.groupby(tier, observed=True):
+            stats = closure_stats(g)
+            rows.append(
+                {
+                    "cost_tier": cost_tier,
+                    "interventions_count": len(g),
+                    "successful_closures": stats["successful_closures"],
+                    "avg_cost": round(g["cost_per_intervention"].mean(), 2),
+                    "success_rate": stats["success_rate"],
+                    "total_investment": stats["total_investment"],
+                    "cost_per_closure": stats["cost_per_closure"],
+                }
+            )
+    elif name == "portfolio_summary":
+        invested, closures = mi["done_cost"].sum(min_count=1), mi["done"].sum()
+        rows.append(
+            {
+                "total_investment": round(invested, 2),
+                "total_closures": closures,
+                "revenue_impact": closures * 100.0,
+                "roi_ratio": round(closures * 100.0 / invested, 2) if invested > 0 else 0,
+                "net_benefit": closures * 100.0 - invested,
+                "total_interventions": len(mi),
+                "overall_success_rate": round(closures * 100.0 / len(mi), 1),
+            }
+        )
+    df = pd.DataFrame(rows)
+    keys = _SORT_KEYS[name]
+    return df.sort_values(keys).reset_index(drop=True) if keys else df
+
+
+def test_every_named_query_matches_pandas_reference(portfolio_db):
+    """Each registry entry runs on SQLite and agrees with a pandas recomputation."""
+    from utils.queries import NAMED_QUERIES
+
+    tables = {
+        t: pd.read_sql(text(f"SELECT * FROM {t}"), portfolio_db._engine)
+        for t in (
+            "member_interventions",
+            "hedis_measures",
+            "intervention_activities",
+            "budget_allocations",
+            "actual_spending",
+        )
+    }
+    assert set(NAMED_QUERIES) == set(_SORT_KEYS)
+    for name in NAMED_QUERIES:
+        got = _run(portfolio_db._engine, name, "sqlite")
+        expected = _reference(tables, name)
+        assert not got.empty, name
+        pd.testing.assert_frame_equal(
+            got, expected, check_dtype=False, check_categorical=False, obj=name
+        )
+
+
+# ── Materialized rollups (data.rollups) ──────────────────────────────────────
+
+
+@pytest.fixture
+def rolled_up_db(portfolio_db, monkeypatch):
+    """portfolio_db with mi_daily_rollup built and rollups enabled."""
+    from data import rollups
+
+    monkeypatch.setattr(
+        rollups,
+        "_state",
+        {
+            "enabled": False,
+            "ready": False,
+            "refreshed_at": 0.0,
+            "high_water_mark": None,
+            "last_error": None,
+            "writes": 0,
+            "synced_writes": 0,
+            "catching_up": False,
+        },
+    )
+    assert rollups.ensure_rollups()
+    yield portfolio_db
+
+
+def _run_source(db, name, source):
+    from utils.queries import bind_named_query
+
+    params = {"start_date": "2024-10-01", "end_date": "2024-12-31"}
+    if name == "cost_per_closure_by_activity":
+        params["min_uses"] = 1
+    df = pd.read_sql(bind_named_query(name, "sqlite", source, **params), db._engine)
+    keys = _SORT_KEYS[name]
+    return df.sort_values(keys).reset_index(drop=True) if keys else df
+
+
+_ROLLUP_QUERIES = [
+    "roi_by_measure",
+    "cost_per_closure_by_activity",
+    "monthly_intervention_trend",
+    "cost_tier_comparison",
+    "portfolio_summary",
+]
+
+
+@pytest.mark.parametrize("name", _ROLLUP_QUERIES)
+def test_rollup_rendering_matches_base_table(rolled_up_db, name):
+    """Reading mi_daily_rollup gives the same answer as scanning member_interventions."""
+    base = _run_source(rolled_up_db, name, "base")
+    rolled = _run_source(rolled_up_db, name, "rollup")
+    pd.testing.assert_frame_equal(base, rolled, check_dtype=False)
+
+
+def test_incremental_refresh_picks_up_new_and_updated_rows(rolled_up_db):
+    """Appends after the high-water mark and status changes inside the lookback are rolled up."""
+    from data import rollups
+
+    with rolled_up_db._engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO member_interventions VALUES "
+                "(900, 'M900', 'CBP', 1, '2024-12-30', 'completed', 55.0)"
+            )
+        )
+        conn.execute(
+            text("UPDATE member_interventions SET status = 'pending' WHERE intervention_id = 27")
+        )
+    r = rollups.refresh_rollups(lookback_days=3)
+    assert r["success"] and r["since"] is not None
+    for name in _ROLLUP_QUERIES:
+        base = _run_source(rolled_up_db, name, "base")
+        rolled = _run_source(rolled_up_db, name, "rollup")
+        pd.testing.assert_frame_equal(base, rolled, check_dtype=False)
+
+
+def test_query_by_name_prefers_rollup_when_ready(rolled_up_db):
+    """data.db.query() reads the rollup for registered queries once it is ready."""
+    rolled_up_db.query("portfolio_summary", {"start_date": "2024-10-01", "end_date": "2024-12-31"})
+    from data.db import referenced_tables
+
+    sql_keys = [k[0] for k in rolled_up_db._query_cache._entries]
+    assert any("mi_daily_rollup" in referenced_tables(k) for k in sql_keys)
+
+
+def test_rollup_drops_timed_rows_on_the_end_day_like_base(rolled_up_db):
+    """A row stamped later on the end day is excluded by both renderings."""
+    from data import rollups
+
+    with rolled_up_db._engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO member_interventions VALUES "
+                "(901, 'M901', 'CBP', 1, '2024-12-31 10:30:00', 'completed', 40.0)"
+            )
+        )
+    assert rollups.refresh_rollups(full=True)["success"]
+    for name in _ROLLUP_QUERIES:
+        base = _run_source(rolled_up_db, name, "base")
+        rolled = _run_source(rolled_up_db, name, "rollup")
+        pd.testing.assert_frame_equal(base, rolled, check_dtype=False)
+
+
+def test_write_marks_rollup_dirty_and_reads_fall_back_to_base(rolled_up_db, monkeypatch):
+    """execute() on member_interventions evicts rollup results and serves base rows until caught up."""
+    import threading
+
+    from data import rollups
+
+    params = {"start_date": "2024-10-01", "end_date": "2024-12-31"}
+    before = rolled_up_db.query("portfolio_summary", params)
+    release = threading.Event()
+    refresh = rollups.refresh_rollups
+
+    def held_refresh(*args, **kwargs):
+        release.wait(5)
+        return refresh(*args, **kwargs)
+
+    monkeypatch.setattr(rollups, "refresh_rollups", held_refresh)
+    rolled_up_db.execute(
+        "INSERT INTO member_interventions VALUES "
+        "(902, 'M902', 'CBP', 1, '2024-12-30', 'completed', 55.0)"
+    )
+    assert not rollups.rollup_ready()
+    assert rollups.rollup_status()["dirty"]
+    during = rolled_up_db.query("portfolio_summary", params)
+    assert during["total_interventions"][0] == before["total_interventions"][0] + 1
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while not rollups.rollup_ready() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert rollups.rollup_ready()
+    after = rolled_up_db.query("portfolio_summary", params)
+    pd.testing.assert_frame_equal(during, after, check_dtype=False)
+
+
+def test_rollup_ready_never_refreshes_on_the_read_path(rolled_up_db, monkeypatch):
+    """An expired interval is the scheduler's job; rollup_ready() only checks flags."""
+    from data import rollups
+
+    calls = []
+    monkeypatch.setattr(rollups, "refresh_rollups", lambda **kw: calls.append(kw) or {})
+    monkeypatch.setenv("ROLLUP_REFRESH_INTERVAL", "0")
+    assert rollups.rollup_ready()
+    assert calls == []
+    rollups.refresh_if_due()
+    assert calls == [{}]
@@ -0,0 +1,262 @@
+"""
+Star rating forecast cache snapshot — star_rating_cache.StarRatingCacheDB
+An in-memory stand-in for the gspread worksheet counts API calls.
+No live Sheets calls.
+"""
+
+import re
+import threading
+import time
+
+import pytest
+
+from star_rating_cache import FORECAST_COLUMNS
+
+
+class FakeSheet:
+    """Minimal gspread.Worksheet over a list of string rows, header first."""
+
+    def __init__(self, rows=None):
+        self.values = [list(FORECAST_COLUMNS)] + [list(r) for r in rows or []]
+        self.calls: dict[str, int] = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get_all_values(self):
+        self._count("get_all_values")
+        return [list(r) for r in self.values]
+
+    def batch_get(self, ranges):
+        self._count("batch_get")
+        out = []
+        for rng in ranges:
+            c1, r1, c2, r2 = re.fullmatch(r"([A-Z]+)(\d+):([A-Z]+)(\d*)", rng).groups()
+            lo, hi = ord(c1) - 65, ord(c2) - 64
+            rows = self.values[int(r1) - 1 : int(r2) if r2 else None]
+            out.append([r[lo:hi] for r in rows])
+        return out
+
+    def get_all_records(self):
+        raise AssertionError("readers should be served from the snapshot")
+
+    def append_rows(self, rows):
+        self._count("append_rows")
+        first = len(self.values) + 1
+        self.values += [[str(v) for v in row] for row in rows]
+        return {"updates": {"updatedRange": f"Sheet1!A{first}:T{len(self.values)}"}}
+
+    def batch_update(self, data):
+        self._count("batch_update")
+        self.last_batch = data
+        for d in data:
+            col, row = re.fullmatch(r"([A-Z]+)(\d+)", d["range"]).groups()
+            self.values[int(row) - 1][ord(col) - 65] = d["values"][0][0]
+
+
+def _row(fid, contract="H1234", status="FRESH", projected="4.0", ts="2026-01-05 09:00:00"):
+    values = {
+        "forecast_id": fid,
+        "timestamp": ts,
+        "contract_id": contract,
+        "plan_name": "Plan",
+        "current_star_rating": "3.5",
+        "projected_star_rating": projected,
+        "star_delta": str(round(float(projected) - 3.5, 2)),
+        "confidence_level": "HIGH",
+        "cache_status": status,
+    }
+    return [values.get(c, "") for c in FORECAST_COLUMNS]
+
+
+@pytest.fixture
+def cache_db(monkeypatch):
+    """StarRatingCacheDB on a FakeSheet with one stale and one fresh forecast."""
+    import star_rating_cache
+
+    sheet = FakeSheet(
+        [
+            _row("FCST-20260105-090000", status="STALE"),
+            _row("FCST-20260106-090000", projected="4.5", ts="2026-01-06 09:00:00"),
+        ]
+    )
+
+    def _connect(self):
+        self.sheet = sheet
+        self.connected = True
+        self.sync(full=True)
+
+    monkeypatch.setattr(star_rating_cache.StarRatingCacheDB, "_connect", _connect)
+    monkeypatch.setattr("sheets_write_queue.FLUSH_INTERVAL", 60.0)
+    return star_rating_cache.StarRatingCacheDB()
+
+
+def test_all_readers_share_one_download(cache_db):
+    """Hero card, KPI row, banner and history render from one snapshot."""
+    from star_rating_cache import fetch_cache_summary, fetch_forecast_history, fetch_latest_forecast
+
+    for _ in range(3):
+        latest = fetch_latest_forecast(cache_db)
+        summary = fetch_cache_summary(cache_db)
+        history = fetch_forecast_history(cache_db, contract_id="H1234")
+    assert latest["forecast_id"] == "FCST-20260106-090000"
+    assert latest["projected_star_rating"] == 4.5
+    assert summary["total"] == 2 and summary["fresh"] == 1
+    assert history["forecast_id"].tolist() == ["FCST-20260105-090000", "FCST-20260106-090000"]
+    assert cache_db.status()["last_cached_at"] == "2026-01-06 09:00:00"
+    assert cache_db.sheet.calls == {"get_all_values": 1}
+
+
+def test_delta_sync_fetches_only_rows_past_watermark(cache_db):
+    """Rows appended by another writer arrive through one batch_get."""
+    from star_rating_cache import fetch_cache_summary
+
+    cache_db.sheet.values.append(_row("FCST-20260107-090000", contract="H9999"))
+    cache_db.sync(force=True)
+    assert fetch_cache_summary(cache_db)["total"] == 3
+    cache_db.sync(force=True)  # nothing new: still one small ranged read
+    assert cache_db.sheet.calls == {"get_all_values": 1, "batch_get": 2}
+    assert cache_db._last_row == 4
+
+
+def test_cache_forecast_writes_through_snapshot(cache_db):
+    """A cached forecast is the latest at once; the prior FRESH row is staled in one batch."""
+    from star_rating_cache import cache_forecast, fetch_cache_summary, fetch_latest_forecast
+
+    r = cache_forecast(
+        cache_db, {"contract_id": "H1234", "current_star_rating": 3.5, "projected_star_rating": 5}
+    )
+    assert r["success"]
+    assert fetch_latest_forecast(cache_db, "H1234")["forecast_id"] == r["forecast_id"]
+    assert fetch_cache_summary(cache_db)["fresh"] == 1
+
+    assert cache_db.write_queue().flush(timeout=5)
+    status_col = FORECAST_COLUMNS.index("cache_status")
+    assert [row[status_col] for row in cache_db.sheet.values[1:]] == ["STALE", "STALE", "FRESH"]
+    assert cache_db.sheet.calls.get("batch_update") == 1
+    cache_db.sync(force=True)
+    assert fetch_cache_summary(cache_db)["total"] == 3
+
+
+def test_fresh_index_stales_every_prior_row_in_one_batch(cache_db):
+    """Legacy sheets with several FRESH rows per contract are cleaned up in one batch_update."""
+    from star_rating_cache import cache_forecast, fetch_latest_forecast
+
+    cache_db.sheet.values += [
+        _row("FCST-20260107-090000", projected="3.0"),
+        _row("FCST-20260108-090000", contract="H9999"),
+    ]
+    cache_db.sync(full=True)
+    assert fetch_latest_forecast(cache_db, "H1234")["forecast_id"] == "FCST-20260107-090000"
+    assert fetch_latest_forecast(cache_db)["forecast_id"] == "FCST-20260108-090000"
+
+    cache_forecast(cache_db, {"contract_id": "H1234", "projected_star_rating": 4})
+    assert cache_db.write_queue().flush(timeout=5)
+    assert cache_db.sheet.calls["batch_update"] == 1
+    assert sorted(d["range"] for d in cache_db.sheet.last_batch) == ["R3", "R4"]
+    status_col = FORECAST_COLUMNS.index("cache_status")
+    assert cache_db.sheet.values[5][status_col] == "FRESH"  # other contract untouched
+
+
+def test_forecast_superseded_before_it_lands_is_staled_on_confirm(cache_db):
+    """Two runs inside one flush window leave exactly one FRESH row in the Sheet."""
+    from star_rating_cache import cache_forecast, fetch_cache_summary, fetch_latest_forecast
+
+    first = cache_forecast(cache_db, {"contract_id": "H1234", "projected_star_rating": 4})
+    second = cache_forecast(cache_db, {"contract_id": "H1234", "projected_star_rating": 5})
+    assert fetch_latest_forecast(cache_db, "H1234")["forecast_id"] == second["forecast_id"]
+    assert fetch_cache_summary(cache_db)["fresh"] == 1
+
+    assert cache_db.write_queue().flush(timeout=5)
+    status_col = FORECAST_COLUMNS.index("cache_status")
+    by_id = {row[0]: row[status_col] for row in cache_db.sheet.values[1:]}
+    assert by_id[first["forecast_id"]] == "STALE"
+    assert by_id[second["forecast_id"]] == "FRESH"
+    assert list(by_id.values()).count("FRESH") == 1
+
+
+def test_delta_sync_sees_rows_other_writers_staled(cache_db):
+    """The status column in each delta pull drops forecasts another process marked STALE."""
+    from star_rating_cache import fetch_latest_forecast
+
+    status_col = FORECAST_COLUMNS.index("cache_status")
+    cache_db.sheet.values[2][status_col] = "STALE"
+    cache_db.sync(force=True)
+    assert fetch_latest_forecast(cache_db, "H1234") is None
+    assert cache_db.sheet.calls == {"get_all_values": 1, "batch_get": 1}
+
+
+def test_cache_forecast_never_calls_sheets_and_stales_concurrent_rows(cache_db):
+    """No I/O on the request path; a FRESH row another writer added is staled once ours lands."""
+    from star_rating_cache import cache_forecast, fetch_latest_forecast
+
+    cache_db.sheet.values.append(_row("FCST-20260107-090000", projected="3.0"))
+    calls = dict(cache_db.sheet.calls)
+    r = cache_forecast(cache_db, {"contract_id": "H1234", "projected_star_rating": 4})
+    assert cache_db.sheet.calls == calls
+
+    assert cache_db.write_queue().flush(timeout=5)
+    status_col = FORECAST_COLUMNS.index("cache_status")
+    by_id = {row[0]: row[status_col] for row in cache_db.sheet.values[1:]}
+    assert by_id["FCST-20260107-090000"] == "STALE"
+    assert [fid for fid, st in by_id.items() if st == "FRESH"] == [r["forecast_id"]]
+    assert fetch_latest_forecast(cache_db, "H1234")["forecast_id"] == r["forecast_id"]
+
+
+def test_readers_serve_last_snapshot_while_refresh_is_in_flight(cache_db, monkeypatch):
+    """A slow Sheets pull never blocks a render; the generation moves when it lands."""
+    import star_rating_cache
+    from star_rating_cache import fetch_cache_summary
+
+    gate, entered = threading.Event(), threading.Event()
+    pulled_on: list[threading.Thread] = []
+    real_batch_get = cache_db.sheet.batch_get
+
+    def _slow(ranges):
+        pulled_on.append(threading.current_thread())
+        entered.set()
+        gate.wait(5)
+        return real_batch_get(ranges)
+
+    monkeypatch.setattr(cache_db.sheet, "batch_get", _slow)
+    monkeypatch.setattr(star_rating_cache, "CACHE_SYNC_INTERVAL", 0.0)
+    cache_db.sheet.values.append(_row("FCST-20260107-090000"))
+    before = cache_db.generation
+    calls = dict(cache_db.sheet.calls)
+
+    assert fetch_cache_summary(cache_db)["total"] == 2  # kicks off a background pull
+    assert entered.wait(5) and cache_db._sync_lock.locked()
+    # the render answered from the snapshot; the Sheets read ran on another thread
+    assert threading.current_thread() not in pulled_on
+
+    gate.set()
+    deadline = time.monotonic() + 5
+    while cache_db.generation == before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache_db.generation > before
+    # the background pull was the watermark delta read, not a full download
+    assert cache_db.sheet.calls.get("get_all_values") == calls.get("get_all_values")
+    monkeypatch.setattr(star_rating_cache, "CACHE_SYNC_INTERVAL", 3600.0)
+    assert fetch_cache_summary(cache_db)["total"] == 3
+
+
+def test_concurrent_callers_share_one_write_queue(cache_db, monkeypatch):
+    """UI and sync threads racing on first use get the same queue, so no write is orphaned."""
+    import star_rating_cache
+
+    real_queue = star_rating_cache.SheetWriteQueue
+
+    def _slow_queue(*args, **kwargs):
+        time.sleep(0.05)  # widen the check-then-create window
+        return real_queue(*args, **kwargs)
+
+    monkeypatch.setattr(star_rating_cache, "SheetWriteQueue", _slow_queue)
+    queues = []
+    threads = [
+        threading.Thread(target=lambda: queues.append(cache_db.write_queue())) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(queues) == 4 and all(q is queues[0] for q in queues)
@@ -0,0 +1,89 @@
+"""
+Monte Carlo star-rating forecaster — compound_framework.star_forecast
+Closure velocity is pinned per measure so results do not depend on the
+get_gap_analysis history.
+"""
+
+import pytest
+
+from compound_framework.star_forecast import (
+    DEFAULT_SIMULATIONS,
+    forecast_measure_rate,
+    simulate_star_forecast,
+)
+
+MEASURES = [
+    {"measure_id": "GSD", "numerator": 850, "denominator": 1000, "closure_velocity": 0.02},
+    {"measure_id": "KED", "numerator": 750, "denominator": 1000, "closure_velocity": 0.02},
+    {"measure_id": "CBP", "numerator": 650, "denominator": 1000, "closure_velocity": 0.02},
+    {"measure_id": "HEI", "numerator": 200, "denominator": 1000, "closure_velocity": 0.02},
+]
+
+
+def test_forecast_is_reproducible_and_streams_are_per_measure():
+    a = simulate_star_forecast(MEASURES, n_sims=5000, seed=7)
+    b = simulate_star_forecast(MEASURES, n_sims=5000, seed=7)
+    extra = simulate_star_forecast(
+        MEASURES + [{"measure_id": "BCS", "rate": 0.7, "closure_velocity": 0.02}],
+        n_sims=5000,
+        seed=7,
+    )
+
+    assert a["rating_distribution"] == b["rating_distribution"]
+    assert a["seed"] == 7
+    assert [m["projected_rate"] for m in extra["measures"][:4]] == [
+        m["projected_rate"] for m in a["measures"]
+    ]
+    assert sum(a["rating_distribution"].values()) == pytest.approx(1.0)
+    assert a["rating_distribution"][a["projected_star_rating"]] == a["confidence"]
+    assert a["confidence_level"] in ("HIGH", "MEDIUM", "LOW")
+
+
+def test_gap_closure_moves_rates_toward_better_and_zero_velocity_holds():
+    moving = simulate_star_forecast(MEASURES, n_sims=5000, seed=1)
+    still = simulate_star_forecast(
+        [dict(m, closure_velocity=0.0) for m in MEASURES], n_sims=5000, seed=1
+    )
+
+    by_id = {m["measure_id"]: m for m in moving["measures"]}
+    assert by_id["GSD"]["projected_rate"] > 0.85
+    assert by_id["HEI"]["projected_rate"] < 0.20  # inverse: closing gaps lowers the rate
+    for m in still["measures"]:
+        assert m["projected_rate"] == pytest.approx(m["current_rate"], abs=0.005)
+    assert moving["expected_rating"] >= still["expected_rating"]
+
+
+def test_rate_forecast_horizons_are_nested():
+    horizons = forecast_measure_rate("COL", 0.70, horizons=(12, 3, 6), n_sims=5000, seed=3)
+
+    assert [h["months"] for h in horizons] == [3, 6, 12]
+    predicted = [h["predicted_rate"] for h in horizons]
+    assert predicted == sorted(predicted)
+    assert all(h["ci_low"] <= h["predicted_rate"] <= h["ci_high"] for h in horizons)
+
+
+def test_default_simulation_count_gives_a_complete_distribution():
+    """Throughput is measured by ``python -m compound_framework.star_forecast``, not here."""
+    a = simulate_star_forecast(MEASURES, seed=0)
+    b = simulate_star_forecast(MEASURES, seed=0)
+
+    assert a["n_sims"] == DEFAULT_SIMULATIONS
+    assert a["rating_distribution"] == b["rating_distribution"]
+    assert a["expected_rating"] == b["expected_rating"]
+    assert sum(a["rating_distribution"].values()) == pytest.approx(1.0)
+    counts = [p * DEFAULT_SIMULATIONS for p in a["rating_distribution"].values()]
+    assert counts == pytest.approx([round(c) for c in counts])  # whole simulated years
+    assert len(a["measures"]) == len(MEASURES)
+    assert min(a["rating_distribution"]) <= a["rating_ci"][0] <= a["rating_ci"][1]
+
+
+def test_async_forecast_matches_the_sync_result():
+    import asyncio
+
+    from compound_framework.star_forecast import simulate_star_forecast_async
+
+    ran = asyncio.run(simulate_star_forecast_async(MEASURES, n_sims=2000, seed=5))
+    assert (
+        ran["rating_distribution"]
+        == simulate_star_forecast(MEASURES, n_sims=2000, seed=5)["rating_distribution"]
+    )
@@ -21,10 +21,11 @@ def gap_suppression_temp(monkeypatch):
     os.close(fd)
     monkeypatch.setenv("GAP_SUPPRESSION_FILE", path)
     yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
+    for leftover in (path, path + ".lock"):
+        try:
+            os.unlink(leftover)
+        except OSError:
+            pass
 
 
 def test_get_gap_suppressions_empty(gap_suppression_temp):
@@ -129,6 +130,100 @@ def test_apply_gap_suppression_filter_no_suppressions(gap_suppression_temp):
     assert len(out) == 2
 
 
+@pytest.fixture
+def suppression_store(gap_suppression_temp, monkeypatch):
+    """hedis_gap_trail pointed at an empty temp suppression log."""
+    import hedis_gap_trail
+
+    monkeypatch.setattr(hedis_gap_trail, "_SUPPRESSION_FILE", gap_suppression_temp)
+    monkeypatch.setattr(hedis_gap_trail, "_GAP_SUPPRESSIONS_CACHE", None)
+    yield hedis_gap_trail
+    try:
+        os.unlink(gap_suppression_temp + ".tmp")
+    except OSError:
+        pass
+
+
+def test_suppressions_append_one_line_per_change(suppression_store):
+    """Bulk add/remove append log lines instead of rewriting every rule."""
+    hgt = suppression_store
+    r = hgt.add_gap_suppressions([f"GAP-{i}" for i in range(100)] + ["GAP-1"], "Deceased")
+    assert r == {"success": True, "added": 100, "skipped": 1}
+    assert hgt.remove_gap_suppressions(["GAP-5", "GAP-6", "GAP-NOPE"])["removed"] == 2
+    with open(hgt._SUPPRESSION_FILE, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 102
+    assert len(hgt.suppressed_gap_ids()) == 98
+    assert "GAP-5" not in hgt.suppressed_gap_ids()
+
+
+def test_suppression_index_reloads_only_when_file_changes(suppression_store, monkeypatch):
+    """Repeated reads reuse the index; another writer's append is picked up via mtime/size."""
+    import json
+
+    hgt = suppression_store
+    hgt.add_gap_suppression("GAP-A", "Test")
+    parses = []
+    real_parse = hgt._parse_suppression_file
+    monkeypatch.setattr(
+        hgt, "_parse_suppression_file", lambda text: parses.append(1) or real_parse(text)
+    )
+    for _ in range(5):
+        assert hgt.suppressed_gap_ids() == {"GAP-A"}
+    assert parses == []
+
+    with open(hgt._SUPPRESSION_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "gap_id": "GAP-B", "reason": "other worker"}) + "\n")
+        f.write('{"op": "add", "gap_id": "GAP-TORN"')  # partial trailing write
+    assert hgt.suppressed_gap_ids() == {"GAP-A", "GAP-B"}
+    assert parses == [1]
+
+
+def test_legacy_json_file_is_read_and_converted(suppression_store):
+    """A pre-existing JSON array keeps working and becomes a log on the next write."""
+    import json
+
+    hgt = suppression_store
+    with open(hgt._SUPPRESSION_FILE, "w", encoding="utf-8") as f:
+        json.dump([{"gap_id": "GAP-OLD", "reason": "Legacy", "created": "2026-01-01"}], f)
+    assert [r["gap_id"] for r in hgt.get_gap_suppressions()] == ["GAP-OLD"]
+    hgt.add_gap_suppression("GAP-NEW", "Test")
+    with open(hgt._SUPPRESSION_FILE, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [e["gap_id"] for e in lines] == ["GAP-OLD", "GAP-NEW"]
+    assert not os.path.exists(hgt._SUPPRESSION_FILE + ".tmp")
+
+
+def test_suppression_log_compacts_dead_lines(suppression_store, monkeypatch):
+    hgt = suppression_store
+    monkeypatch.setattr(hgt, "_COMPACT_MIN_LINES", 10)
+    ids = [f"GAP-{i}" for i in range(20)]
+    hgt.add_gap_suppressions(ids)
+    hgt.remove_gap_suppressions(ids[:15])
+    with open(hgt._SUPPRESSION_FILE, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 5
+    monkeypatch.setattr(hgt, "_GAP_SUPPRESSIONS_CACHE", None)
+    assert hgt.suppressed_gap_ids() == set(ids[15:])
+
+
+def test_writes_keep_lines_other_processes_appended(suppression_store, monkeypatch):
+    """A write reloads first, so another worker's append is neither hidden nor compacted away."""
+    import json
+
+    hgt = suppression_store
+    hgt.add_gap_suppression("GAP-A", "Test")
+    with open(hgt._SUPPRESSION_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "gap_id": "GAP-OTHER", "reason": "other worker"}) + "\n")
+    hgt.add_gap_suppression("GAP-B", "Test")
+    assert hgt.suppressed_gap_ids() == {"GAP-A", "GAP-OTHER", "GAP-B"}
+
+    monkeypatch.setattr(hgt, "_COMPACT_MIN_LINES", 0)
+    with open(hgt._SUPPRESSION_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "gap_id": "GAP-LATE", "reason": "other worker"}) + "\n")
+    hgt.remove_gap_suppressions(["GAP-A", "GAP-B"])  # dead lines outnumber rules: compacts
+    with open(hgt._SUPPRESSION_FILE, encoding="utf-8") as f:
+        assert sorted(json.loads(line)["gap_id"] for line in f) == ["GAP-LATE", "GAP-OTHER"]
+
+
 # ── Measure aggregation (HEDIS_MEASURES) ───────────────────────────────────
 
 
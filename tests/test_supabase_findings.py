@@ -0,0 +1,117 @@
+"""
+Pooled, buffered cross_app_findings writer — shared.supabase_findings
+The psycopg2 pool and execute_values are replaced with recorders.
+No live Postgres calls.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def findings(monkeypatch):
+    """supabase_findings with a fresh writer, a fake pool and recorded batches."""
+    from shared import supabase_findings as sf
+
+    batches, pools = [], []
+
+    class FakeConn:
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    class FakePool:
+        def __init__(self, minconn, maxconn, dsn, **kwargs):
+            pools.append(dsn)
+            self.returned = []
+
+        def getconn(self):
+            return FakeConn()
+
+        def putconn(self, conn, close=False):
+            self.returned.append(close)
+
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@pooler.test:5432/postgres")
+    monkeypatch.setattr(sf, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(sf, "execute_values", lambda cur, sql, rows: batches.append((sql, rows)))
+    monkeypatch.setattr(sf, "_pools", {})
+    monkeypatch.setattr(sf, "_writer", sf._FindingsWriter())
+    monkeypatch.setattr(sf, "FLUSH_INTERVAL", 60.0)
+    monkeypatch.setattr(sf, "batches", batches, raising=False)
+    monkeypatch.setattr(sf, "pool_dsns", pools, raising=False)
+    return sf
+
+
+def _insert(sf, i):
+    return sf.insert_finding(
+        source_app="starguard",
+        finding_type="star_gap",
+        title=f"gap {i}",
+        trigger_type="action",
+        measure_id="CBP",
+    )
+
+
+def test_findings_are_buffered_and_flushed_as_one_insert(findings):
+    """insert_finding returns without I/O; flush sends one execute_values over one pool."""
+    assert all(_insert(findings, i) for i in range(5))
+    assert findings.batches == []
+    assert findings.findings_stats()["pending"] == 5
+
+    assert findings.flush_findings(timeout=5)
+    assert len(findings.batches) == 1
+    sql, rows = findings.batches[0]
+    assert sql.startswith("INSERT INTO cross_app_findings") and sql.endswith("VALUES %s")
+    assert [r[4] for r in rows] == [f"gap {i}" for i in range(5)]
+    assert findings.pool_dsns == ["postgresql://u:p@pooler.test:5432/postgres"]
+    assert findings.findings_stats() == {
+        "queued": 5,
+        "written": 5,
+        "failed": 0,
+        "batches": 1,
+        "pending": 0,
+    }
+
+
+def test_batch_size_triggers_background_flush(findings, monkeypatch):
+    """Reaching FINDINGS_BATCH_SIZE wakes the writer without waiting for the interval."""
+    monkeypatch.setattr(findings, "BATCH_SIZE", 3)
+    for i in range(3):
+        _insert(findings, i)
+    writer = findings._writer
+    with writer._cond:
+        assert writer._cond.wait_for(lambda: writer.stats["written"] == 3, timeout=5)
+    assert len(findings.batches) == 1
+
+
+def test_failed_insert_discards_connection_and_never_raises(findings, monkeypatch):
+    """A broken connection is closed, not returned to the pool; callers only see stderr."""
+
+    def _boom(cur, sql, rows):
+        raise RuntimeError("server closed the connection unexpectedly")
+
+    monkeypatch.setattr(findings, "execute_values", _boom)
+    _insert(findings, 0)
+    assert findings.flush_findings(timeout=5)
+    pool = next(iter(findings._pools.values()))
+    assert pool.returned == [True]
+    status = findings.findings_status()
+    assert status["failed"] == 1 and not status["healthy"]
+    assert "server closed the connection" in status["last_error"]
+
+
+def test_no_dsn_skips_without_buffering(findings, monkeypatch):
+    for name in ("PLATFORM_DATABASE_URL", "DATABASE_URL", "SUPABASE_DB_URL"):
+        monkeypatch.delenv(name, raising=False)
+    assert _insert(findings, 0) is False
+    assert findings.findings_stats()["queued"] == 0
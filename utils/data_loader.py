@@ -11,6 +11,9 @@ import pandas as pd
 # Base path for data files
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Column types for the member pull when fetched Arrow-backed (data.db.query arrow=True)
+MEMBER_OUTREACH_SCHEMA = {"member_id": "string", "age": "int64", "hedis_gap_count": "int64"}
+
 
 def load_sentiment_corpus() -> pd.DataFrame:
     """Load sentiment corpus (call transcripts with CAHPS sentiment scores)."""
@@ -53,7 +56,7 @@ def load_member_data_for_outreach() -> pd.DataFrame:
         ) g ON m.member_id = g.member_id
         LIMIT 500
         """
-        df = query(sql)
+        df = query(sql, arrow=True, schema=MEMBER_OUTREACH_SCHEMA)
         if df is not None and not df.empty:
             # Add synthetic columns not in DB
             np.random.seed(42)
@@ -114,6 +117,13 @@ def get_merged_member_sdoh() -> pd.DataFrame:
     return merged
 
 
+async def get_merged_member_sdoh_async() -> pd.DataFrame:
+    """get_merged_member_sdoh() run on the database thread pool, for extended tasks."""
+    from data.db import run_in_db_executor
+
+    return await run_in_db_executor(get_merged_member_sdoh)
+
+
 def get_member_sentiment_lookup() -> dict:
     """Return member_id -> avg sentiment_score from corpus (for agentic outreach)."""
     df = load_sentiment_corpus()
@@ -0,0 +1,63 @@
+"""
+Sortable unique ids for Sheets-backed records (HEDIS gaps, forecasts)
+PREFIX-YYYYMMDD-HHMMSS-mmmEEEEEEEE: the legacy second-resolution id
+extended ULID-style with milliseconds and 40 bits of Crockford base32
+entropy. Within a process ids are strictly increasing, so string order
+is creation order, and legacy ids sort just before same-second new ones.
+"""
+
+import secrets
+import threading
+from datetime import datetime, timedelta
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ENTROPY_BITS = 40
+_ENTROPY_CHARS = _ENTROPY_BITS // 5
+
+_lock = threading.Lock()
+_last: dict[str, tuple[int, datetime, int]] = {}  # prefix -> (epoch ms, stamp, entropy)
+
+
+def _base32(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        value, rem = divmod(value, 32)
+        chars.append(_CROCKFORD[rem])
+    return "".join(reversed(chars))
+
+
+def _format(prefix: str, stamp: datetime, entropy: int) -> str:
+    ms = stamp.microsecond // 1000
+    return f"{prefix}-{stamp.strftime('%Y%m%d-%H%M%S')}-{ms:03d}{_base32(entropy, _ENTROPY_CHARS)}"
+
+
+def new_ids(prefix: str, n: int, now: datetime | None = None) -> list[str]:
+    """
+    ``n`` consecutive ids for ``prefix``.
+
+    A fresh millisecond starts from random entropy; the same millisecond
+    (or a clock that stepped backwards) increments the previous entropy,
+    as in monotonic ULIDs, so ids never repeat or go backwards.
+    """
+    now = now or datetime.now()
+    stamp = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    ms = int(stamp.timestamp() * 1000)  # comparable across naive/aware callers
+    with _lock:
+        last = _last.get(prefix)
+        if last is None or ms > last[0]:
+            entropy = secrets.randbits(_ENTROPY_BITS - 1)  # headroom for increments
+        else:
+            ms, stamp, entropy = last[0], last[1], last[2] + 1
+        ids = []
+        for _ in range(n):
+            if entropy >> _ENTROPY_BITS:
+                ms, stamp, entropy = ms + 1, stamp + timedelta(milliseconds=1), 0
+            ids.append(_format(prefix, stamp, entropy))
+            entropy += 1
+        _last[prefix] = (ms, stamp, entropy - 1)
+    return ids
+
+
+def new_id(prefix: str, now: datetime | None = None) -> str:
+    """One id for ``prefix``, e.g. GAP-20260304-104512-0817Q3M0ZB4."""
+    return new_ids(prefix, 1, now)[0]
@@ -1,10 +1,28 @@
 """
 Intervention Analysis
 Financial impact per intervention and portfolio optimization for quality budgets
+
+Portfolios are chosen by a 0/1 knapsack DP over the budget in discrete cost
+cells, with per-measure caps solved inside the DP, and depth-first
+branch-and-bound when channel limits or a minimum star lift rule out the
+DP's portfolio. solver["exact"] is False when costs had to be rounded to
+fit MAX_DP_CELLS or branch-and-bound hit MAX_BB_NODES.
+Candidate ROI is computed column-wise (calculate_intervention_roi_frame) so
+per-member x per-measure candidate lists stay cheap to score.
+Results are memoized process-wide (LRU) so every session and output asking
+for the same budget, candidate-set version and constraints shares one solve.
 """
 
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
 try:
     from utils.measure_definitions import get_measure_definition
 except ImportError:
@@ -16,6 +34,21 @@ except ImportError:
 # Default quality bonus per member per star (CMS-style)
 DEFAULT_QUALITY_BONUS_PER_STAR = 50.0
 
+# Knapsack DP limits: budget cells, and items x cells of the choice table.
+# Larger problems are solved by branch-and-bound instead.
+MAX_DP_CELLS = 5000
+MAX_DP_STATES = 20_000_000
+# Branch-and-bound gives up (returning its best portfolio so far) after this many nodes
+MAX_BB_NODES = 5000
+# Star-vs-net-benefit trade-off weights swept for the Pareto front
+PARETO_POINTS = 9
+# Optimizer results memoized across sessions
+OPTIMIZER_CACHE_SIZE = int(os.environ.get("OPTIMIZER_CACHE_SIZE", "64"))
+
+_optimizer_cache: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+_optimizer_lock = threading.Lock()
+_optimizer_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
 
 def _star_weight(measure_id: str) -> float:
     """Star rating weight for measure (triple-weighted ~0.15, others lower)."""
@@ -48,6 +81,7 @@ def calculate_intervention_roi(
             "roi_ratio": 0.0,
             "confidence_score": 0.0,
             "star_rating_bonus_impact": 0.0,
+            "star_lift": 0.0,
             "estimated_closures": 0,
             "intervention_type": intervention_type,
             "target_measure": target_measure,
@@ -80,6 +114,7 @@ def calculate_intervention_roi(
         "roi_ratio": round(roi_ratio, 2),
         "confidence_score": round(confidence, 1),
         "star_rating_bonus_impact": round(star_rating_bonus, 2),
+        "star_lift": round(star_improvement, 4),
         "estimated_closures": estimated_closures,
         "intervention_type": intervention_type,
         "target_measure": target_measure,
@@ -88,6 +123,59 @@ def calculate_intervention_roi(
     }
 
 
+def _round_each(values: np.ndarray, places: int) -> np.ndarray:
+    """
+    Built-in round() per element, so frame and scalar ROI figures match to
+    the cent; np.round scales by 10**places first and can land one unit off.
+    """
+    return np.array([round(v, places) for v in values.tolist()], dtype=float)
+
+
+def calculate_intervention_roi_frame(
+    interventions: pd.DataFrame,
+    revenue_per_closure: float = 100.0,
+    quality_bonus_per_member_per_star: float = DEFAULT_QUALITY_BONUS_PER_STAR,
+) -> pd.DataFrame:
+    """
+    calculate_intervention_roi for every row of a DataFrame in one pass.
+
+    Needs columns target_measure, expected_gap_closure, intervention_cost and
+    member_count. Returns a copy with cost_per_closure, estimated_closures,
+    revenue_from_closures, star_rating_bonus, financial_impact_total,
+    roi_ratio, net_roi, star_lift and confidence_score added; rows with no
+    cost or members get zeros, as in the scalar version.
+    """
+    out = interventions.copy()
+    gap = out["expected_gap_closure"].to_numpy(dtype=float)
+    cost = out["intervention_cost"].to_numpy(dtype=float)
+    members = out["member_count"].to_numpy(dtype=float)
+    valid = (cost > 0) & (members > 0)
+
+    # one _star_weight call per distinct measure, broadcast through the codes
+    codes, measures = pd.factorize(out["target_measure"].astype(str))
+    weights = np.array([_star_weight(m) for m in measures], dtype=float)[codes]
+
+    closures = np.where(valid, np.maximum(np.trunc(members * (gap / 100.0)), 1), 0)
+    cost_per_closure = np.divide(cost, closures, out=np.zeros_like(cost), where=valid)
+    revenue = closures * revenue_per_closure
+    star_lift = np.where(valid, (gap / 100.0) * (weights / 0.10) * 0.5, 0.0)
+    star_bonus = members * quality_bonus_per_member_per_star * star_lift
+    total = revenue + star_bonus
+    roi = np.divide(total, cost, out=np.zeros_like(cost), where=valid)
+    confidence = np.clip(85.0 - 10.0 * (cost_per_closure > 200) - 5.0 * (gap > 15), 50.0, 95.0)
+
+    out["cost_per_closure"] = _round_each(cost_per_closure, 2)
+    out["estimated_closures"] = closures.astype(np.int64)
+    out["revenue_from_closures"] = _round_each(revenue, 2)
+    out["star_rating_bonus"] = _round_each(star_bonus, 2)
+    out["financial_impact_total"] = _round_each(total, 2)
+    out["roi_ratio"] = _round_each(roi, 2)
+    out["net_roi"] = np.where(valid, _round_each(total - cost, 2), 0.0)
+    out["star_lift"] = _round_each(star_lift, 4)
+    out["confidence_score"] = np.where(valid, _round_each(confidence, 1), 0.0)
+    return out
+
+
 def get_default_interventions() -> list[dict[str, Any]]:
     """Default set of available interventions for portfolio optimization."""
     return [
@@ -166,87 +254,478 @@ def get_default_interventions() -> list[dict[str, Any]]:
     ]
 
 
+def _cost_cells(
+    costs: np.ndarray, budget: float, unit: float | None
+) -> tuple[np.ndarray, int, bool]:
+    """
+    Discretize costs for the DP: (item cells, budget cells, exact).
+
+    Uses the costs' common divisor when that fits in MAX_DP_CELLS (exact);
+    otherwise budget / MAX_DP_CELLS with costs rounded up, so a selection
+    never exceeds the budget but may leave a sliver of it unused.
+    """
+    exact = True
+    if not unit:
+        whole = np.round(costs).astype(np.int64)
+        unit = float(np.gcd.reduce(whole)) if np.allclose(costs, whole) and len(whole) else 0.0
+        if unit < 1 or budget / unit > MAX_DP_CELLS:
+            unit, exact = budget / MAX_DP_CELLS, False
+    cells = np.ceil(costs / unit - 1e-9).astype(np.int64)
+    return cells, int(budget // unit), exact and np.allclose(cells * unit, costs)
+
+
+def _knapsack_dp(cells: np.ndarray, values: np.ndarray, capacity: int) -> np.ndarray:
+    """0/1 knapsack maximizing sum(values) within capacity cells; returns a selection mask."""
+    n = len(values)
+    best = np.zeros(capacity + 1)
+    keep = np.zeros((n, capacity + 1), dtype=bool)
+    for i in range(n):
+        w, v = cells[i], values[i]
+        if v <= 0 or w > capacity:
+            continue
+        candidate = best[: capacity + 1 - w] + v
+        better = candidate > best[w:]
+        keep[i, w:] = better
+        best[w:] = np.where(better, candidate, best[w:])
+
+    chosen = np.zeros(n, dtype=bool)
+    c = capacity
+    for i in range(n - 1, -1, -1):
+        if keep[i, c]:
+            chosen[i] = True
+            c -= cells[i]
+    return chosen
+
+
+def _capped_knapsack_dp(
+    cells: np.ndarray, values: np.ndarray, capacity: int, gid: np.ndarray, caps: np.ndarray
+) -> np.ndarray:
+    """
+    0/1 knapsack with at most caps[g] items from each group g (grouped knapsack).
+
+    Groups are solved one after another on top of the best totals so far;
+    inside a group the table gains a count dimension (items taken from the
+    group, up to its cap). Returns a selection mask.
+    """
+    n = len(values)
+    best = np.zeros(capacity + 1)
+    solved = []  # (items, keep[item, count, cell], count used per cell) per group
+    for g in range(len(caps)):
+        items = np.flatnonzero((gid == g) & (values > 0) & (cells <= capacity))
+        if not len(items):
+            continue
+        k = int(min(caps[g], len(items)))
+        if k <= 0:
+            continue
+        layers = np.full((k + 1, capacity + 1), -np.inf)
+        layers[0] = best
+        keep = np.zeros((len(items), k + 1, capacity + 1), dtype=bool)
+        for pos, i in enumerate(items):
+            w, v = cells[i], values[i]
+            for j in range(k, 0, -1):
+                candidate = layers[j - 1, : capacity + 1 - w] + v
+                better = candidate > layers[j, w:]
+                keep[pos, j, w:] = better
+                layers[j, w:] = np.where(better, candidate, layers[j, w:])
+        used = np.argmax(layers, axis=0)
+        best = layers[used, np.arange(capacity + 1)]
+        solved.append((items, keep, used))
+
+    chosen = np.zeros(n, dtype=bool)
+    c = capacity
+    for items, keep, used in reversed(solved):
+        j = int(used[c])
+        for pos in range(len(items) - 1, -1, -1):
+            if j and keep[pos, j, c]:
+                chosen[items[pos]] = True
+                c -= cells[items[pos]]
+                j -= 1
+    return chosen
+
+
+def _branch_and_bound(
+    values: np.ndarray,
+    costs: np.ndarray,
+    budget: float,
+    lifts: np.ndarray,
+    groups: list[tuple[np.ndarray, np.ndarray]],
+    min_lift: float,
+) -> tuple[np.ndarray | None, bool]:
+    """
+    Exact 0/1 selection with side constraints by depth-first branch-and-bound.
+
+    groups holds (group id per item, cap per group) pairs, e.g. per-measure
+    and per-channel counts. Items are branched in value-density order
+    (take first). The bound is the smaller of two relaxations of what the
+    undecided items can still add: the fractional knapsack ignoring caps,
+    and each cap family's best items per group ignoring the budget.
+
+    Returns (selection mask, exact): the mask is None when no portfolio meets
+    min_lift; exact is False when MAX_BB_NODES ran out.
+    """
+    n = len(values)
+    density = np.where(costs > 0, values / np.maximum(costs, 1e-12), -np.inf)
+    order = np.argsort(-density, kind="stable")
+    v, c, lift = values[order], costs[order], lifts[order]
+    gain = np.maximum(v, 0.0)
+    lift_left = np.concatenate([np.cumsum(np.maximum(lift, 0.0)[::-1])[::-1], [0.0]])
+
+    families = []
+    for g, caps in groups:
+        g = g[order]
+        by_gain = np.lexsort((-gain, g))  # items grouped, best gain first within a group
+        families.append((g, caps, by_gain, np.searchsorted(g[by_gain], np.arange(len(caps)))))
+    counts = [np.zeros(len(caps), dtype=np.int64) for _, caps, _, _ in families]
+
+    def bound(k: int, room: float) -> float:
+        # fractional knapsack over undecided items of groups that are not full ...
+        usable = gain[k:] > 0
+        for (g, caps, _, _), cnt in zip(families, counts):
+            usable &= cnt[g[k:]] < caps[g[k:]]
+        cost_k, gain_k = c[k:][usable], gain[k:][usable]
+        cum = np.cumsum(cost_k)
+        j = int(np.searchsorted(cum, room, side="right"))
+        total = gain_k[:j].sum()
+        if j < len(cost_k):
+            total += gain_k[j] * (room - (cum[j - 1] if j else 0.0)) / cost_k[j]
+        # ... and, ignoring the budget, each group's best items up to its remaining cap
+        for (g, caps, by_gain, starts), cnt in zip(families, counts):
+            undecided = by_gain >= k
+            ahead = np.cumsum(undecided) - undecided  # undecided items before, in this order
+            grp = g[by_gain]
+            rank = ahead - ahead[starts][grp]
+            total = min(total, gain[by_gain][undecided & (rank < (caps - cnt)[grp])].sum())
+        return float(total)
+
+    def next_takeable(k: int, spent: float, lifted: float) -> int:
+        # skipping items that cannot be taken (or, once min_lift is met, cannot
+        # add value) leaves the state unchanged
+        ok = (c[k:] > 0) & (spent + c[k:] <= budget + 1e-9)
+        if lifted >= min_lift - 1e-12:
+            ok &= v[k:] > 0
+        for (g, caps, _, _), cnt in zip(families, counts):
+            ok &= cnt[g[k:]] < caps[g[k:]]
+        return k + int(np.argmax(ok)) if ok.any() else n
+
+    take = np.zeros(n, dtype=bool)
+    best_value, best_take = -np.inf, None
+    nodes, exact = 0, True
+    stack: list[tuple] = [("visit", 0, 0.0, 0.0, 0.0)]
+    while stack:
+        frame = stack.pop()
+        if frame[0] == "undo":
+            i = frame[1]
+            take[i] = False
+            for (g, _, _, _), cnt in zip(families, counts):
+                cnt[g[i]] -= 1
+            continue
+        if frame[0] == "take":
+            _, i, spent, value, lifted = frame
+            take[i] = True
+            for (g, _, _, _), cnt in zip(families, counts):
+                cnt[g[i]] += 1
+            stack.append(("visit", i + 1, spent, value, lifted))
+            continue
+
+        _, k, spent, value, lifted = frame
+        nodes += 1
+        if nodes > MAX_BB_NODES:
+            exact = False
+            break
+        if lifted >= min_lift - 1e-12 and value > best_value:
+            best_value, best_take = value, take.copy()
+        k = next_takeable(k, spent, lifted) if k < n else n
+        if k == n or lifted + lift_left[k] < min_lift - 1e-12:
+            continue
+        if value + bound(k, budget - spent) <= best_value + 1e-9:
+            continue
+
+        stack.append(("visit", k + 1, spent, value, lifted))
+        stack.append(("undo", k))
+        stack.append(("take", k, spent + c[k], value + v[k], lifted + lift[k]))
+
+    if best_take is None:
+        return None, exact
+    chosen = np.zeros(n, dtype=bool)
+    chosen[order[best_take]] = True
+    return chosen, exact
+
+
+def _group_caps(labels: list[str], limit: Any) -> tuple[np.ndarray, np.ndarray] | None:
+    """(group id per item, cap per group) for an int (every group) or {label: int} limit."""
+    if limit is None:
+        return None
+    names, gid = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    if isinstance(limit, dict):
+        caps = np.array([limit.get(name, np.iinfo(np.int64).max) for name in names])
+    else:
+        caps = np.full(len(names), int(limit))
+    return gid, caps.astype(np.int64)
+
+
+def select_portfolio(
+    items: list[dict],
+    budget: float,
+    objective: np.ndarray,
+    constraints: dict | None = None,
+) -> dict[str, Any]:
+    """
+    Exact best subset of ``items`` for ``objective`` (one value per item) within ``budget``.
+
+    Per-measure caps are solved inside the DP (grouped knapsack); channel
+    caps and min_star_lift are checked on the DP's portfolio and fall back
+    to branch-and-bound, which stops after MAX_BB_NODES with exact=False.
+
+    constraints:
+        max_per_measure: int, or {measure: int} — interventions per target_measure
+        max_per_channel: int, or {channel: int} — interventions per channel
+            (item "channel", else intervention_type)
+        min_star_lift: float — minimum total star_lift of the portfolio
+        cost_unit: float — DP cost resolution (default: common divisor of costs)
+
+    Returns:
+        Dict with selected (mask), method ("dp" | "branch_and_bound"),
+        exact (proven optimal) and feasible (False: nothing meets the constraints)
+    """
+    constraints = constraints or {}
+    costs = np.array([float(i["intervention_cost"]) for i in items])
+    objective = np.asarray(objective, dtype=float)
+    per_measure = _group_caps(
+        [i["target_measure"] for i in items], constraints.get("max_per_measure")
+    )
+    groups = [
+        g
+        for g in (
+            per_measure,
+            _group_caps(
+                [i.get("channel") or i["intervention_type"] for i in items],
+                constraints.get("max_per_channel"),
+            ),
+        )
+        if g is not None
+    ]
+    min_lift = float(constraints.get("min_star_lift") or 0.0)
+
+    nothing = np.zeros(len(items), dtype=bool)
+    if not items or budget <= 0:
+        return {"selected": nothing, "method": "dp", "exact": True, "feasible": min_lift <= 0}
+
+    lifts = np.array([float(i.get("star_lift", 0.0)) for i in items])
+    cells, capacity, exact = _cost_cells(costs, budget, constraints.get("cost_unit"))
+    values = np.where(costs > 0, objective, 0.0)
+    if per_measure is None:
+        states = len(items)
+    else:
+        gid, caps = per_measure
+        sizes = np.bincount(gid, minlength=len(caps))
+        states = int((sizes * (np.minimum(caps, sizes) + 1)).sum())
+    if states * (capacity + 1) <= MAX_DP_STATES:
+        if per_measure is None:
+            chosen = _knapsack_dp(cells, values, capacity)
+        else:
+            chosen = _capped_knapsack_dp(cells, values, capacity, *per_measure)
+        # the DP relaxes the remaining side constraints, so a portfolio that meets them is optimal
+        within_caps = all(
+            (np.bincount(g[chosen], minlength=len(caps)) <= caps).all() for g, caps in groups
+        )
+        if within_caps and lifts[chosen].sum() >= min_lift - 1e-12:
+            return {"selected": chosen, "method": "dp", "exact": exact, "feasible": True}
+
+    chosen, exact = _branch_and_bound(objective, costs, budget, lifts, groups, min_lift)
+    return {
+        "selected": nothing if chosen is None else chosen,
+        "method": "branch_and_bound",
+        "exact": exact,
+        "feasible": chosen is not None,
+    }
+
+
+def _summarize(sel: list[dict]) -> dict[str, Any]:
+    total_cost = sum(s["intervention_cost"] for s in sel)
+    total_impact = sum(s["financial_impact_total"] for s in sel)
+    total_star = sum(s["star_rating_bonus"] for s in sel)
+    return {
+        "selected_interventions": sel,
+        "total_cost": total_cost,
+        "total_financial_impact": total_impact,
+        "total_star_rating_bonus": total_star,
+        "net_benefit": total_impact - total_cost,
+        "count": len(sel),
+    }
+
+
 def optimize_intervention_portfolio(
     budget: float,
     available_interventions: list[dict] | None = None,
     constraints: dict | None = None,
 ) -> dict[str, Any]:
-    """Given a budget, return three approaches: max_star, max_roi, balanced."""
+    """
+    Given a budget, return three optimal approaches and the Pareto front.
+
+    approach_1_max_star maximizes total star rating bonus, approach_2_max_roi
+    maximizes net benefit (impact - cost) rather than filling the budget in
+    ROI-ratio order as it used to (the key keeps its old name), and
+    approach_3_balanced maximizes an equal-weight blend of the two (each
+    scaled by its best attainable total). pareto_front lists the distinct
+    non-dominated portfolios found by sweeping that blend weight from
+    star-only to net-benefit-only; interventions lists every candidate with
+    its ROI figures.
+
+    See select_portfolio for the supported constraints.
+    """
     constraints = constraints or {}
     interventions = available_interventions or get_default_interventions()
 
-    computed = []
-    for i in interventions:
-        roi = calculate_intervention_roi(
-            intervention_type=i["intervention_type"],
-            target_measure=i["target_measure"],
-            expected_gap_closure=i["expected_gap_closure"],
-            intervention_cost=i["intervention_cost"],
-            member_count=i["member_count"],
-        )
-        computed.append(
+    columns = [
+        "roi_ratio",
+        "net_roi",
+        "financial_impact_total",
+        "star_rating_bonus",
+        "star_lift",
+        "cost_per_closure",
+        "confidence_score",
+    ]
+    scored = calculate_intervention_roi_frame(
+        pd.DataFrame(
             {
-                **i,
-                "roi_ratio": roi["roi_ratio"],
-                "net_roi": roi["net_roi"],
-                "financial_impact_total": roi["financial_impact"]["total"],
-                "star_rating_bonus": roi["star_rating_bonus_impact"],
-                "confidence_score": roi["confidence_score"],
+                k: [i[k] for i in interventions]
+                for k in (
+                    "target_measure",
+                    "expected_gap_closure",
+                    "intervention_cost",
+                    "member_count",
+                )
             }
         )
+    )[columns]
+    computed = [
+        {**i, **dict(zip(columns, row))}
+        for i, row in zip(interventions, zip(*(scored[c].tolist() for c in columns)))
+    ]
 
-    def select_by_budget(items: list[dict], sort_key: str, budget_limit: float) -> list[dict]:
-        selected = []
-        remaining = budget_limit
-        for item in sorted(items, key=lambda x: -x.get(sort_key, 0)):
-            cost = item["intervention_cost"]
-            if cost <= remaining and cost > 0:
-                selected.append(item)
-                remaining -= cost
-        return selected
-
-    by_star = sorted(
-        computed,
-        key=lambda x: (
-            -(
-                x.get("star_rating_bonus", 0)
-                or x.get("star_weight", 0) * x["financial_impact_total"]
-            )
-        ),
-    )
-    selected_star = select_by_budget(by_star, "star_rating_bonus", budget)
-    by_roi = sorted(computed, key=lambda x: -x["roi_ratio"])
-    selected_roi = select_by_budget(by_roi, "roi_ratio", budget)
-    quick_wins = sorted(computed, key=lambda x: -x["roi_ratio"])[:4]
-    strategic = sorted(computed, key=lambda x: -(x.get("star_rating_bonus", 0)))[:4]
-    combined = list({c["id"]: c for c in quick_wins + strategic}.values())
-    selected_balanced = []
-    remaining = budget
-
-    def _balanced_key(x):
-        return (-x["roi_ratio"], -(x.get("star_rating_bonus") or 0))
-
-    for item in sorted(combined, key=_balanced_key):
-        if item["intervention_cost"] <= remaining and item["intervention_cost"] > 0:
-            selected_balanced.append(item)
-            remaining -= item["intervention_cost"]
-
-    def sum_selected(sel: list[dict]) -> dict:
-        total_cost = sum(s["intervention_cost"] for s in sel)
-        total_impact = sum(s["financial_impact_total"] for s in sel)
-        total_star = sum(s["star_rating_bonus"] for s in sel)
-        return {
-            "selected_interventions": sel,
-            "total_cost": total_cost,
-            "total_financial_impact": total_impact,
-            "total_star_rating_bonus": total_star,
-            "net_benefit": total_impact - total_cost,
-            "count": len(sel),
-        }
+    star = scored["star_rating_bonus"].to_numpy(dtype=float)
+    net = scored["net_roi"].to_numpy(dtype=float)
+    # the single-objective optima (a sliver of the other objective breaks ties
+    # toward non-dominated portfolios) also put both on a common 0-1 scale
+    solved = {
+        1.0: select_portfolio(computed, budget, star + 1e-6 * net, constraints),
+        0.0: select_portfolio(computed, budget, net + 1e-6 * star, constraints),
+    }
+    star_scale = max(star[solved[1.0]["selected"]].sum(), 1e-9)
+    net_scale = max(net[solved[0.0]["selected"]].sum(), 1e-9)
+
+    def solve(weight: float) -> dict:
+        # weight 1 = stars only, 0 = net benefit only
+        if weight not in solved:
+            objective = weight * star / star_scale + (1 - weight) * net / net_scale
+            solved[weight] = select_portfolio(computed, budget, objective, constraints)
+        return solved[weight]
+
+    front: dict[tuple, dict] = {}
+    for weight in np.linspace(1.0, 0.0, PARETO_POINTS):
+        result = solve(float(weight))
+        key = tuple(np.flatnonzero(result["selected"]))
+        if key not in front:
+            front[key] = {
+                "star_weight": round(float(weight), 3),
+                **_summarize([computed[k] for k in key]),
+            }
+    pareto = [
+        p
+        for p in front.values()
+        if not any(
+            q["total_star_rating_bonus"] >= p["total_star_rating_bonus"]
+            and q["net_benefit"] >= p["net_benefit"]
+            and (q["total_star_rating_bonus"], q["net_benefit"])
+            != (p["total_star_rating_bonus"], p["net_benefit"])
+            for q in front.values()
+        )
+    ]
+
+    def picked(weight: float) -> list[dict]:
+        return [c for c, keep in zip(computed, solve(weight)["selected"]) if keep]
 
     return {
         "budget": budget,
-        "approach_1_max_star": sum_selected(selected_star),
-        "approach_2_max_roi": sum_selected(selected_roi),
-        "approach_3_balanced": sum_selected(selected_balanced),
+        "approach_1_max_star": _summarize(picked(1.0)),
+        "approach_2_max_roi": _summarize(picked(0.0)),
+        "approach_3_balanced": _summarize(picked(0.5)),
+        "pareto_front": pareto,
+        "interventions": computed,
+        "solver": {
+            "method": solved[1.0]["method"],
+            "exact": all(r["exact"] for r in solved.values()),
+            "feasible": solved[1.0]["feasible"],
+            "candidates": len(computed),
+        },
     }
+
+
+def portfolio_cache_key(
+    budget: float, version: Any, constraints: dict | None
+) -> tuple[float, Any, str]:
+    """(budget, candidate-set version, constraints) identifying one optimization."""
+    return (
+        round(float(budget), 2),
+        version,
+        json.dumps(constraints or {}, sort_keys=True, default=repr),
+    )
+
+
+def optimize_intervention_portfolio_cached(
+    budget: float,
+    available_interventions: list[dict] | None = None,
+    constraints: dict | None = None,
+    version: Any = None,
+) -> dict[str, Any]:
+    """
+    optimize_intervention_portfolio through a process-wide LRU memo.
+
+    The default candidate set is always memoized. A caller passing its own
+    candidates identifies them with ``version`` (e.g. the data load
+    timestamp, or row count plus max id); without one the call is solved
+    uncached. Each caller gets its own deep copy of the result.
+    """
+    if available_interventions is not None and version is None:
+        return optimize_intervention_portfolio(budget, available_interventions, constraints)
+
+    key = portfolio_cache_key(
+        budget, "default" if available_interventions is None else version, constraints
+    )
+    with _optimizer_lock:
+        result = _optimizer_cache.get(key)
+        if result is not None:
+            _optimizer_cache.move_to_end(key)
+            _optimizer_stats["hits"] += 1
+            return copy.deepcopy(result)
+        _optimizer_stats["misses"] += 1
+
+    result = optimize_intervention_portfolio(budget, available_interventions, constraints)
+    with _optimizer_lock:
+        _optimizer_cache[key] = copy.deepcopy(result)
+        _optimizer_cache.move_to_end(key)
+        while len(_optimizer_cache) > OPTIMIZER_CACHE_SIZE:
+            _optimizer_cache.popitem(last=False)
+            _optimizer_stats["evictions"] += 1
+    return result
+
+
+def clear_optimizer_cache() -> int:
+    """Drop every memoized optimization (e.g. after the candidate source changes)."""
+    with _optimizer_lock:
+        n = len(_optimizer_cache)
+        _optimizer_cache.clear()
+        _optimizer_stats["evictions"] += n
+        return n
+
+
+def optimizer_cache_stats() -> dict[str, Any]:
+    """Hit/miss/eviction counters for the optimizer memo."""
+    with _optimizer_lock:
+        total = _optimizer_stats["hits"] + _optimizer_stats["misses"]
+        return {
+            **_optimizer_stats,
+            "size": len(_optimizer_cache),
+            "max_entries": OPTIMIZER_CACHE_SIZE,
+            "hit_rate": round(_optimizer_stats["hits"] / total, 3) if total else 0.0,
+        }
@@ -6,6 +6,8 @@ _HISTORICAL_CLOSURE_BENCHMARKS = {
     "max_closure_rate_per_quarter": 0.12,
     "min_realistic_months_per_10_pct_gap": 2,
 }
+# Highest share of open gaps historically closed in one quarter
+MAX_CLOSURE_RATE_PER_QUARTER = _HISTORICAL_CLOSURE_BENCHMARKS["max_closure_rate_per_quarter"]
 
 
 def get_gap_analysis(measure_id: str, start_date: str, end_date: str) -> dict:
@@ -1,105 +1,343 @@
 """
 Phase 4 Dashboard - Phase 3 Demo Queries
 SQL queries for Phase 3 ROI analysis visualizations
+
+Every query is a constant SQL text with bound parameters (:start_date,
+:end_date, :min_uses) registered in NAMED_QUERIES. The SQL text never
+changes with the date range, so SQLAlchemy's compiled cache, Postgres
+prepared statements and the data.db result cache all key on one statement.
+
+Each query is rendered once per dialect (utils.sql_dialect) so the same
+registry entry runs natively on SQLite and PostgreSQL. Queries over
+member_interventions also have a rollup rendering that reads the daily
+aggregates in data.rollups; it is used whenever rollup_ready() is True.
+
+Execute by name:      query("roi_by_measure", {"start_date": ..., "end_date": ...})
+Or via the builders:  query(get_roi_by_measure_query(start, end))
 """
 
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import TextClause, text
+
+from utils.sql_dialect import DIALECTS, count_if, month_key, month_start, round_to, sum_if
+
+SOURCES = ("base", "rollup")
+
+DEFAULT_START_DATE = "2024-10-01"
+DEFAULT_END_DATE = "2024-12-31"
+
+# name -> {"sql": {dialect: str}, "rollup_sql": {dialect: str} | None,
+#          "defaults": dict, "schema": {column: pyarrow type name}}
+# populated by _register() below; "schema" types query(..., arrow=True) results
+NAMED_QUERIES: dict[str, dict[str, Any]] = {}
+
+
+def _register(
+    name: str,
+    build: Callable[[str], str],
+    rollup: Callable[[str], str] | None = None,
+    *,
+    schema: dict[str, str],
+    **defaults: Any,
+) -> None:
+    NAMED_QUERIES[name] = {
+        "sql": {d: build(d) for d in DIALECTS},
+        "rollup_sql": {d: rollup(d) for d in DIALECTS} if rollup else None,
+        "defaults": {"start_date": DEFAULT_START_DATE, "end_date": DEFAULT_END_DATE, **defaults},
+        "schema": schema,
+    }
+
+
+def _active_dialect() -> str:
+    from data.db import get_db_type
+
+    return get_db_type()
+
+
+def get_named_query(name: str) -> dict[str, Any]:
+    """Return the registry entry for ``name``; raises KeyError for unknown names."""
+    try:
+        return NAMED_QUERIES[name]
+    except KeyError:
+        raise KeyError(f"Unknown named query: {name!r}") from None
+
 
-def get_roi_by_measure_query(start_date: str = "2024-10-01", end_date: str = "2024-12-31") -> str:
+def _rollup_ready() -> bool:
+    from data.rollups import rollup_ready
+
+    return rollup_ready()
+
+
+def get_named_sql(name: str, dialect: str | None = None, source: str | None = None) -> str:
     """
-    Query 1: ROI by Measure (Bar Chart)
-    Returns: measure_code, measure_name, total_investment, revenue_impact, roi_ratio, successful_closures, total_interventions
+    SQL text of ``name`` for ``dialect`` (defaults to the active database).
+
+    source: "base" reads member_interventions, "rollup" reads mi_daily_rollup;
+    None picks the rollup when the query has one and data.rollups is ready.
     """
+    entry = get_named_query(name)
+    if source is None:
+        source = "rollup" if entry["rollup_sql"] and _rollup_ready() else "base"
+    if source not in SOURCES:
+        raise ValueError(f"Unknown query source: {source!r}")
+    variants = entry["rollup_sql"] if source == "rollup" else entry["sql"]
+    if variants is None:
+        raise KeyError(f"Named query {name!r} has no rollup rendering")
+    return variants[dialect or _active_dialect()]
+
+
+def find_query_name(sql: str) -> str | None:
+    """Reverse lookup: registry name whose SQL text (any dialect/source) matches ``sql``."""
+    target = " ".join(sql.split())
+    for name, entry in NAMED_QUERIES.items():
+        for variants in (entry["sql"], entry["rollup_sql"] or {}):
+            if any(" ".join(v.split()) == target for v in variants.values()):
+                return name
+    return None
+
+
+def bind_named_query(
+    name: str, dialect: str | None = None, source: str | None = None, **params: Any
+) -> TextClause:
+    """Build a text() statement for ``name`` with defaults overlaid by ``params``."""
+    entry = get_named_query(name)
+    sql = get_named_sql(name, dialect, source)
+    return text(sql).bindparams(**{**entry["defaults"], **params})
+
+
+def _roi_by_measure_sql(d: str) -> str:
+    done = "mi.status = 'completed'"
+    invested = sum_if("mi.cost_per_intervention", done, d)
+    closures = count_if(done, d)
     return f"""
         SELECT
             mi.measure_id as measure_code,
             hm.measure_name,
-            ROUND(SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed'), 2) as total_investment,
-            COUNT(*) FILTER (WHERE mi.status = 'completed') * 100.0 as revenue_impact,
+            {round_to(invested, 2, d)} as total_investment,
+            {closures} * 100.0 as revenue_impact,
             CASE
-                WHEN SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed') > 0
-                THEN ROUND((COUNT(*) FILTER (WHERE mi.status = 'completed') * 100.0) /
-                           SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed'), 2)
+                WHEN {invested} > 0
+                THEN {round_to(f"({closures} * 100.0) / {invested}", 2, d)}
                 ELSE 0
             END as roi_ratio,
-            COUNT(*) FILTER (WHERE mi.status = 'completed') as successful_closures,
+            {closures} as successful_closures,
             COUNT(*) as total_interventions
         FROM member_interventions mi
         LEFT JOIN hedis_measures hm ON mi.measure_id = hm.measure_id
-        WHERE mi.intervention_date >= '{start_date}'
-        AND mi.intervention_date <= '{end_date}'
+        WHERE mi.intervention_date >= :start_date
+        AND mi.intervention_date <= :end_date
         GROUP BY mi.measure_id, hm.measure_name
         ORDER BY roi_ratio DESC;
     """
 
 
-def get_cost_per_closure_by_activity_query(
-    start_date: str = "2024-10-01", end_date: str = "2024-12-31", min_uses: int = 10
-) -> str:
+def _roi_by_measure_rollup_sql(d: str) -> str:
+    done = "r.status = 'completed'"
+    invested = sum_if("r.cost_sum", done, d)
+    closures = f"SUM(CASE WHEN {done} THEN r.intervention_count ELSE 0 END)"
+    return f"""
+        SELECT
+            r.measure_id as measure_code,
+            hm.measure_name,
+            {round_to(invested, 2, d)} as total_investment,
+            {closures} * 100.0 as revenue_impact,
+            CASE
+                WHEN {invested} > 0
+                THEN {round_to(f"({closures} * 100.0) / {invested}", 2, d)}
+                ELSE 0
+            END as roi_ratio,
+            {closures} as successful_closures,
+            SUM(r.intervention_count) as total_interventions
+        FROM mi_daily_rollup r
+        LEFT JOIN hedis_measures hm ON r.measure_id = hm.measure_id
+        WHERE r.day >= :start_date
+        AND r.day <= :end_date
+        AND (r.day < :end_date OR r.has_time = 0)
+        GROUP BY r.measure_id, hm.measure_name
+        ORDER BY roi_ratio DESC;
     """
-    Query 2: Cost per Closure by Activity (Scatter Plot)
-    Returns: activity_name, avg_cost, success_rate, times_used, successful_closures, cost_per_closure
+
+
+_register(
+    "roi_by_measure",
+    _roi_by_measure_sql,
+    _roi_by_measure_rollup_sql,
+    schema={
+        "measure_code": "string",
+        "measure_name": "string",
+        "total_investment": "float64",
+        "revenue_impact": "float64",
+        "roi_ratio": "float64",
+        "successful_closures": "int64",
+        "total_interventions": "int64",
+    },
+)
+
+
+def get_roi_by_measure_query(
+    start_date: str = "2024-10-01", end_date: str = "2024-12-31", dialect: str | None = None
+) -> TextClause:
+    """
+    Query 1: ROI by Measure (Bar Chart)
+    Returns: measure_code, measure_name, total_investment, revenue_impact, roi_ratio, successful_closures, total_interventions
     """
+    return bind_named_query("roi_by_measure", dialect, start_date=start_date, end_date=end_date)
+
+
+def _cost_per_closure_by_activity_sql(d: str) -> str:
+    done = "mi.status = 'completed'"
+    closures = count_if(done, d)
     return f"""
         SELECT
             ia.activity_name,
-            ROUND(AVG(CASE WHEN mi.status = 'completed' THEN mi.cost_per_intervention ELSE NULL END), 2) as avg_cost,
+            {round_to(f"AVG(CASE WHEN {done} THEN mi.cost_per_intervention ELSE NULL END)", 2, d)} as avg_cost,
             COUNT(*) as times_used,
-            SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END) as successful_closures,
-            ROUND(
-                CAST(SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END) AS REAL) * 100.0 /
-                NULLIF(COUNT(*), 0),
-                1
-            ) as success_rate,
-            ROUND(
-                SUM(CASE WHEN mi.status = 'completed' THEN mi.cost_per_intervention ELSE 0 END) /
-                NULLIF(SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END), 0),
-                2
-            ) as cost_per_closure
+            {closures} as successful_closures,
+            {round_to(f"{closures} * 100.0 / NULLIF(COUNT(*), 0)", 1, d)} as success_rate,
+            {round_to(f"SUM(CASE WHEN {done} THEN mi.cost_per_intervention ELSE 0 END) / NULLIF({closures}, 0)", 2, d)} as cost_per_closure
         FROM member_interventions mi
         INNER JOIN intervention_activities ia ON mi.activity_id = ia.activity_id
-        WHERE mi.intervention_date >= '{start_date}'
-        AND mi.intervention_date <= '{end_date}'
+        WHERE mi.intervention_date >= :start_date
+        AND mi.intervention_date <= :end_date
         GROUP BY ia.activity_id, ia.activity_name
-        HAVING COUNT(*) >= {min_uses}
+        HAVING COUNT(*) >= :min_uses
         ORDER BY avg_cost ASC;
     """
 
 
-def get_monthly_intervention_trend_query(
-    start_date: str = "2024-10-01", end_date: str = "2024-12-31"
-) -> str:
+def _cost_per_closure_by_activity_rollup_sql(d: str) -> str:
+    done = "r.status = 'completed'"
+    closures = f"SUM(CASE WHEN {done} THEN r.intervention_count ELSE 0 END)"
+    return f"""
+        SELECT
+            ia.activity_name,
+            {round_to(f"{sum_if('r.cost_sum', done, d)} * 1.0 / NULLIF({closures}, 0)", 2, d)} as avg_cost,
+            SUM(r.intervention_count) as times_used,
+            {closures} as successful_closures,
+            {round_to(f"{closures} * 100.0 / NULLIF(SUM(r.intervention_count), 0)", 1, d)} as success_rate,
+            {round_to(f"SUM(r.completed_cost_sum) / NULLIF({closures}, 0)", 2, d)} as cost_per_closure
+        FROM mi_daily_rollup r
+        INNER JOIN intervention_activities ia ON r.activity_id = ia.activity_id
+        WHERE r.day >= :start_date
+        AND r.day <= :end_date
+        AND (r.day < :end_date OR r.has_time = 0)
+        GROUP BY ia.activity_id, ia.activity_name
+        HAVING SUM(r.intervention_count) >= :min_uses
+        ORDER BY avg_cost ASC;
     """
-    Query 3: Monthly Intervention Trend (Line Chart)
-    Returns: month, month_start, total_interventions, successful_closures, avg_cost, success_rate, total_investment
+
+
+_register(
+    "cost_per_closure_by_activity",
+    _cost_per_closure_by_activity_sql,
+    _cost_per_closure_by_activity_rollup_sql,
+    schema={
+        "activity_name": "string",
+        "avg_cost": "float64",
+        "times_used": "int64",
+        "successful_closures": "int64",
+        "success_rate": "float64",
+        "cost_per_closure": "float64",
+    },
+    min_uses=10,
+)
+
+
+def get_cost_per_closure_by_activity_query(
+    start_date: str = "2024-10-01",
+    end_date: str = "2024-12-31",
+    min_uses: int = 10,
+    dialect: str | None = None,
+) -> TextClause:
     """
+    Query 2: Cost per Closure by Activity (Scatter Plot)
+    Returns: activity_name, avg_cost, success_rate, times_used, successful_closures, cost_per_closure
+    """
+    return bind_named_query(
+        "cost_per_closure_by_activity",
+        dialect,
+        start_date=start_date,
+        end_date=end_date,
+        min_uses=min_uses,
+    )
+
+
+def _monthly_intervention_trend_sql(d: str) -> str:
+    done = "mi.status = 'completed'"
+    closures = count_if(done, d)
+    month = month_key("mi.intervention_date", d)
+    start = month_start("mi.intervention_date", d)
     return f"""
         SELECT
-            strftime('%Y-%m', mi.intervention_date) as month,
-            date(mi.intervention_date, 'start of month') as month_start,
+            {month} as month,
+            {start} as month_start,
             COUNT(*) as total_interventions,
-            SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END) as successful_closures,
-            ROUND(AVG(mi.cost_per_intervention), 2) as avg_cost,
-            ROUND(
-                CAST(SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END) AS REAL) * 100.0 /
-                NULLIF(COUNT(*), 0),
-                1
-            ) as success_rate,
-            ROUND(SUM(CASE WHEN mi.status = 'completed' THEN mi.cost_per_intervention ELSE 0 END), 2) as total_investment
+            {closures} as successful_closures,
+            {round_to("AVG(mi.cost_per_intervention)", 2, d)} as avg_cost,
+            {round_to(f"{closures} * 100.0 / NULLIF(COUNT(*), 0)", 1, d)} as success_rate,
+            {round_to(f"SUM(CASE WHEN {done} THEN mi.cost_per_intervention ELSE 0 END)", 2, d)} as total_investment
         FROM member_interventions mi
-        WHERE mi.intervention_date >= '{start_date}'
-        AND mi.intervention_date <= '{end_date}'
-        GROUP BY date(mi.intervention_date, 'start of month'), strftime('%Y-%m', mi.intervention_date)
+        WHERE mi.intervention_date >= :start_date
+        AND mi.intervention_date <= :end_date
+        GROUP BY {start}, {month}
         ORDER BY month_start ASC;
     """
 
 
-def get_budget_variance_by_measure_query(
-    start_date: str = "2024-10-01", end_date: str = "2024-12-31"
-) -> str:
+def _monthly_intervention_trend_rollup_sql(d: str) -> str:
+    closures = "SUM(CASE WHEN r.status = 'completed' THEN r.intervention_count ELSE 0 END)"
+    month = month_key("r.day", d)
+    start = month_start("r.day", d)
+    return f"""
+        SELECT
+            {month} as month,
+            {start} as month_start,
+            SUM(r.intervention_count) as total_interventions,
+            {closures} as successful_closures,
+            {round_to("SUM(r.cost_sum) * 1.0 / NULLIF(SUM(r.intervention_count), 0)", 2, d)} as avg_cost,
+            {round_to(f"{closures} * 100.0 / NULLIF(SUM(r.intervention_count), 0)", 1, d)} as success_rate,
+            {round_to("SUM(r.completed_cost_sum)", 2, d)} as total_investment
+        FROM mi_daily_rollup r
+        WHERE r.day >= :start_date
+        AND r.day <= :end_date
+        AND (r.day < :end_date OR r.has_time = 0)
+        GROUP BY {start}, {month}
+        ORDER BY month_start ASC;
     """
-    Query 4: Budget Variance by Measure (Variance Chart)
-    Returns: measure_code, measure_name, budget_allocated, actual_spent, variance, variance_pct, budget_status
+
+
+_register(
+    "monthly_intervention_trend",
+    _monthly_intervention_trend_sql,
+    _monthly_intervention_trend_rollup_sql,
+    schema={
+        "month": "string",
+        "month_start": "date32",
+        "total_interventions": "int64",
+        "successful_closures": "int64",
+        "avg_cost": "float64",
+        "success_rate": "float64",
+        "total_investment": "float64",
+    },
+)
+
+
+def get_monthly_intervention_trend_query(
+    start_date: str = "2024-10-01", end_date: str = "2024-12-31", dialect: str | None = None
+) -> TextClause:
     """
+    Query 3: Monthly Intervention Trend (Line Chart)
+    Returns: month, month_start, total_interventions, successful_closures, avg_cost, success_rate, total_investment
+    """
+    return bind_named_query(
+        "monthly_intervention_trend", dialect, start_date=start_date, end_date=end_date
+    )
+
+
+def _budget_variance_by_measure_sql(d: str) -> str:
+    spent = "COALESCE(SUM(as_spend.amount_spent), 0)"
     return f"""
         SELECT
             measure_code,
@@ -114,12 +352,12 @@ def get_budget_variance_by_measure_query(
                 ba.measure_id as measure_code,
                 hm.measure_name,
                 ba.budget_amount as budget_allocated,
-                COALESCE(SUM(as_spend.amount_spent), 0) as actual_spent,
-                COALESCE(SUM(as_spend.amount_spent), 0) - ba.budget_amount as variance,
-                ROUND(((COALESCE(SUM(as_spend.amount_spent), 0) - ba.budget_amount) / NULLIF(ba.budget_amount, 0)) * 100, 1) as variance_pct,
+                {spent} as actual_spent,
+                {spent} - ba.budget_amount as variance,
+                {round_to(f"(({spent} - ba.budget_amount) * 1.0 / NULLIF(ba.budget_amount, 0)) * 100", 1, d)} as variance_pct,
                 CASE
-                    WHEN COALESCE(SUM(as_spend.amount_spent), 0) > ba.budget_amount THEN 'Over Budget'
-                    WHEN COALESCE(SUM(as_spend.amount_spent), 0) < ba.budget_amount THEN 'Under Budget'
+                    WHEN {spent} > ba.budget_amount THEN 'Over Budget'
+                    WHEN {spent} < ba.budget_amount THEN 'Under Budget'
                     ELSE 'On Budget'
                 END as budget_status
             FROM budget_allocations ba
@@ -127,21 +365,45 @@ def get_budget_variance_by_measure_query(
             LEFT JOIN actual_spending as_spend ON ba.measure_id = as_spend.measure_id
                 AND as_spend.spending_date >= ba.period_start
                 AND as_spend.spending_date <= ba.period_end
-            WHERE ba.period_start >= '{start_date}'
-            AND ba.period_end <= '{end_date}'
+            WHERE ba.period_start >= :start_date
+            AND ba.period_end <= :end_date
             GROUP BY ba.measure_id, hm.measure_name, ba.budget_amount, ba.period_start, ba.period_end
         ) subquery
         ORDER BY ABS(variance_pct) DESC;
     """
 
 
-def get_cost_tier_comparison_query(
-    start_date: str = "2024-10-01", end_date: str = "2024-12-31"
-) -> str:
+_register(
+    "budget_variance_by_measure",
+    _budget_variance_by_measure_sql,
+    schema={
+        "measure_code": "string",
+        "measure_name": "string",
+        "budget_allocated": "float64",
+        "actual_spent": "float64",
+        "variance": "float64",
+        "variance_pct": "float64",
+        "budget_status": "string",
+    },
+)
+
+
+def get_budget_variance_by_measure_query(
+    start_date: str = "2024-10-01", end_date: str = "2024-12-31", dialect: str | None = None
+) -> TextClause:
     """
-    Query 5: Cost Tier Comparison (Grouped Bar Chart)
-    Returns: cost_tier, avg_cost, success_rate, interventions_count, successful_closures, total_investment, cost_per_closure
+    Query 4: Budget Variance by Measure (Variance Chart)
+    Returns: measure_code, measure_name, budget_allocated, actual_spent, variance, variance_pct, budget_status
     """
+    return bind_named_query(
+        "budget_variance_by_measure", dialect, start_date=start_date, end_date=end_date
+    )
+
+
+def _cost_tier_comparison_sql(d: str) -> str:
+    done = "status = 'completed'"
+    closures = count_if(done, d)
+    completed_cost = f"SUM(CASE WHEN {done} THEN cost_per_intervention ELSE 0 END)"
     return f"""
         WITH tiered_interventions AS (
             SELECT
@@ -152,25 +414,17 @@ def get_cost_tier_comparison_query(
                     ELSE 'High Touch'
                 END as cost_tier
             FROM member_interventions mi
-            WHERE mi.intervention_date >= '{start_date}'
-            AND mi.intervention_date <= '{end_date}'
+            WHERE mi.intervention_date >= :start_date
+            AND mi.intervention_date <= :end_date
         )
         SELECT
             cost_tier,
             COUNT(intervention_id) as interventions_count,
-            SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as successful_closures,
-            ROUND(AVG(cost_per_intervention), 2) as avg_cost,
-            ROUND(
-                CAST(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS REAL) * 100.0 /
-                NULLIF(COUNT(intervention_id), 0),
-                1
-            ) as success_rate,
-            ROUND(SUM(CASE WHEN status = 'completed' THEN cost_per_intervention ELSE 0 END), 2) as total_investment,
-            ROUND(
-                SUM(CASE WHEN status = 'completed' THEN cost_per_intervention ELSE 0 END) /
-                NULLIF(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END), 0),
-                2
-            ) as cost_per_closure
+            {closures} as successful_closures,
+            {round_to("AVG(cost_per_intervention)", 2, d)} as avg_cost,
+            {round_to(f"{closures} * 100.0 / NULLIF(COUNT(intervention_id), 0)", 1, d)} as success_rate,
+            {round_to(completed_cost, 2, d)} as total_investment,
+            {round_to(f"{completed_cost} / NULLIF({closures}, 0)", 2, d)} as cost_per_closure
         FROM tiered_interventions
         GROUP BY cost_tier
         ORDER BY
@@ -182,33 +436,127 @@ def get_cost_tier_comparison_query(
     """
 
 
-def get_portfolio_summary_query(
-    start_date: str = "2024-10-01", end_date: str = "2024-12-31"
-) -> str:
+def _cost_tier_comparison_rollup_sql(d: str) -> str:
+    closures = "SUM(CASE WHEN r.status = 'completed' THEN r.intervention_count ELSE 0 END)"
+    return f"""
+        SELECT
+            r.cost_tier,
+            SUM(r.intervention_count) as interventions_count,
+            {closures} as successful_closures,
+            {round_to("SUM(r.cost_sum) * 1.0 / NULLIF(SUM(r.intervention_count), 0)", 2, d)} as avg_cost,
+            {round_to(f"{closures} * 100.0 / NULLIF(SUM(r.intervention_count), 0)", 1, d)} as success_rate,
+            {round_to("SUM(r.completed_cost_sum)", 2, d)} as total_investment,
+            {round_to(f"SUM(r.completed_cost_sum) / NULLIF({closures}, 0)", 2, d)} as cost_per_closure
+        FROM mi_daily_rollup r
+        WHERE r.day >= :start_date
+        AND r.day <= :end_date
+        AND (r.day < :end_date OR r.has_time = 0)
+        GROUP BY r.cost_tier
+        ORDER BY
+            CASE r.cost_tier
+                WHEN 'Low Touch' THEN 1
+                WHEN 'Medium Touch' THEN 2
+                WHEN 'High Touch' THEN 3
+            END;
     """
-    Get overall portfolio KPIs for home page
-    Returns: total_investment, total_closures, avg_roi, net_benefit
+
+
+_register(
+    "cost_tier_comparison",
+    _cost_tier_comparison_sql,
+    _cost_tier_comparison_rollup_sql,
+    schema={
+        "cost_tier": "string",
+        "interventions_count": "int64",
+        "successful_closures": "int64",
+        "avg_cost": "float64",
+        "success_rate": "float64",
+        "total_investment": "float64",
+        "cost_per_closure": "float64",
+    },
+)
+
+
+def get_cost_tier_comparison_query(
+    start_date: str = "2024-10-01", end_date: str = "2024-12-31", dialect: str | None = None
+) -> TextClause:
+    """
+    Query 5: Cost Tier Comparison (Grouped Bar Chart)
+    Returns: cost_tier, avg_cost, success_rate, interventions_count, successful_closures, total_investment, cost_per_closure
     """
+    return bind_named_query(
+        "cost_tier_comparison", dialect, start_date=start_date, end_date=end_date
+    )
+
+
+def _portfolio_summary_sql(d: str) -> str:
+    done = "mi.status = 'completed'"
+    invested = sum_if("mi.cost_per_intervention", done, d)
+    closures = count_if(done, d)
     return f"""
         SELECT
-            ROUND(SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed'), 2) as total_investment,
-            COUNT(*) FILTER (WHERE mi.status = 'completed') as total_closures,
-            COUNT(*) FILTER (WHERE mi.status = 'completed') * 100.0 as revenue_impact,
+            {round_to(invested, 2, d)} as total_investment,
+            {closures} as total_closures,
+            {closures} * 100.0 as revenue_impact,
             CASE
-                WHEN SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed') > 0
-                THEN ROUND((COUNT(*) FILTER (WHERE mi.status = 'completed') * 100.0) /
-                           SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed'), 2)
+                WHEN {invested} > 0
+                THEN {round_to(f"({closures} * 100.0) / {invested}", 2, d)}
                 ELSE 0
             END as roi_ratio,
-            (COUNT(*) FILTER (WHERE mi.status = 'completed') * 100.0) -
-            SUM(mi.cost_per_intervention) FILTER (WHERE mi.status = 'completed') as net_benefit,
+            ({closures} * 100.0) - {invested} as net_benefit,
             COUNT(*) as total_interventions,
-            ROUND(
-                CAST(SUM(CASE WHEN mi.status = 'completed' THEN 1 ELSE 0 END) AS REAL) * 100.0 /
-                NULLIF(COUNT(*), 0),
-                1
-            ) as overall_success_rate
+            {round_to(f"{closures} * 100.0 / NULLIF(COUNT(*), 0)", 1, d)} as overall_success_rate
         FROM member_interventions mi
-        WHERE mi.intervention_date >= '{start_date}'
-        AND mi.intervention_date <= '{end_date}';
+        WHERE mi.intervention_date >= :start_date
+        AND mi.intervention_date <= :end_date;
+    """
+
+
+def _portfolio_summary_rollup_sql(d: str) -> str:
+    done = "r.status = 'completed'"
+    invested = sum_if("r.cost_sum", done, d)
+    closures = f"SUM(CASE WHEN {done} THEN r.intervention_count ELSE 0 END)"
+    return f"""
+        SELECT
+            {round_to(invested, 2, d)} as total_investment,
+            {closures} as total_closures,
+            {closures} * 100.0 as revenue_impact,
+            CASE
+                WHEN {invested} > 0
+                THEN {round_to(f"({closures} * 100.0) / {invested}", 2, d)}
+                ELSE 0
+            END as roi_ratio,
+            ({closures} * 100.0) - {invested} as net_benefit,
+            SUM(r.intervention_count) as total_interventions,
+            {round_to(f"{closures} * 100.0 / NULLIF(SUM(r.intervention_count), 0)", 1, d)} as overall_success_rate
+        FROM mi_daily_rollup r
+        WHERE r.day >= :start_date
+        AND r.day <= :end_date
+        AND (r.day < :end_date OR r.has_time = 0);
+    """
+
+
+_register(
+    "portfolio_summary",
+    _portfolio_summary_sql,
+    _portfolio_summary_rollup_sql,
+    schema={
+        "total_investment": "float64",
+        "total_closures": "int64",
+        "revenue_impact": "float64",
+        "roi_ratio": "float64",
+        "net_benefit": "float64",
+        "total_interventions": "int64",
+        "overall_success_rate": "float64",
+    },
+)
+
+
+def get_portfolio_summary_query(
+    start_date: str = "2024-10-01", end_date: str = "2024-12-31", dialect: str | None = None
+) -> TextClause:
+    """
+    Get overall portfolio KPIs for home page
+    Returns: total_investment, total_closures, avg_roi, net_benefit
     """
+    return bind_named_query("portfolio_summary", dialect, start_date=start_date, end_date=end_date)
@@ -0,0 +1,55 @@
+"""
+SQL dialect helpers for the dashboard query registry
+Emits the native form of each aggregate for the active engine:
+FILTER / date_trunc on PostgreSQL, CASE / strftime on SQLite
+"""
+
+DIALECTS = ("sqlite", "postgres")
+
+
+def _check(dialect: str) -> str:
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unsupported SQL dialect: {dialect!r} (expected one of {DIALECTS})")
+    return dialect
+
+
+def count_if(cond: str, dialect: str) -> str:
+    """COUNT of rows matching ``cond`` (0 when none match)."""
+    if _check(dialect) == "postgres":
+        return f"COUNT(*) FILTER (WHERE {cond})"
+    return f"SUM(CASE WHEN {cond} THEN 1 ELSE 0 END)"
+
+
+def sum_if(expr: str, cond: str, dialect: str) -> str:
+    """SUM of ``expr`` over rows matching ``cond`` (NULL when none match, like FILTER)."""
+    if _check(dialect) == "postgres":
+        return f"SUM({expr}) FILTER (WHERE {cond})"
+    return f"SUM(CASE WHEN {cond} THEN {expr} END)"
+
+
+def round_to(expr: str, places: int, dialect: str) -> str:
+    """ROUND that also accepts double precision input on Postgres."""
+    if _check(dialect) == "postgres":
+        return f"ROUND(CAST({expr} AS NUMERIC), {places})"
+    return f"ROUND({expr}, {places})"
+
+
+def month_key(col: str, dialect: str) -> str:
+    """'YYYY-MM' label for the month containing ``col``."""
+    if _check(dialect) == "postgres":
+        return f"to_char(date_trunc('month', {col}), 'YYYY-MM')"
+    return f"strftime('%Y-%m', {col})"
+
+
+def month_start(col: str, dialect: str) -> str:
+    """First day of the month containing ``col``, as a date."""
+    if _check(dialect) == "postgres":
+        return f"CAST(date_trunc('month', {col}) AS DATE)"
+    return f"date({col}, 'start of month')"
+
+
+def day_of(col: str, dialect: str) -> str:
+    """Calendar day of ``col`` (drops any time component)."""
+    if _check(dialect) == "postgres":
+        return f"CAST({col} AS DATE)"
+    return f"date({col})"